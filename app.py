@@ -1,16 +1,65 @@
+import contextlib
+import json
+
 import streamlit as st
-from rotation_chart import generate_rotation_chart
+from instrumentation import PROFILERS, ProfileCapture, configure_logging, show_profile, start_metrics_server
+
+# Stage spans go to stderr as JSON lines; /metrics is served when CBB_METRICS_PORT is set.
+configure_logging()
+start_metrics_server()
 
 st.title("CBB Rotation Chart Generator")
 
 game_id = st.text_input("Enter StatBroadcast Game ID (e.g., 625309):")
+live_mode = st.checkbox("Live game (only process new plays on each refresh)")
+output = st.radio("Output", ["PNG", "SVG", "Interactive (drawn in the browser)"], horizontal=True,
+                  disabled=live_mode)
+profiler = st.sidebar.selectbox("Profile chart generation", ["Off", *PROFILERS],
+                                help="Profile the next Generate Chart click and show where the time went.")
 
 if st.button("Generate Chart"):
     if not game_id.strip():
         st.error("Please enter a valid game ID.")
     else:
-        try:
-            fig = generate_rotation_chart(game_id.strip())
-            st.pyplot(fig)
-        except Exception as e:
-            st.error(f"Error generating chart: {e}")
+        game_id = game_id.strip()
+        capture = ProfileCapture(profiler) if profiler != "Off" else None
+        with capture or contextlib.nullcontext():
+            try:
+                # The chart modules (pandas, requests and, except for the
+                # interactive output, matplotlib) load on the first click
+                # rather than with the page.
+                if live_mode:
+                    import matplotlib.pyplot as plt
+                    from live_rotation import LiveRotation
+
+                    live = st.session_state.get("live_rotation")
+                    if live is None or live.game_id != game_id:
+                        if live is not None and live.figure is not None:
+                            plt.close(live.figure)
+                        live = LiveRotation(game_id)
+                        st.session_state["live_rotation"] = live
+                    live.poll()
+                    st.pyplot(live.figure)
+                elif output.startswith("Interactive"):
+                    from render_cache import RENDER_FORMATS, rotation_chart_json, rotation_vega_lite
+
+                    # Repeat views are a cache lookup keyed by the feed version.
+                    payload = rotation_chart_json(game_id)
+                    st.vega_lite_chart(rotation_vega_lite(json.loads(payload)), use_container_width=True)
+                    st.download_button("Download stint data (JSON)", payload,
+                                       file_name=f"rotation_{game_id}.json", mime=RENDER_FORMATS["json"])
+                else:
+                    from render_cache import RENDER_FORMATS, render_rotation_chart
+
+                    fmt = output.lower()
+                    content = render_rotation_chart(game_id, fmt=fmt)
+                    if fmt == "svg":
+                        st.image(content.decode("utf-8"))
+                    else:
+                        st.image(content)
+                    st.download_button(f"Download chart ({output})", content,
+                                       file_name=f"rotation_{game_id}.{fmt}", mime=RENDER_FORMATS[fmt])
+            except Exception as e:
+                st.error(f"Error generating chart: {e}")
+        if capture is not None:
+            show_profile(capture)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from feed_cache import FeedCache, get_feed_cache
+from game_feed import REQUEST_TIMEOUT, STATBROADCAST_ARCHIVE_URL, is_final_game
+
+
+DEFAULT_CONCURRENCY = 8
+
+# Requests per second allowed against any single host.
+DEFAULT_HOST_RATE = 5.0
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class FetchResult:
+    game_id: str
+    content: bytes = field(repr=False)
+    status: int
+    from_cache: bool = False
+    not_modified: bool = False
+    stale: bool = False
+    elapsed_s: float = 0.0
+
+
+class _HostRateLimiter:
+    """Spaces requests to one host at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncFeedFetcher:
+    """Concurrent StatBroadcast downloader with rate limiting, retries and revalidation.
+
+    Blocking HTTP calls run on worker threads via ``asyncio.to_thread`` over a
+    connection pool sized to ``concurrency``. Final games in ``cache`` are never
+    requested again; expired live games are revalidated with
+    ``If-None-Match`` / ``If-Modified-Since`` so an unchanged feed costs a 304,
+    and are served stale if the archive cannot be reached.
+    ``url_template`` can point at a local stand-in server for testing.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, host_rate: float = DEFAULT_HOST_RATE,
+                 timeout=REQUEST_TIMEOUT, retries: int = 3, backoff: float = 0.5,
+                 cache: FeedCache = None, use_cache: bool = True,
+                 url_template: str = STATBROADCAST_ARCHIVE_URL):
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = (cache or get_feed_cache()) if use_cache else None
+        self.url_template = url_template
+
+        # Retries are handled here with asyncio.sleep, so the adapter must not
+        # also retry and hold a worker thread while it backs off.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._loop = None
+        self._semaphore = None
+        self._limiters = {}
+
+    def close(self):
+        self.session.close()
+
+    def _bind_loop(self):
+        # asyncio primitives belong to the loop they were first used on; a
+        # fetcher reused across asyncio.run() calls needs fresh ones.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._limiters = {}
+
+    def _limiter(self, url: str) -> _HostRateLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = _HostRateLimiter(self.host_rate)
+        return self._limiters[host]
+
+    async def _get(self, url: str, headers: dict) -> requests.Response:
+        for attempt in range(self.retries + 1):
+            await self._limiter(url).wait()
+            try:
+                response = await asyncio.to_thread(self.session.get, url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def fetch(self, game_id) -> FetchResult:
+        """Fetch one game, serving the cache when it is fresh or the archive cannot be reached.
+
+        Cache reads and writes (SQLite and zlib) run on worker threads so they
+        do not stall the other downloads on the event loop.
+        """
+        game_id = str(game_id)
+        self._bind_loop()
+
+        start = time.perf_counter()
+        entry = await asyncio.to_thread(self.cache.lookup, game_id) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return FetchResult(game_id, entry.content, 200, from_cache=True,
+                               elapsed_s=time.perf_counter() - start)
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        url = self.url_template.format(game_id=game_id)
+        try:
+            async with self._semaphore:
+                response = await self._get(url, headers)
+            if response.status_code == 304 and entry is not None:
+                await asyncio.to_thread(self.cache.touch, game_id)
+                return FetchResult(game_id, entry.content, 304, from_cache=True, not_modified=True,
+                                   elapsed_s=time.perf_counter() - start)
+            if response.status_code != 200:
+                raise Exception(f"Failed to fetch XML data. Status code: {response.status_code}")
+        except Exception:
+            # As in load_game_feed: an expired copy of a live game beats failing.
+            if entry is None:
+                raise
+            return FetchResult(game_id, entry.content, 200, from_cache=True, stale=True,
+                               elapsed_s=time.perf_counter() - start)
+
+        content = response.content
+        if self.cache:
+            await asyncio.to_thread(self._store, game_id, content, response.headers)
+        return FetchResult(game_id, content, 200, elapsed_s=time.perf_counter() - start)
+
+    def _store(self, game_id: str, content: bytes, headers):
+        self.cache.put(game_id, content, is_final=is_final_game(content),
+                       etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"))
+
+    async def fetch_many(self, game_ids):
+        """Fetch all ``game_ids`` concurrently; failures are returned as exceptions in place."""
+        return await asyncio.gather(*(self.fetch(game_id) for game_id in game_ids), return_exceptions=True)
+
+
+def fetch_games(game_ids, **fetcher_options):
+    """Blocking helper around :meth:`AsyncFeedFetcher.fetch_many`."""
+    fetcher = AsyncFeedFetcher(**fetcher_options)
+    try:
+        return asyncio.run(fetcher.fetch_many(game_ids))
+    finally:
+        fetcher.close()
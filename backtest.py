@@ -0,0 +1,136 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from incremental_ratings import IncrementalRatings
+from power_rankings import build_game_table, load_hca_data, season_of
+from snapshot_store import SnapshotStore
+
+
+PREDICTION_COLUMNS = [
+    "date", "season", "home", "road", "neutral", "spread", "actual_diff",
+    "predicted_spread", "predicted_spread_base", "margin_error", "market_error", "model_edge", "ats_win",
+]
+
+
+def predict_games(state: IncrementalRatings, day_games: pd.DataFrame) -> pd.DataFrame:
+    """Home spreads for ``day_games`` from the ratings currently in ``state``.
+
+    Teams without a game yet get no prediction. Ratings are neutral-site
+    spreads, so the home team's HCA is taken off for non-neutral games, the
+    same way ``build_game_table`` added it to the market line.
+    """
+    home = state.lookup(day_games["home"])
+    road = state.lookup(day_games["road"])
+    known = (home >= 0) & (road >= 0)
+    hca = np.where(day_games["neutral"].to_numpy() == 1, 0.0, day_games["home_hca"].to_numpy(dtype=float))
+
+    predicted = np.full((len(day_games), 2), np.nan)
+    predicted[known] = state.ratings[home[known]] - state.ratings[road[known]] - hca[known, None]
+
+    return pd.DataFrame({
+        "date": day_games["date"].to_numpy(),
+        "home": day_games["home"].to_numpy(),
+        "road": day_games["road"].to_numpy(),
+        "neutral": day_games["neutral"].to_numpy(),
+        "spread": day_games["spread_home"].to_numpy(dtype=float),
+        "actual_diff": day_games["actual_diff_home"].to_numpy(dtype=float),
+        "predicted_spread": predicted[:, 1],
+        "predicted_spread_base": predicted[:, 0],
+    })
+
+
+def score_predictions(predictions: pd.DataFrame) -> pd.DataFrame:
+    """Add errors against the final margin and against the market line.
+
+    Spreads are from the home side (favorite negative), so a perfect spread
+    is ``-actual_diff``. ``model_edge`` is positive when the model likes the
+    home team more than the market; ``ats_win`` says whether that side covered
+    (NaN on pushes and when the model agrees with the line).
+    """
+    predictions = predictions.copy()
+    predictions["margin_error"] = predictions["actual_diff"] + predictions["predicted_spread"]
+    predictions["market_error"] = predictions["actual_diff"] + predictions["spread"]
+    predictions["model_edge"] = predictions["spread"] - predictions["predicted_spread"]
+
+    edge_side = np.sign(predictions["model_edge"])
+    cover_side = np.sign(predictions["market_error"])
+    decided = (edge_side != 0) & (cover_side != 0) & predictions["model_edge"].notna()
+    predictions["ats_win"] = np.where(decided, (edge_side == cover_side).astype(float), np.nan)
+    return predictions
+
+
+def backtest_season(games: pd.DataFrame, warm_start: bool = True) -> pd.DataFrame:
+    """Replay one season's games table day by day.
+
+    Before each day's games are added, the ratings built from every earlier
+    day predict them. The normal equations are updated in place (only the
+    teams that played change) and re-solved from the previous day's ratings.
+    """
+    state = IncrementalRatings(warm_start=warm_start)
+    daily_predictions = []
+    for _, day_games in games.sort_values("date", kind="mergesort").groupby("date", sort=True):
+        if state.num_games:
+            daily_predictions.append(predict_games(state, day_games))
+        state.add_games(day_games)
+
+    if not daily_predictions:
+        return pd.DataFrame(columns=PREDICTION_COLUMNS)
+    predictions = score_predictions(pd.concat(daily_predictions, ignore_index=True))
+    predictions.insert(1, "season", season_of(predictions["date"]))
+    return predictions[PREDICTION_COLUMNS]
+
+
+def run_backtest(data: pd.DataFrame, hca_data: pd.DataFrame, warm_start: bool = True) -> pd.DataFrame:
+    """Per-game out-of-sample predictions for every season in ``data``.
+
+    ``data`` and ``hca_data`` are the inputs of ``build_cleaned_data``; the
+    ratings start over at the beginning of each season.
+    """
+    games = build_game_table(data, hca_data)
+    games["date"] = pd.to_datetime(games["date"])
+    seasons = season_of(games["date"])
+    results = [backtest_season(season_games, warm_start=warm_start)
+               for _, season_games in games.groupby(seasons, sort=True)]
+    if not results:
+        return pd.DataFrame(columns=PREDICTION_COLUMNS)
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize_backtest(predictions: pd.DataFrame, by: str = "season") -> pd.DataFrame:
+    """Model and market accuracy per ``by`` group (e.g. "season" or "date")."""
+    scored = predictions.dropna(subset=["predicted_spread"])
+    grouped = scored.groupby(by, sort=True)
+    return pd.DataFrame({
+        "games": grouped.size(),
+        "model_mae": grouped["margin_error"].apply(lambda err: err.abs().mean()),
+        "market_mae": grouped["market_error"].apply(lambda err: err.abs().mean()),
+        "model_rmse": grouped["margin_error"].apply(lambda err: np.sqrt((err ** 2).mean())),
+        "ats_pct": grouped["ats_win"].mean(),
+    }).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay past seasons and score the power ratings' daily predictions.")
+    parser.add_argument("seasons", nargs="+", type=int, help="Seasons by ending year, e.g. 2024 2025")
+    parser.add_argument("--hca", default="ncaa_hca.csv", help="Home-court advantage CSV")
+    parser.add_argument("--out", help="Write per-game predictions to this CSV")
+    parser.add_argument("--by", default="season", choices=["season", "date"])
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    store.backfill(args.seasons)
+    data = store.load(seasons=args.seasons)
+
+    started = time.perf_counter()
+    predictions = run_backtest(data, load_hca_data(args.hca))
+    print(summarize_backtest(predictions, by=args.by).to_string(index=False))
+    print(f"{len(predictions)} games in {time.perf_counter() - started:.1f}s")
+    if args.out:
+        predictions.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from async_fetch import DEFAULT_CONCURRENCY, AsyncFeedFetcher
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _init_render_worker():
+    # pyplot is not thread-safe and each worker renders headless, so pin the
+    # non-interactive backend before rotation_chart imports pyplot.
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_game(game_id: str, content: bytes, out_dir: str, formats) -> dict:
+    import matplotlib.pyplot as plt
+    from game_feed import GameFeed
+    from rotation_chart import generate_rotation_chart
+
+    start = time.perf_counter()
+    fig = generate_rotation_chart(game_id, feed=GameFeed(game_id, content))
+    try:
+        files = []
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{game_id}.{fmt}")
+            fig.savefig(path, format=fmt, bbox_inches="tight")
+            files.append(path)
+    finally:
+        plt.close(fig)
+    return {"files": files, "render_s": round(time.perf_counter() - start, 4)}
+
+
+async def _fetch_and_submit(fetcher: AsyncFeedFetcher, game_ids, render_pool, out_dir, formats, results) -> dict:
+    renders = {}
+
+    async def fetch_one(game_id):
+        try:
+            fetched = await fetcher.fetch(game_id)
+        except Exception as e:
+            results[game_id].update(status="error", stage="fetch", error=str(e))
+            return
+        results[game_id]["fetch_s"] = round(fetched.elapsed_s, 4)
+        # Hand each feed to the render pool as soon as it arrives.
+        renders[render_pool.submit(_render_game, game_id, fetched.content, out_dir, formats)] = game_id
+
+    await asyncio.gather(*(fetch_one(game_id) for game_id in game_ids))
+    return renders
+
+
+def generate_rotation_charts(game_ids, out_dir: str, workers: int = None, formats=("png",),
+                             fetch_concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """Render rotation charts for many games and write a manifest next to them.
+
+    Feeds are fetched concurrently by :class:`async_fetch.AsyncFeedFetcher`
+    (through the on-disk feed cache) and charts are rendered on a process
+    pool, since matplotlib cannot render from several threads at once.
+    Failures are recorded per game in the manifest rather than aborting the
+    batch.
+    """
+    game_ids = [str(game_id).strip() for game_id in game_ids if str(game_id).strip()]
+    formats = tuple(formats)
+    os.makedirs(out_dir, exist_ok=True)
+    batch_start = time.perf_counter()
+
+    results = {game_id: {"game_id": game_id, "status": "pending"} for game_id in game_ids}
+
+    fetcher = AsyncFeedFetcher(concurrency=fetch_concurrency)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as render_pool:
+            renders = asyncio.run(_fetch_and_submit(fetcher, game_ids, render_pool, out_dir, formats, results))
+
+            for future in as_completed(renders):
+                game_id = renders[future]
+                try:
+                    results[game_id].update(status="ok", **future.result())
+                except Exception as e:
+                    results[game_id].update(status="error", stage="render", error=str(e))
+    finally:
+        fetcher.close()
+
+    games = [results[game_id] for game_id in game_ids]
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "formats": list(formats),
+        "total_s": round(time.perf_counter() - batch_start, 4),
+        "succeeded": sum(game["status"] == "ok" for game in games),
+        "failed": sum(game["status"] != "ok" for game in games),
+        "games": games,
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render rotation charts for many StatBroadcast games.")
+    parser.add_argument("game_ids", nargs="*", help="StatBroadcast game ids")
+    parser.add_argument("--ids-file", help="file with one game id per line")
+    parser.add_argument("--out", default="charts", help="output directory (default: charts)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--format", dest="formats", nargs="+", default=["png"], choices=["png", "svg"])
+    args = parser.parse_args(argv)
+
+    game_ids = list(args.game_ids)
+    if args.ids_file:
+        with open(args.ids_file) as f:
+            game_ids.extend(line.strip() for line in f if line.strip())
+    if not game_ids:
+        parser.error("no game ids given")
+
+    manifest = generate_rotation_charts(game_ids, args.out, workers=args.workers, formats=args.formats)
+    print(f"{manifest['succeeded']} rendered, {manifest['failed']} failed in {manifest['total_s']:.1f}s "
+          f"-> {os.path.join(args.out, MANIFEST_NAME)}")
+    return 0 if manifest["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,231 @@
+"""Recorded inputs for the benchmarks.
+
+``benchmarks/fixtures`` holds StatBroadcast game XML (one regulation, one
+overtime and one multi-overtime game) and a PredictionTracker season CSV.
+``python -m benchmarks.fixtures --regulation ID --overtime ID
+--multi-overtime ID --season 2025`` records real ones; any that are missing
+are synthesized deterministically so the benchmarks also run offline.
+"""
+import argparse
+import os
+import random
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import requests
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HCA_CSV_PATH = os.path.join(REPO_DIR, "ncaa_hca.csv")
+
+# Fixture name -> overtime periods of the synthesized stand-in.
+GAME_FIXTURES = {"regulation": 0, "overtime": 1, "multi_overtime": 3}
+PREDICTION_TRACKER_FIXTURE = "ncaabb.csv"
+
+
+def game_path(name: str) -> str:
+    return os.path.join(FIXTURE_DIR, "statbroadcast", f"{name}.xml")
+
+
+def prediction_tracker_path() -> str:
+    return os.path.join(FIXTURE_DIR, "predictiontracker", PREDICTION_TRACKER_FIXTURE)
+
+
+def _write(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+# ---------- Synthesized stand-ins ----------
+
+def _clock(seconds: int) -> str:
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def synthesize_game_xml(overtimes: int = 0, seed: int = 0) -> bytes:
+    """A complete StatBroadcast-style game: rosters, per-period minutes and plays.
+
+    Plays are generated every 8-45 seconds with substitutions at media
+    timeouts, so the document exercises the same parse, substitution and
+    plotting paths as an archived game.
+    """
+    rnd = random.Random(seed)
+    teams = {}
+    for vh, team_id in (("V", "VIS"), ("H", "HOM")):
+        teams[vh] = [
+            # Box-score names normalize (stints.clean_starter_name) to the checkname,
+            # so starters get their synthesized 20:00 SUB IN as in an archived game.
+            {"uni": str(k + 1), "checkname": f"{vh}PLAYER{k + 1:02d},TEST", "name": f"{vh}Player{k + 1:02d}, Test",
+             "team": team_id}
+            for k in range(13)
+        ]
+
+    periods = [(1, 1200), (2, 1200)] + [(3 + k, 300) for k in range(overtimes)]
+    on_floor = {vh: list(players[:5]) for vh, players in teams.items()}
+    seconds_played = {}
+    substituted = set()
+    scores = {"H": 0, "V": 0}
+    period_plays = []
+
+    def substitute(vh, out, clock, plays, entered, exclude=()):
+        bench = [p for p in teams[vh] if p not in on_floor[vh] and p not in exclude]
+        player_in = rnd.choice(bench)
+        for player, kind in ((out, "OUT"), (player_in, "IN")):
+            plays.append({"vh": vh, "time": _clock(clock), "uni": player["uni"], "team": player["team"],
+                          "checkname": player["checkname"], "action": "SUB", "type": kind})
+        substituted.update((out["checkname"], player_in["checkname"]))
+        key = (out["checkname"], period)
+        seconds_played[key] = seconds_played.get(key, 0) + entered.pop(out["checkname"]) - clock
+        entered[player_in["checkname"]] = clock
+        on_floor[vh][on_floor[vh].index(out)] = player_in
+
+    for period, length in periods:
+        plays = []
+        entered = {p["checkname"]: length for vh in on_floor for p in on_floor[vh]}
+        media = [960, 720, 480, 240] if length == 1200 else []
+        clock = length
+        while True:
+            clock -= rnd.randint(8, 45)
+            if clock <= 0:
+                break
+            if media and clock < media[0]:
+                media.pop(0)
+                plays.append({"vh": "", "time": _clock(clock), "uni": "TM", "team": "", "checkname": "TEAM",
+                              "action": "TIMEOUT", "type": "MEDIA"})
+                for vh in on_floor:
+                    # Distinct players each way: nobody enters and leaves at the same clock.
+                    leaving = rnd.sample(on_floor[vh], rnd.randint(0, 2))
+                    if period == 1 and not media:
+                        # build_sub_data only synthesizes the 20:00 SUB IN for
+                        # starters with a SUB row, so none may play the whole game.
+                        leaving += [p for p in on_floor[vh]
+                                    if p["checkname"] not in substituted and p not in leaving]
+                    for player in leaving:
+                        substitute(vh, player, clock, plays, entered, exclude=leaving)
+                continue
+
+            vh = rnd.choice("VH")
+            player = rnd.choice(on_floor[vh])
+            play = {"vh": vh, "time": _clock(clock), "uni": player["uni"], "team": player["team"],
+                    "checkname": player["checkname"]}
+            roll = rnd.random()
+            if roll < 0.45:
+                scores[vh] += rnd.choice((2, 2, 3))
+                plays.append(dict(play, action="GOOD", type="JUMPER", hscore=str(scores["H"]),
+                                  vscore=str(scores["V"])))
+            elif roll < 0.7:
+                plays.append(dict(play, action="MISS", type="JUMPER"))
+            elif roll < 0.82:
+                plays.append(dict(play, action="FOUL", type="PERSONAL"))
+            else:
+                substitute(vh, player, clock, plays, entered)
+        # A completed game cannot end level.
+        if period == periods[-1][0] and scores["H"] == scores["V"]:
+            scores["H"] += 1
+            shooter = on_floor["H"][0]
+            plays.append({"vh": "H", "time": "00:01", "uni": shooter["uni"], "team": shooter["team"],
+                          "checkname": shooter["checkname"], "action": "GOOD", "type": "FT",
+                          "hscore": str(scores["H"]), "vscore": str(scores["V"])})
+        for checkname, start in entered.items():
+            seconds_played[(checkname, period)] = seconds_played.get((checkname, period), 0) + start
+        period_plays.append((period, length, plays))
+
+    root = ET.Element("bbgame", source="TAS Basketball", version="5")
+    ET.SubElement(root, "venue", gameid="BENCH", visid="VIS", homeid="HOM", visname="Visitor", homename="Home")
+    ET.SubElement(root, "status", complete="Y", period=str(len(periods)), clock="00:00")
+    for vh, team_id in (("V", "VIS"), ("H", "HOM")):
+        team = ET.SubElement(root, "team", vh=vh, id=team_id, name=team_id)
+        for k, player in enumerate(teams[vh]):
+            element = ET.SubElement(team, "player", uni=player["uni"], code=player["uni"], name=player["name"],
+                                    checkname=player["checkname"], gp="1")
+            if k < 5:
+                element.set("gs", "1")
+            for period, _ in periods:
+                seconds = seconds_played.get((player["checkname"], period))
+                if seconds is not None:
+                    ET.SubElement(element, "statsbyprd", prd=str(period), min=str(round(seconds / 60)))
+    plays_element = ET.SubElement(root, "plays", format="tokens")
+    for period, length, plays in period_plays:
+        period_element = ET.SubElement(plays_element, "period", number=str(period), time=_clock(length))
+        for play in plays:
+            ET.SubElement(period_element, "play", **play)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def synthesize_prediction_tracker_csv(seed: int = 0, days: int = 120, games_per_day: int = 50) -> bytes:
+    """A season of PredictionTracker-style rows between the HCA teams, with a few upcoming games."""
+    rng = np.random.default_rng(seed)
+    teams = pd.read_csv(HCA_CSV_PATH)["Team"].str.strip().tolist()
+    strength = rng.normal(0, 8, len(teams))
+    rows = []
+    dates = pd.date_range("2024-11-04", periods=days, freq="D")
+    for day in dates:
+        pairs = rng.permutation(len(teams))[:2 * games_per_day].reshape(-1, 2)
+        for home, road in pairs:
+            neutral = int(rng.random() < 0.08)
+            expected = strength[home] - strength[road] + (0 if neutral else 3.0)
+            line = expected + rng.normal(0, 2)
+            margin = round(expected + rng.normal(0, 10)) or 1
+            home_score = int(70 + margin / 2 + rng.normal(0, 3))
+            rows.append({
+                "date": day.strftime("%m/%d/%Y"), "home": teams[home], "hscore": home_score,
+                "road": teams[road], "rscore": home_score - margin, "neutral": neutral,
+                "line": round(line * 2) / 2, "lineavg": round(line, 1), "lineopen": round(line + rng.normal(0, 1), 1),
+            })
+    upcoming = (dates[-1] + pd.Timedelta(days=1)).strftime("%m/%d/%Y")
+    rows += [{"date": upcoming, "home": teams[k], "hscore": 0, "road": teams[k + 1], "rscore": 0, "neutral": 0,
+              "line": 3.5, "lineavg": 3.5, "lineopen": 3.0} for k in range(0, 20, 2)]
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+def ensure_fixtures() -> dict:
+    """Paths of every fixture, synthesizing any that have not been recorded."""
+    paths = {}
+    for seed, (name, overtimes) in enumerate(GAME_FIXTURES.items()):
+        path = game_path(name)
+        if not os.path.exists(path):
+            _write(path, synthesize_game_xml(overtimes, seed=seed))
+        paths[name] = path
+    path = prediction_tracker_path()
+    if not os.path.exists(path):
+        _write(path, synthesize_prediction_tracker_csv())
+    paths["prediction_tracker"] = path
+    return paths
+
+
+# ---------- Recording ----------
+
+def record(game_ids: dict, season: int = None):
+    """Download real fixtures: ``game_ids`` maps fixture names to StatBroadcast ids."""
+    from game_feed import fetch_game_xml
+    from power_rankings import prediction_tracker_url
+
+    for name, game_id in game_ids.items():
+        _write(game_path(name), fetch_game_xml(game_id))
+        print(f"recorded {name} <- StatBroadcast {game_id}")
+    if season is not None:
+        response = requests.get(prediction_tracker_url(season), timeout=30)
+        response.raise_for_status()
+        _write(prediction_tracker_path(), response.content)
+        print(f"recorded PredictionTracker {season}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record benchmark fixtures from the live services.")
+    for name in GAME_FIXTURES:
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, metavar="GAME_ID",
+                            help=f"StatBroadcast id of the {name.replace('_', ' ')} fixture")
+    parser.add_argument("--season", type=int, help="PredictionTracker season to record, e.g. 2025")
+    args = parser.parse_args()
+
+    game_ids = {name: getattr(args, name) for name in GAME_FIXTURES if getattr(args, name)}
+    if not game_ids and args.season is None:
+        parser.error("nothing to record")
+    record(game_ids, args.season)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cold-import budget for the Streamlit entry points and the modules behind them.
+
+Run from the repository root::
+
+    python -m benchmarks.import_budget                 # check every target
+    python -m benchmarks.import_budget --profile app.py  # slowest imports of one target
+
+Each target is imported in a fresh interpreter, the way a new container or
+Streamlit server process first loads it. A target fails when its best time
+over ``--repeats`` runs exceeds its budget, or when it loads a module it is
+meant to defer until first use (matplotlib before a chart is drawn, scipy
+before a rating solve, requests before a download). For a page, the target
+is the page's top-level imports, which is what runs before its first
+element is drawn.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REPEATS = 5
+
+# Target -> (budget in ms, modules it must not import). Budgets leave
+# headroom over a shared single-CPU container: streamlit alone is ~250 ms
+# and pandas (which brings pyarrow) ~350 ms there.
+BUDGETS = {
+    "app.py": (500, ["pandas", "matplotlib", "scipy", "requests"]),
+    "pages/1_Power_Rankings.py": (1200, ["matplotlib", "scipy", "requests"]),
+    "pages/2_Matchups.py": (1200, ["matplotlib", "scipy", "requests"]),
+    "rotation_chart": (900, ["matplotlib", "scipy"]),
+    "render_cache": (900, ["matplotlib", "scipy"]),
+    "power_rankings": (700, ["matplotlib", "scipy", "requests"]),
+    "rotation_store": (1000, ["matplotlib", "scipy"]),
+}
+
+WATCHED_MODULES = ["streamlit", "pandas", "pyarrow", "matplotlib", "scipy", "requests"]
+
+
+def import_code(target: str) -> str:
+    """Python source that performs the target's imports: a module, or a script's top-level imports."""
+    if not target.endswith(".py"):
+        return f"import {target}"
+    with open(os.path.join(REPO_DIR, target), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def _run(code: str, *flags) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable, *flags, "-c", code], cwd=REPO_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"Import failed:\n{result.stderr}")
+    return result
+
+
+def measure(target: str, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Best wall time over ``repeats`` fresh interpreters, and which watched modules got loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{import_code(target)}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'s': elapsed, 'loaded': [m for m in {WATCHED_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    runs = [json.loads(_run(code).stdout.strip().splitlines()[-1]) for _ in range(repeats)]
+    return {"min_ms": min(run["s"] for run in runs) * 1000, "loaded": runs[-1]["loaded"]}
+
+
+def slowest_imports(target: str, limit: int = 25) -> list:
+    """(cumulative ms, module) of the slowest imports under ``python -X importtime``."""
+    stderr = _run(import_code(target), "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, module.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def check(results: dict, budgets: dict = BUDGETS) -> list:
+    """(target, problem) for every target over budget or loading a deferred module."""
+    failures = []
+    for target, result in results.items():
+        budget_ms, deferred = budgets[target]
+        if result["min_ms"] > budget_ms:
+            failures.append((target, f"{result['min_ms']:.0f} ms > {budget_ms} ms budget"))
+        early = [module for module in deferred if module in result["loaded"]]
+        if early:
+            failures.append((target, f"imports {', '.join(early)} at load time"))
+    return failures
+
+
+def format_report(results: dict, budgets: dict = BUDGETS) -> str:
+    lines = [f"{'target':<30}{'min ms':>8}{'budget':>8}  loaded"]
+    for target, result in results.items():
+        lines.append(f"{target:<30}{result['min_ms']:>8.0f}{budgets[target][0]:>8}  {', '.join(result['loaded'])}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import times of the app against their budgets.")
+    parser.add_argument("targets", nargs="*", default=list(BUDGETS), help="targets to check (default: all)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="fresh interpreters per target")
+    parser.add_argument("--profile", metavar="TARGET", help="list the slowest imports of one target instead")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        for cumulative_ms, module in slowest_imports(args.profile):
+            print(f"{cumulative_ms:>9.1f} ms  {module}")
+        return 0
+
+    unknown = [target for target in args.targets if target not in BUDGETS]
+    if unknown:
+        parser.error(f"no budget for {', '.join(unknown)}")
+    results = {target: measure(target, args.repeats) for target in args.targets}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(format_report(results))
+    failures = check(results)
+    for target, problem in failures:
+        print(f"OVER BUDGET {target}: {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
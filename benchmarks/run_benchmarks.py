@@ -0,0 +1,267 @@
+"""Stage-by-stage benchmarks of the rotation chart and power rankings pipelines.
+
+Run from the repository root::
+
+    python -m benchmarks.run_benchmarks                  # compare with benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline  # record a new baseline
+
+Fixtures (see ``benchmarks.fixtures``) are served by a local HTTP server, so
+the fetch stages go through the production requests code without touching
+StatBroadcast or PredictionTracker. Each stage is timed on its own (median
+of ``--repeats`` runs after a warm-up) and run once more under tracemalloc
+for its peak allocation.
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+import requests
+
+import game_feed
+from benchmarks.fixtures import (
+    FIXTURE_DIR,
+    GAME_FIXTURES,
+    HCA_CSV_PATH,
+    PREDICTION_TRACKER_FIXTURE,
+    ensure_fixtures,
+    game_path,
+)
+from power_rankings import build_cleaned_data, build_rankings_revised, load_hca_data, read_prediction_tracker_csv
+from rotation_chart import build_rotation_data, draw_rotation_chart
+from stints import period_seconds
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_REPEATS = 5
+
+# A stage regresses when its best time grows by more than TIME_TOLERANCE (and
+# by at least MIN_TIME_DELTA_S, so millisecond stages don't flap) or its peak
+# memory by more than MEMORY_TOLERANCE (and MIN_MEMORY_DELTA_KIB). The best of several runs is compared
+# rather than the median because it is far less sensitive to a busy machine.
+TIME_TOLERANCE = 0.25
+MIN_TIME_DELTA_S = 0.002
+MEMORY_TOLERANCE = 0.10
+MIN_MEMORY_DELTA_KIB = 256
+
+
+# ---------- Fixture server ----------
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_fixtures(root: str = FIXTURE_DIR):
+    """Serve ``root`` on a free local port; yields the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ---------- Stages ----------
+# Each stage stores its output for the next one, so a stage is timed on its
+# own while still running on real upstream results.
+
+def rotation_stages(game_id: str):
+    state = {}
+
+    def fetch():
+        state["content"] = game_feed.fetch_game_xml(game_id)
+
+    def parse():
+        state["feed"] = game_feed.GameFeed(game_id, state["content"])
+        state["feed"].game
+
+    def subs():
+        state["data"] = build_rotation_data(game_id, state["feed"])
+
+    def plot():
+        fig = draw_rotation_chart(state["data"])
+        try:
+            fig.savefig(io.BytesIO(), format="png")
+        finally:
+            plt.close(fig)
+
+    return [("fetch", fetch), ("parse", parse), ("subs", subs), ("plot", plot)]
+
+
+def rankings_stages(url: str):
+    state = {}
+
+    def fetch():
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        state["content"] = response.content
+
+    def parse():
+        state["data"] = read_prediction_tracker_csv(state["content"])
+
+    def clean():
+        state["cleaned"] = build_cleaned_data(state["data"], load_hca_data(HCA_CSV_PATH))
+
+    def fit():
+        state["rankings"] = build_rankings_revised(state["cleaned"])
+
+    return [("fetch", fetch), ("parse", parse), ("clean", clean), ("fit", fit)]
+
+
+def check_rotation_fixture(name: str):
+    """Fail unless the fixture's stints put five players per team on the floor for the whole game."""
+    with open(game_path(name), "rb") as f:
+        data = build_rotation_data(name, game_feed.GameFeed(name, f.read()))
+    stints = data.stints
+    played = (stints["end_s"] - stints["start_s"]).groupby(stints["team"]).sum()
+    expected = 5 * sum(period_seconds(period) for period in data.periods)
+    if len(played) != 2 or (played != expected).any():
+        raise Exception(f"Fixture {name}: team minutes {(played / 60).to_dict()}, expected {expected / 60:g} each")
+
+
+def measure(stage, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Median and best wall time over ``repeats`` runs after a warm-up, and peak traced memory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        stage()
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            stage()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            stage()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "peak_kib": peak / 1024}
+
+
+def run_benchmarks(pipelines=("rotation", "rankings"), repeats: int = DEFAULT_REPEATS) -> dict:
+    """Results keyed ``pipeline/fixture/stage``, plus a ``total`` per pipeline and fixture."""
+    ensure_fixtures()
+    results = {}
+    archive_url = game_feed.STATBROADCAST_ARCHIVE_URL
+    with serve_fixtures() as base_url:
+        game_feed.STATBROADCAST_ARCHIVE_URL = f"{base_url}/statbroadcast/{{game_id}}.xml"
+        try:
+            suites = []
+            if "rotation" in pipelines:
+                for name in GAME_FIXTURES:
+                    check_rotation_fixture(name)
+                suites += [(f"rotation/{name}", rotation_stages(name)) for name in GAME_FIXTURES]
+            if "rankings" in pipelines:
+                url = f"{base_url}/predictiontracker/{PREDICTION_TRACKER_FIXTURE}"
+                suites.append(("rankings/season", rankings_stages(url)))
+
+            for prefix, stages in suites:
+                for name, stage in stages:
+                    results[f"{prefix}/{name}"] = measure(stage, repeats)
+                stage_results = [results[f"{prefix}/{name}"] for name, _ in stages]
+                results[f"{prefix}/total"] = {
+                    "median_s": sum(r["median_s"] for r in stage_results),
+                    "min_s": sum(r["min_s"] for r in stage_results),
+                    "peak_kib": max(r["peak_kib"] for r in stage_results),
+                }
+        finally:
+            game_feed.STATBROADCAST_ARCHIVE_URL = archive_url
+    return results
+
+
+# ---------- Baseline ----------
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "pandas": pd.__version__, "matplotlib": matplotlib.__version__}
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float = TIME_TOLERANCE,
+            memory_tolerance: float = MEMORY_TOLERANCE) -> list:
+    """(key, metric, baseline value, new value) for every stage that got slower or bigger."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if (result["min_s"] > base["min_s"] * (1 + time_tolerance)
+                and result["min_s"] - base["min_s"] > MIN_TIME_DELTA_S):
+            regressions.append((key, "min_s", base["min_s"], result["min_s"]))
+        if (result["peak_kib"] > base["peak_kib"] * (1 + memory_tolerance)
+                and result["peak_kib"] - base["peak_kib"] > MIN_MEMORY_DELTA_KIB):
+            regressions.append((key, "peak_kib", base["peak_kib"], result["peak_kib"]))
+    return regressions
+
+
+def format_report(results: dict, baseline: dict = None) -> str:
+    lines = [f"{'stage':<34}{'median ms':>11}{'min ms':>10}{'peak KiB':>11}{'min vs base':>13}"]
+    for key, result in results.items():
+        change = ""
+        base = (baseline or {}).get(key)
+        if base and base["min_s"] > 0:
+            change = f"{(result['min_s'] / base['min_s'] - 1) * 100:+.0f}%"
+        lines.append(f"{key:<34}{result['median_s'] * 1000:>11.1f}{result['min_s'] * 1000:>10.1f}"
+                     f"{result['peak_kib']:>11.0f}{change:>13}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the chart and rankings pipelines stage by stage.")
+    parser.add_argument("--pipeline", dest="pipelines", nargs="+", default=["rotation", "rankings"],
+                        choices=["rotation", "rankings"])
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs per stage")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.pipelines, args.repeats)
+    report = {"environment": environment(), "repeats": args.repeats, "stages": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(format_report(results))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_report(results, baseline and baseline["stages"]))
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    if baseline["environment"] != report["environment"]:
+        print("warning: baseline was recorded in a different environment:", baseline["environment"])
+
+    regressions = compare(results, baseline["stages"], args.time_tolerance, args.memory_tolerance)
+    for key, metric, before, after in regressions:
+        print(f"REGRESSION {key} {metric}: {before:.4g} -> {after:.4g}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
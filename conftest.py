@@ -0,0 +1,33 @@
+import pytest
+
+import team_registry
+from benchmarks.fixtures import GAME_FIXTURES, HCA_CSV_PATH, ensure_fixtures, game_path, prediction_tracker_path
+from game_feed import GameFeed
+from power_rankings import build_game_table, load_hca_data, read_prediction_tracker_csv
+
+
+@pytest.fixture
+def fresh_team_registry(monkeypatch):
+    """A newly built shared team registry, as in a fresh process."""
+    monkeypatch.setattr(team_registry, "_registry", None)
+    return team_registry.get_team_registry()
+
+
+# Tests share the benchmark fixtures: three StatBroadcast games (regulation,
+# one and three overtimes) and a PredictionTracker season.
+
+@pytest.fixture(scope="session", params=list(GAME_FIXTURES))
+def fixture_feed(request) -> GameFeed:
+    ensure_fixtures()
+    with open(game_path(request.param), "rb") as f:
+        return GameFeed(request.param, f.read())
+
+
+@pytest.fixture(scope="session")
+def season_games():
+    """``build_game_table`` of the fixture season, oldest game first."""
+    ensure_fixtures()
+    with open(prediction_tracker_path(), "rb") as f:
+        data = read_prediction_tracker_csv(f.read())
+    games = build_game_table(data, load_hca_data(HCA_CSV_PATH))
+    return games.sort_values("date", kind="stable").reset_index(drop=True)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from collections import namedtuple
+from contextlib import closing
+
+
+FEED_CACHE_PATH = os.environ.get("CBB_FEED_CACHE", os.path.join(".cache", "statbroadcast.sqlite3"))
+
+# In-progress games are re-fetched once their cached copy is older than this.
+LIVE_GAME_TTL = 60
+
+# Total compressed bytes kept on disk before least-recently-used games are evicted.
+FEED_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES blobs(digest),
+    is_final INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS games_accessed_at ON games(accessed_at);
+"""
+
+CachedFeed = namedtuple("CachedFeed", ["content", "is_final", "fetched_at", "etag", "last_modified"])
+
+
+def content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class FeedCache:
+    """Content-addressed SQLite store of game XML keyed by game_id.
+
+    Final games are served from disk indefinitely; games still in progress
+    expire after ``live_ttl`` seconds. Blobs are zlib-compressed and shared
+    between game ids with identical content.
+    """
+
+    def __init__(self, path: str = FEED_CACHE_PATH, max_bytes: int = FEED_CACHE_MAX_BYTES,
+                 live_ttl: float = LIVE_GAME_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            # Caches created before HTTP validators were stored lack these columns.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+            for column in ("etag", "last_modified"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE games ADD COLUMN {column} TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def lookup(self, game_id):
+        """Return the cached entry for ``game_id`` regardless of age, or None."""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT b.data, g.is_final, g.fetched_at, g.etag, g.last_modified FROM games g "
+                "JOIN blobs b ON b.digest = g.digest WHERE g.game_id = ?",
+                (str(game_id),),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE games SET accessed_at = ? WHERE game_id = ?", (time.time(), str(game_id)))
+        data, is_final, fetched_at, etag, last_modified = row
+        return CachedFeed(zlib.decompress(data), bool(is_final), fetched_at, etag, last_modified)
+
+    def is_fresh(self, entry: CachedFeed) -> bool:
+        return entry.is_final or time.time() - entry.fetched_at <= self.live_ttl
+
+    def get(self, game_id, allow_stale: bool = False):
+        """Return cached XML bytes for ``game_id``, or None on a miss or expired live game."""
+        entry = self.lookup(game_id)
+        if entry is None or not (allow_stale or self.is_fresh(entry)):
+            return None
+        return entry.content
+
+    def put(self, game_id, content: bytes, is_final: bool, etag: str = None, last_modified: str = None) -> str:
+        digest = content_digest(content)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            if conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is None:
+                data = zlib.compress(content, 6)
+                conn.execute(
+                    "INSERT INTO blobs (digest, data, size) VALUES (?, ?, ?)",
+                    (digest, data, len(data)),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO games "
+                "(game_id, digest, is_final, fetched_at, accessed_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(game_id), digest, int(bool(is_final)), now, now, etag, last_modified),
+            )
+            self._drop_orphans(conn)
+            self._evict(conn)
+        return digest
+
+    def touch(self, game_id):
+        """Mark a cached live game as freshly validated without rewriting its content."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE games SET fetched_at = ?, accessed_at = ? WHERE game_id = ?",
+                (now, now, str(game_id)),
+            )
+
+    def total_bytes(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _drop_orphans(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM games)")
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Walk games from least to most recently used, keeping the newest entry
+        # even if it alone exceeds the cap.
+        lru = conn.execute(
+            "SELECT g.game_id, g.digest, b.size FROM games g "
+            "JOIN blobs b ON b.digest = g.digest ORDER BY g.accessed_at ASC"
+        ).fetchall()
+        refs = {}
+        for _, digest, _ in lru:
+            refs[digest] = refs.get(digest, 0) + 1
+
+        for game_id, digest, size in lru[:-1]:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                total -= size
+        self._drop_orphans(conn)
+
+
+_FEED_CACHE = None
+
+
+def get_feed_cache() -> FeedCache:
+    global _FEED_CACHE
+    if _FEED_CACHE is None:
+        _FEED_CACHE = FeedCache()
+    return _FEED_CACHE
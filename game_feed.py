@@ -0,0 +1,112 @@
+import io
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from feed_cache import FeedCache, content_digest, get_feed_cache
+from game_parser import ParsedGame, parse_game
+from instrumentation import timed
+
+
+STATBROADCAST_ARCHIVE_URL = os.environ.get(
+    "STATBROADCAST_ARCHIVE_URL", "http://archive.statbroadcast.com/{game_id}.xml"
+)
+
+# (connect, read) timeouts in seconds for archive downloads.
+REQUEST_TIMEOUT = (5, 30)
+
+_SESSION = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared, connection-pooled session used for StatBroadcast fetches."""
+    global _SESSION
+    if _SESSION is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def game_url(game_id) -> str:
+    return STATBROADCAST_ARCHIVE_URL.format(game_id=game_id)
+
+
+@dataclass
+class GameFeed:
+    """Raw StatBroadcast XML for one game, parsed exactly once on first use."""
+
+    game_id: str
+    content: bytes = field(repr=False)
+    digest: str = field(init=False)
+
+    def __post_init__(self):
+        self.game_id = str(self.game_id)
+        self.digest = content_digest(self.content)
+
+    @cached_property
+    def game(self) -> ParsedGame:
+        return parse_game(self.content)
+
+
+@timed("rotation.fetch")
+def fetch_game_xml(game_id, session: requests.Session = None) -> bytes:
+    session = session or get_session()
+    response = session.get(game_url(game_id), timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch XML data. Status code: {response.status_code}")
+    return response.content
+
+
+def is_final_game(content: bytes) -> bool:
+    """True when the feed's <status> element marks the game complete.
+
+    Only the document header is scanned; parsing stops before the play-by-play.
+    """
+    for event, elem in ET.iterparse(io.BytesIO(content), events=("start",)):
+        if elem.tag == "status":
+            return elem.get("complete", "").upper() == "Y"
+        if elem.tag == "plays":
+            break
+    return False
+
+
+@timed("rotation.load")
+def load_game_feed(game_id, session: requests.Session = None, use_cache: bool = True,
+                   cache: FeedCache = None) -> GameFeed:
+    """Load a game from the on-disk cache, falling back to the StatBroadcast archive.
+
+    Final games are never re-fetched while cached. If the archive cannot be
+    reached, an expired copy of a live game is served rather than failing.
+    """
+    if not use_cache:
+        return GameFeed(game_id, fetch_game_xml(game_id, session=session))
+
+    cache = cache or get_feed_cache()
+    content = cache.get(game_id)
+    if content is not None:
+        return GameFeed(game_id, content)
+
+    try:
+        content = fetch_game_xml(game_id, session=session)
+    except Exception:
+        content = cache.get(game_id, allow_stale=True)
+        if content is None:
+            raise
+        return GameFeed(game_id, content)
+
+    cache.put(game_id, content, is_final=is_final_game(content))
+    return GameFeed(game_id, content)
@@ -0,0 +1,109 @@
+import io
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+
+from instrumentation import timed
+
+
+PLAY_FIELDS = ("time", "period", "team", "vh", "uni", "checkname", "action", "type", "hscore", "vscore")
+PLAYER_PERIOD_FIELDS = ("checkname", "vh", "uni", "prd", "min")
+ROSTER_FIELDS = ("checkname", "name", "uni", "team", "vh", "gs")
+
+
+@dataclass
+class ParsedGame:
+    """Column arrays extracted from one StatBroadcast game document."""
+
+    plays: dict = field(default_factory=lambda: {name: [] for name in PLAY_FIELDS})
+    player_periods: dict = field(default_factory=lambda: {name: [] for name in PLAYER_PERIOD_FIELDS})
+    roster: dict = field(default_factory=lambda: {name: [] for name in ROSTER_FIELDS})
+    starter_names: list = field(default_factory=list)
+    is_final: bool = False
+    # Feed position of the first play in ``plays``; earlier plays were skipped.
+    first_seq: int = 0
+    # Plays in the feed, skipped ones included.
+    total_plays: int = 0
+
+    @property
+    def num_plays(self) -> int:
+        return len(self.plays["time"])
+
+
+@timed("rotation.parse")
+def parse_game(source, skip_plays: int = 0) -> ParsedGame:
+    """Extract plays, starters and per-period player minutes in a single streaming pass.
+
+    ``source`` may be raw XML bytes, a path or a binary file object. Elements are
+    cleared as soon as they have been read so memory stays bounded by the size of
+    one period rather than the whole document. The first ``skip_plays`` plays are
+    counted (``total_plays``) but not stored, for callers that have already
+    processed them.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    game = ParsedGame(first_seq=skip_plays)
+    plays = game.plays
+    play_columns = [(name, plays[name]) for name in PLAY_FIELDS if name != "period"]
+    play_periods = plays["period"]
+    periods = game.player_periods
+    roster = game.roster
+    current_period = None
+    current_team = current_vh = None
+    to_skip = skip_plays
+    total_plays = 0
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == "period":
+                current_period = elem.get("number")
+            elif tag == "team":
+                current_team = elem.get("id")
+                current_vh = elem.get("vh")
+            elif tag == "status":
+                game.is_final = elem.get("complete", "").upper() == "Y"
+            continue
+
+        if tag == "play":
+            total_plays += 1
+            if to_skip:
+                to_skip -= 1
+                elem.clear()
+                continue
+            attrib = elem.attrib
+            for name, column in play_columns:
+                column.append(attrib.get(name))
+            play_periods.append(current_period)
+            elem.clear()
+
+        elif tag == "player":
+            if elem.get("gs") == "1":
+                game.starter_names.append(elem.get("name", "Unknown"))
+
+            checkname = elem.get("checkname")
+            vh = elem.get("vh")
+            uni = elem.get("uni")
+            roster["checkname"].append(checkname)
+            roster["name"].append(elem.get("name"))
+            roster["uni"].append(uni)
+            roster["team"].append(current_team)
+            roster["vh"].append(vh or current_vh)
+            roster["gs"].append(elem.get("gs") == "1")
+            for stats in elem.iterfind("statsbyprd"):
+                prd = stats.get("prd")
+                mins = stats.get("min")
+                if prd is None or mins is None:
+                    continue
+                periods["checkname"].append(checkname)
+                periods["vh"].append(vh)
+                periods["uni"].append(uni)
+                periods["prd"].append(int(prd))
+                periods["min"].append(mins)
+            elem.clear()
+
+        elif tag in ("period", "team"):
+            elem.clear()
+
+    game.total_plays = total_plays
+    return game
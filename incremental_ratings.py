@@ -0,0 +1,193 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span, timed
+from power_rankings import (
+    PREDICTION_TRACKER_SEASON,
+    build_game_table,
+    load_hca_data,
+    load_prediction_tracker_data,
+    ratings_table,
+    recency_weight,
+    revised_targets,
+    solve_ratings,
+    solve_ratings_cg,
+)
+
+
+GAME_KEY = ["date", "home", "road"]
+
+
+class IncrementalRatings:
+    """Normal-equation state for the power ratings, updated as new games arrive.
+
+    A team's recency weights only depend on its own schedule, so a new game
+    changes the rows of the two teams that played and nothing else. For each
+    affected team the old contribution to XᵀWX / XᵀWY is subtracted, its
+    games-ago counters are recomputed with the new game on top, and the
+    re-weighted rows are added back before re-solving the teams x teams system.
+
+    With ``warm_start`` the system is re-solved by conjugate gradients from the
+    previous ratings instead of a fresh least-squares solve, which is much
+    cheaper when each update only adds a day's games.
+    """
+
+    def __init__(self, warm_start: bool = False):
+        self.warm_start = warm_start
+        self.teams = []
+        self.team_index = {}
+        self.A = np.zeros((0, 0))
+        self.B = np.zeros((0, 2))
+        self.ratings = np.zeros((0, 2))
+        # team idx -> {"date", "order", "opponent", "targets"}, most recent game first
+        self._rows = {}
+        self._seen = set()
+        self._next_order = 0
+        self._lock = threading.Lock()
+
+    @property
+    def num_games(self) -> int:
+        return len(self._seen)
+
+    def lookup(self, names) -> np.ndarray:
+        """Team indices for ``names``, -1 for teams without a game yet."""
+        get = self.team_index.get
+        return np.fromiter((get(name, -1) for name in names), dtype=np.int64, count=len(names))
+
+    def games_played(self) -> pd.Series:
+        return pd.Series({team: len(self._rows[idx]["opponent"]) for team, idx in self.team_index.items()})
+
+    def add_games(self, games: pd.DataFrame) -> int:
+        """Fold in the games from ``build_game_table`` that have not been seen yet.
+
+        Returns the number of new games; the ratings are re-solved if any.
+        """
+        with self._lock:
+            return self._add_games(games)
+
+    def _add_games(self, games: pd.DataFrame) -> int:
+        games = games.dropna(subset=GAME_KEY + ["neutral_spread_home", "actual_diff_home"])
+        games = games.drop_duplicates(GAME_KEY)
+        keys = list(zip(games["date"], games["home"], games["road"]))
+        is_new = np.fromiter((key not in self._seen for key in keys), dtype=bool, count=len(keys))
+        games = games[is_new]
+        if games.empty:
+            return 0
+        self._seen.update(key for key, new in zip(keys, is_new) if new)
+
+        self._add_teams(pd.unique(pd.concat([games["home"], games["road"]])))
+        home = self.lookup(games["home"])
+        road = self.lookup(games["road"])
+        dates = games["date"].to_numpy(dtype="datetime64[ns]")
+        order = self._next_order + np.arange(len(games))
+        self._next_order += len(games)
+        targets = revised_targets(games["neutral_spread_home"], games["actual_diff_home"])
+
+        # Each game is a row for the home team and a mirrored row for the road team.
+        team = np.concatenate([home, road])
+        new_rows = {
+            "date": np.concatenate([dates, dates]),
+            "order": np.concatenate([order, order]),
+            "opponent": np.concatenate([road, home]),
+            "targets": np.concatenate([targets, -targets]),
+        }
+
+        for idx in np.unique(team):
+            mask = team == idx
+            self._apply(idx, -1.0)
+            rows = {key: np.concatenate([self._rows[idx][key], values[mask]])
+                    for key, values in new_rows.items()}
+            newest_first = np.lexsort((rows["order"], -rows["date"].astype(np.int64)))
+            self._rows[idx] = {key: values[newest_first] for key, values in rows.items()}
+            self._apply(idx, 1.0)
+
+        self._solve()
+        return len(games)
+
+    def rebuild(self):
+        """Recompute XᵀWX / XᵀWY from the stored rows, dropping accumulated rounding error."""
+        with self._lock:
+            self.A = np.zeros_like(self.A)
+            self.B = np.zeros_like(self.B)
+            for idx in self._rows:
+                self._apply(idx, 1.0)
+            self._solve()
+
+    def rankings(self) -> pd.DataFrame:
+        with self._lock:
+            return ratings_table(list(self.teams), self.ratings[:, 1].copy())
+
+    def _solve(self):
+        if self.warm_start:
+            self.ratings = solve_ratings_cg(self.A, self.B, x0=self.ratings)
+        else:
+            self.ratings = solve_ratings(self.A, self.B)
+
+    def _add_teams(self, names):
+        names = [name for name in names if name not in self.team_index]
+        if not names:
+            return
+        start = len(self.teams)
+        for offset, name in enumerate(names):
+            self.team_index[name] = start + offset
+            self._rows[start + offset] = {
+                "date": np.array([], dtype="datetime64[ns]"),
+                "order": np.array([], dtype=np.int64),
+                "opponent": np.array([], dtype=np.int64),
+                "targets": np.zeros((0, 2)),
+            }
+        self.teams.extend(names)
+        self.A = np.pad(self.A, (0, len(names)))
+        self.B = np.pad(self.B, ((0, len(names)), (0, 0)))
+        self.ratings = np.pad(self.ratings, ((0, len(names)), (0, 0)))
+
+    def _apply(self, idx, sign):
+        """Add (sign=1) or remove (sign=-1) team ``idx``'s weighted rows from A and B."""
+        rows = self._rows[idx]
+        opponent = rows["opponent"]
+        if not len(opponent):
+            return
+        weights = sign * recency_weight(np.arange(len(opponent)))
+        weighted_targets = weights[:, None] * rows["targets"]
+
+        # Row (+1 at idx, -1 at opponent) contributes w to both diagonals and -w off them.
+        self.A[idx, idx] += weights.sum()
+        np.add.at(self.A, (opponent, opponent), weights)
+        np.add.at(self.A, (idx, opponent), -weights)
+        np.add.at(self.A, (opponent, idx), -weights)
+        self.B[idx] += weighted_targets.sum(axis=0)
+        np.add.at(self.B, opponent, -weighted_targets)
+
+
+@timed("rankings.update")
+def update_power_rankings(state: IncrementalRatings, hca_csv_path: str = "data/ncaa_hca.csv",
+                          store=None) -> pd.DataFrame:
+    """Fold new games into ``state`` and return the rankings.
+
+    With a :class:`snapshot_store.SnapshotStore` the games are read from the
+    local snapshot. The season is only downloaded when it is not stored yet or
+    is stale (``SnapshotStore.is_stale``), so a cold start reads local files;
+    if PredictionTracker is unreachable the stored games are used as they are.
+    """
+    if store is None:
+        data = load_prediction_tracker_data()
+    else:
+        import requests
+
+        with span("rankings.snapshot"):
+            season = PREDICTION_TRACKER_SEASON
+            if season not in store.seasons():
+                store.refresh(season)
+            elif store.is_stale(season):
+                try:
+                    store.refresh(season)
+                except requests.RequestException:
+                    pass
+            data = store.load(seasons=[season])
+    hca_data = load_hca_data(hca_csv_path)
+    games = build_game_table(data, hca_data)
+    with span("rankings.fit", incremental=True):
+        state.add_games(games)
+    return state.rankings()
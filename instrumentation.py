@@ -0,0 +1,280 @@
+import contextlib
+import contextvars
+import cProfile
+import functools
+import importlib.util
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+logger = logging.getLogger("cbb.timing")
+
+# Upper bounds in seconds of the stage duration histogram buckets.
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICS_HOST = os.environ.get("CBB_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.environ.get("CBB_METRICS_PORT")
+LOG_LEVEL = os.environ.get("CBB_LOG_LEVEL", "INFO")
+
+PROFILERS = ("cProfile", "pyinstrument") if importlib.util.find_spec("pyinstrument") else ("cProfile",)
+
+
+# ---------- Stage metrics ----------
+
+class StageMetrics:
+    """Count, total, maximum and histogram of span durations per stage, plus error counts."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, error: bool = False):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {"count": 0, "sum": 0.0, "max": 0.0, "errors": 0,
+                                               "buckets": [0] * len(self.buckets)}
+            stats["count"] += 1
+            stats["sum"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["errors"] += bool(error)
+            for idx, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats["buckets"][idx] += 1
+                    break
+
+    def summary(self) -> list:
+        """One dict per stage: count, errors and total/mean/max milliseconds."""
+        with self._lock:
+            return [
+                {"stage": stage, "count": stats["count"], "errors": stats["errors"],
+                 "total_ms": round(stats["sum"] * 1000, 3),
+                 "mean_ms": round(stats["sum"] / stats["count"] * 1000, 3),
+                 "max_ms": round(stats["max"] * 1000, 3)}
+                for stage, stats in sorted(self._stages.items())
+            ]
+
+    def prometheus_text(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP cbb_stage_duration_seconds Wall time of instrumented pipeline stages.",
+            "# TYPE cbb_stage_duration_seconds histogram",
+        ]
+        errors = [
+            "# HELP cbb_stage_errors_total Stage runs that raised.",
+            "# TYPE cbb_stage_errors_total counter",
+        ]
+        with self._lock:
+            for stage, stats in sorted(self._stages.items()):
+                label = stage.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(self.buckets, stats["buckets"]):
+                    cumulative += count
+                    lines.append(f'cbb_stage_duration_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'cbb_stage_duration_seconds_bucket{{stage="{label}",le="+Inf"}} {stats["count"]}')
+                lines.append(f'cbb_stage_duration_seconds_sum{{stage="{label}"}} {stats["sum"]:.6f}')
+                lines.append(f'cbb_stage_duration_seconds_count{{stage="{label}"}} {stats["count"]}')
+                errors.append(f'cbb_stage_errors_total{{stage="{label}"}} {stats["errors"]}')
+        return "\n".join(lines + errors) + "\n"
+
+
+_stage_metrics = None
+
+
+def get_stage_metrics() -> StageMetrics:
+    global _stage_metrics
+    if _stage_metrics is None:
+        _stage_metrics = StageMetrics()
+    return _stage_metrics
+
+
+# ---------- Spans ----------
+
+_current_span = contextvars.ContextVar("cbb_current_span", default=None)
+_collected_spans = contextvars.ContextVar("cbb_collected_spans", default=None)
+
+
+@contextlib.contextmanager
+def span(stage: str, **fields):
+    """Time a block as ``stage``: recorded in the stage metrics, logged at INFO
+    as a structured record (with the enclosing span as ``parent``) and added to
+    any ``collect_spans`` list active in this context."""
+    parent = _current_span.get()
+    token = _current_span.set(stage)
+    failed = False
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        _current_span.reset(token)
+        get_stage_metrics().observe(stage, seconds, failed)
+        record = dict(fields, stage=stage, parent=parent, duration_ms=round(seconds * 1000, 3))
+        if failed:
+            record["error"] = True
+        collected = _collected_spans.get()
+        if collected is not None:
+            collected.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("span", extra={"fields": record})
+
+
+def timed(stage: str):
+    """Decorator running the function inside ``span(stage)``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def collect_spans():
+    """Yield a list that receives every span finished in this context (thread)."""
+    spans = []
+    token = _collected_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _collected_spans.reset(token)
+
+
+# ---------- Structured logs ----------
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; ``extra={"fields": {...}}`` is merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = None):
+    """Write the app's ``cbb.*`` loggers to stderr as JSON lines (level from CBB_LOG_LEVEL)."""
+    root = logging.getLogger("cbb")
+    if not any(isinstance(handler.formatter, JsonFormatter) for handler in root.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.propagate = False
+    root.setLevel((level or LOG_LEVEL).upper())
+
+
+# ---------- Prometheus endpoint ----------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_stage_metrics().prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host: str = METRICS_HOST):
+    """Serve ``/metrics`` from a daemon thread on ``port`` (default CBB_METRICS_PORT).
+
+    Does nothing without a port, and only starts one server per process, so
+    Streamlit scripts can call it on every rerun.
+    """
+    global _metrics_server
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _metrics_server
+
+
+# ---------- Profiling ----------
+
+class ProfileCapture:
+    """Profile one block of work in the calling thread, and collect its spans.
+
+    ``tool`` is "cProfile" or, when installed, "pyinstrument".
+    """
+
+    def __init__(self, tool: str = "cProfile"):
+        if tool not in PROFILERS:
+            raise ValueError(f"Unsupported profiler: {tool} (available: {', '.join(PROFILERS)})")
+        self.tool = tool
+        self.spans = []
+        self._profiler = None
+        self._spans_context = None
+
+    def __enter__(self):
+        if self.tool == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+        else:
+            self._profiler = cProfile.Profile()
+        self._spans_context = collect_spans()
+        self.spans = self._spans_context.__enter__()
+        self._profiler.start() if self.tool == "pyinstrument" else self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.stop() if self.tool == "pyinstrument" else self._profiler.disable()
+        self._spans_context.__exit__(*exc_info)
+        return False
+
+    def report(self, limit: int = 30) -> str:
+        """Text summary: the top ``limit`` functions by cumulative time, or pyinstrument's call tree."""
+        if self.tool == "pyinstrument":
+            return self._profiler.output_text()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def dump(self):
+        """(bytes, file name, mime type) of the full profile: a pstats file or pyinstrument HTML."""
+        if self.tool == "pyinstrument":
+            return self._profiler.output_html().encode("utf-8"), "profile.html", "text/html"
+        stats = pstats.Stats(self._profiler)
+        return marshal.dumps(stats.stats), "profile.prof", "application/octet-stream"
+
+
+def show_profile(capture: ProfileCapture):
+    """Render a finished capture in the current Streamlit script: spans, report and download."""
+    import streamlit as st
+
+    with st.expander("Profile", expanded=True):
+        if capture.spans:
+            st.dataframe(capture.spans, use_container_width=True, hide_index=True)
+        st.code(capture.report(), language=None)
+        content, file_name, mime = capture.dump()
+        st.download_button("Download profile", content, file_name=file_name, mime=mime)
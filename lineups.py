@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+
+from stints import build_stints
+
+
+LINEUP_SEPARATOR = "|"
+
+
+# ---------- Feed positions and score ----------
+
+def running_score(all_game_data: pd.DataFrame) -> np.ndarray:
+    """(plays x 2) home/visitor score after each play; only scoring plays carry a score."""
+    scores = all_game_data[["hscore", "vscore"]].apply(pd.to_numeric, errors="coerce")
+    return scores.ffill().fillna(0).to_numpy(dtype=np.int64)
+
+
+def stint_positions(stints: pd.DataFrame, all_game_data: pd.DataFrame):
+    """Feed positions bounding each stint, with period edges placed between plays.
+
+    A synthesized period start sits just before the period's first play and a
+    stint open at the buzzer just after its last, so every stint is an interval
+    on the feed's play order and the score at a boundary is the score after
+    the plays that precede it.
+    """
+    period = all_game_data["period"].astype(int).to_numpy()
+    positions = np.arange(len(period))
+    first = pd.Series(positions).groupby(period).min()
+    last = pd.Series(positions).groupby(period).max()
+
+    stint_period = stints["period"].to_numpy(dtype=int)
+    start = stints["start_seq"].to_numpy(dtype=float)
+    end = stints["end_seq"].to_numpy(dtype=float)
+    start = np.where(np.isnan(start), first.reindex(stint_period).to_numpy(dtype=float) - 0.25, start)
+    end = np.where(np.isnan(end), last.reindex(stint_period).to_numpy(dtype=float) + 0.25, end)
+    return start, end
+
+
+def score_at(score: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Score after every play before each position (0-0 before the first play)."""
+    idx = np.ceil(positions).astype(np.int64) - 1
+    return np.where((idx >= 0)[:, None], score[np.maximum(idx, 0)], 0)
+
+
+# ---------- Interval index ----------
+
+class TeamSegments:
+    """One team's stints cut at every stint edge into segments with a fixed set of players.
+
+    ``bounds`` are the sorted edge positions; segment ``k`` runs from
+    ``bounds[k]`` to ``bounds[k + 1]`` and ``on[k]`` marks its players.
+    """
+
+    def __init__(self, team, vh, checkname, period, start_s, end_s, start_pos, end_pos):
+        self.team = team
+        self.vh = vh
+        self.players, player_idx = np.unique(checkname, return_inverse=True)
+
+        edges = np.concatenate([start_pos, end_pos])
+        self.bounds, first_edge = np.unique(edges, return_index=True)
+        edge_elapsed = np.concatenate([start_s, end_s])
+        edge_period = np.concatenate([period, period])
+        self.period = edge_period[first_edge[:-1]]
+        self.start_s = edge_elapsed[first_edge[:-1]]
+        self.end_s = edge_elapsed[first_edge[1:]]
+        # The gap from one period's buzzer to the next period's start has no length.
+        self.seconds = np.where(edge_period[first_edge[1:]] == self.period, self.end_s - self.start_s, 0)
+
+        # Each stint covers a contiguous run of segments: mark its first one
+        # and unmark the one after its last, then a cumulative sum fills it in.
+        first_seg = np.searchsorted(self.bounds, start_pos)
+        end_seg = np.searchsorted(self.bounds, end_pos)
+        cover = np.zeros((len(self.bounds), len(self.players)), dtype=np.int32)
+        np.add.at(cover, (first_seg, player_idx), 1)
+        np.add.at(cover, (end_seg, player_idx), -1)
+        self.on = np.cumsum(cover, axis=0)[:-1] > 0
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.bounds) - 1
+
+    def segment_at(self, positions) -> np.ndarray:
+        """Segment holding each feed position, -1 outside every segment."""
+        seg = np.searchsorted(self.bounds, np.asarray(positions, dtype=float), side="right") - 1
+        return np.where((seg >= 0) & (seg < self.num_segments), seg, -1)
+
+    def lineups(self) -> list:
+        names = self.players
+        return [LINEUP_SEPARATOR.join(names[row]) for row in self.on]
+
+
+class LineupIndex:
+    """Players on the floor for one game, indexed by feed position.
+
+    Built from ``allGameData`` and ``subData`` (``stints.build_sub_data``).
+    Each team's segments are sorted by start, so who was on the floor at a
+    play is one binary search over the segment starts, and a whole game's
+    scoring plays are located with a single ``np.searchsorted`` per team.
+    """
+
+    def __init__(self, stints: pd.DataFrame, start_pos, end_pos, score: np.ndarray):
+        self.stints = stints
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.score = score
+        self.teams = {}
+        vh = stints["vh"].to_numpy() if "vh" in stints else np.full(len(stints), None)
+        for team, idx in stints.groupby("team", sort=False).indices.items():
+            self.teams[team] = TeamSegments(
+                team, vh[idx][0], stints["checkname"].to_numpy()[idx],
+                stints["period"].to_numpy(dtype=int)[idx],
+                stints["start_s"].to_numpy(dtype=int)[idx], stints["end_s"].to_numpy(dtype=int)[idx],
+                start_pos[idx], end_pos[idx],
+            )
+
+    @classmethod
+    def from_game(cls, all_game_data: pd.DataFrame, sub_data: pd.DataFrame) -> "LineupIndex":
+        stints = build_stints(sub_data)
+        team_vh = sub_data.dropna(subset=["team", "vh"]).drop_duplicates("team").set_index("team")["vh"]
+        stints["vh"] = stints["team"].map(team_vh)
+        start_pos, end_pos = stint_positions(stints, all_game_data)
+        return cls(stints, start_pos, end_pos, running_score(all_game_data))
+
+    def on_floor(self, team, position) -> list:
+        segments = self.teams[team]
+        seg = segments.segment_at([position])[0]
+        return [] if seg < 0 else segments.players[segments.on[seg]].tolist()
+
+    def _scoring_plays(self):
+        """Positions of plays that changed the score, with the home and visitor points scored."""
+        delta = np.diff(self.score, axis=0, prepend=np.zeros((1, 2), dtype=self.score.dtype))
+        positions = np.flatnonzero(delta.any(axis=1))
+        return positions, delta[positions, 0], delta[positions, 1]
+
+    def _segment_points(self, segments: TeamSegments, scoring):
+        """Points for and against the team in each of its segments."""
+        positions, home, visitor = scoring
+        points_for, points_against = (home, visitor) if segments.vh == "H" else (visitor, home)
+        seg = segments.segment_at(positions)
+        inside = seg >= 0
+        size = segments.num_segments
+        return (np.bincount(seg[inside], weights=points_for[inside], minlength=size),
+                np.bincount(seg[inside], weights=points_against[inside], minlength=size))
+
+    def units(self) -> pd.DataFrame:
+        """Every segment with the score at its start and end, team by team."""
+        rows = []
+        for segments in self.teams.values():
+            if segments.num_segments < 1:
+                continue
+            entry = score_at(self.score, segments.bounds[:-1])
+            exit_ = score_at(self.score, segments.bounds[1:])
+            rows.append(pd.DataFrame({
+                "team": segments.team,
+                "vh": segments.vh,
+                "lineup": segments.lineups(),
+                "size": segments.on.sum(axis=1),
+                "period": segments.period,
+                "start_s": segments.start_s,
+                "end_s": segments.end_s,
+                "hscore_in": entry[:, 0], "vscore_in": entry[:, 1],
+                "hscore_out": exit_[:, 0], "vscore_out": exit_[:, 1],
+            }))
+        if not rows:
+            return pd.DataFrame(columns=["team", "vh", "lineup", "size", "period", "start_s", "end_s",
+                                         "hscore_in", "vscore_in", "hscore_out", "vscore_out"])
+        return pd.concat(rows, ignore_index=True)
+
+    def lineup_stats(self) -> pd.DataFrame:
+        """Minutes, points and plus/minus for each lineup a team used, most used first."""
+        scoring = self._scoring_plays()
+        rows = []
+        for segments in self.teams.values():
+            points_for, points_against = self._segment_points(segments, scoring)
+            rows.append(pd.DataFrame({
+                "team": segments.team,
+                "lineup": segments.lineups(),
+                "size": segments.on.sum(axis=1),
+                "minutes": segments.seconds / 60,
+                "points_for": points_for,
+                "points_against": points_against,
+            }))
+        stats = pd.concat(rows, ignore_index=True)
+        stats = stats[stats["size"] > 0]
+        stats = stats.groupby(["team", "lineup", "size"], as_index=False, sort=False).sum()
+        # Lineups that only existed between two substitutions at the same clock.
+        stats = stats[(stats["minutes"] > 0) | (stats["points_for"] + stats["points_against"] > 0)]
+        stats["plus_minus"] = stats["points_for"] - stats["points_against"]
+        return stats.sort_values(["team", "minutes"], ascending=[True, False]).reset_index(drop=True)
+
+    def on_off(self) -> pd.DataFrame:
+        """Each player's minutes, points and plus/minus with them on and off the floor."""
+        scoring = self._scoring_plays()
+        rows = []
+        for segments in self.teams.values():
+            points_for, points_against = self._segment_points(segments, scoring)
+            seconds = segments.seconds.astype(float)
+            on = segments.on.astype(float)
+            rows.append(on_off_table(
+                segments.team, segments.players, on.T @ seconds / 60, on.T @ points_for, on.T @ points_against,
+                seconds.sum() / 60, points_for.sum(), points_against.sum(),
+            ))
+        return pd.concat(rows, ignore_index=True)
+
+
+def on_off_table(team, players, on_minutes, on_for, on_against, team_minutes, team_for, team_against) -> pd.DataFrame:
+    """On/off splits from on-floor totals and the team's totals over the same games.
+
+    ``on_off`` is the player's net points per 40 minutes on the floor minus
+    the team's net per 40 without them.
+    """
+    table = pd.DataFrame({
+        "team": team,
+        "checkname": players,
+        "on_minutes": on_minutes,
+        "on_points_for": on_for,
+        "on_points_against": on_against,
+        "off_minutes": team_minutes - on_minutes,
+        "off_points_for": team_for - on_for,
+        "off_points_against": team_against - on_against,
+    })
+    table["on_plus_minus"] = table["on_points_for"] - table["on_points_against"]
+    table["off_plus_minus"] = table["off_points_for"] - table["off_points_against"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        on_rate = table["on_plus_minus"] / table["on_minutes"] * 40
+        off_rate = table["off_plus_minus"] / table["off_minutes"] * 40
+    table["on_off"] = (on_rate - off_rate).where(table["off_minutes"] > 0).round(2)
+    return table
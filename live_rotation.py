@@ -0,0 +1,164 @@
+import asyncio
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from async_fetch import AsyncFeedFetcher
+from feed_cache import FeedCache, content_digest
+from game_parser import parse_game
+from rotation_chart import (
+    TEAM_COLORS,
+    create_period_axes,
+    finish_rotation_axes,
+    format_period_axis,
+    plot_fouls,
+    plot_media_timeouts,
+    plot_stint_bars,
+    stint_bar_verts,
+)
+from stints import StintTracker
+
+
+VH_COLORS = dict(zip(("V", "H"), TEAM_COLORS))
+
+
+class LiveRotation:
+    """Rotation chart for a game in progress, updated in place on each poll.
+
+    Every poll revalidates the feed (an unchanged feed is a 304 and costs
+    nothing else), skips plays that were already processed while parsing, and
+    hands only the new ones to a :class:`stints.StintTracker`. The figure is
+    patched with the new bars, fouls and timeouts; it is only rebuilt when an
+    overtime period or an unrostered player changes the layout.
+    """
+
+    def __init__(self, game_id, fetcher: AsyncFeedFetcher = None):
+        self.game_id = str(game_id)
+        # live_ttl=0 makes every poll a conditional request for in-progress games.
+        self.fetcher = fetcher or AsyncFeedFetcher(cache=FeedCache(live_ttl=0))
+        self.tracker = StintTracker()
+        self.digest = None
+        self.is_final = False
+        self.figure = None
+        self._axes = {}
+        self._layout = None
+        self._positions = {}
+        self._open_bars = {}
+
+    def poll(self) -> bool:
+        """Fetch the feed and apply any new plays. Returns True if the chart changed."""
+        result = asyncio.run(self.fetcher.fetch(self.game_id))
+        digest = content_digest(result.content)
+        if digest == self.digest:
+            return False
+        self.digest = digest
+
+        game = parse_game(result.content, skip_plays=self.tracker.next_seq)
+        if game.total_plays < self.tracker.next_seq:
+            # The feed was rewritten with fewer plays; start over from scratch
+            # and redraw, since bars already drawn may no longer exist.
+            self.tracker = StintTracker()
+            self._layout = None
+            game = parse_game(result.content)
+        if self.tracker.period is None:
+            self.tracker.start(game.roster)
+
+        changes = self.tracker.update(game.plays, game.first_seq)
+        self.is_final = game.is_final
+        self._draw(changes)
+        return True
+
+    def stints(self) -> pd.DataFrame:
+        return self.tracker.stint_table(final=self.is_final)
+
+    def _current_layout(self):
+        tracker = self.tracker
+        periods = list(range(1, max(tracker.period or 1, 2) + 1))
+        players = (tracker.players.get("V", []) + tracker.players.get("H", []))[::-1]
+        return tuple(periods), tuple(players)
+
+    def _draw(self, changes):
+        layout = self._current_layout()
+        if layout != self._layout or self.figure is None:
+            self._rebuild(layout)
+            return
+
+        for checkname, vh, period, start_s, end_s in changes["stints"]:
+            bar = self._open_bars.pop(checkname, None)
+            if bar is not None and bar[1:] == (period, start_s):
+                bar[0].set_verts(stint_bar_verts([start_s], [end_s], [self._positions[checkname]]))
+            else:
+                if bar is not None:
+                    bar[0].remove()
+                self._add_bar(checkname, vh, period, start_s, end_s)
+        self._draw_open_stints()
+        self._draw_fouls(changes["fouls"])
+        self._draw_media_timeouts(changes["media_timeouts"])
+
+    def _rebuild(self, layout):
+        if self.figure is not None:
+            plt.close(self.figure)
+        periods, players = layout
+        self._layout = layout
+        self._positions = {player: idx * 0.5 for idx, player in enumerate(players)}
+        self._open_bars = {}
+
+        self.figure, axes = create_period_axes(periods)
+        self._axes = dict(zip(periods, axes))
+        for period, ax in self._axes.items():
+            format_period_axis(ax, period)
+
+        self._draw_closed_stints(self.tracker.stints)
+        self._draw_open_stints()
+        self._draw_fouls(self.tracker.fouls)
+        self._draw_media_timeouts(self.tracker.media_timeouts)
+        finish_rotation_axes(self.figure, axes, periods, list(players), self._positions)
+
+    def _add_bar(self, checkname, vh, period, start_s, end_s):
+        if checkname not in self._positions or period not in self._axes:
+            return None
+        return self._axes[period].broken_barh(
+            [(start_s, end_s - start_s)],
+            (self._positions[checkname] - 0.2, 0.4),
+            facecolors=VH_COLORS.get(vh, "gray"),
+        )
+
+    def _draw_closed_stints(self, stints):
+        """Finished stints as one bar collection per period and side."""
+        groups = {}
+        for checkname, vh, period, start_s, end_s in stints:
+            if checkname in self._positions and period in self._axes:
+                groups.setdefault((period, vh), []).append((start_s, end_s, self._positions[checkname]))
+        for (period, vh), bars in groups.items():
+            starts, ends, player_ys = zip(*bars)
+            plot_stint_bars(self._axes[period], starts, ends, player_ys, VH_COLORS.get(vh, "gray"))
+
+    def _draw_open_stints(self):
+        for checkname, vh, period, start_s, end_s in self.tracker.open_stints(self.is_final):
+            bar = self._open_bars.get(checkname)
+            if bar is not None and bar[1:] == (period, start_s):
+                bar[0].set_verts(stint_bar_verts([start_s], [end_s], [self._positions[checkname]]))
+                continue
+            if bar is not None:
+                bar[0].remove()
+            artist = self._add_bar(checkname, vh, period, start_s, end_s)
+            if artist is not None:
+                self._open_bars[checkname] = (artist, period, start_s)
+
+    def _draw_fouls(self, fouls):
+        by_period = {}
+        for checkname, period, elapsed in fouls:
+            if checkname in self._positions and period in self._axes:
+                by_period.setdefault(period, []).append((elapsed, self._positions[checkname]))
+        for period, points in by_period.items():
+            elapsed, player_ys = zip(*points)
+            plot_fouls(self._axes[period], elapsed, player_ys)
+
+    def _draw_media_timeouts(self, timeouts):
+        for seq, period, clock in timeouts:
+            if period not in self._axes:
+                continue
+            ax = self._axes[period]
+            plot_media_timeouts(ax, pd.DataFrame({"time": [clock]}, index=[seq]),
+                                int(ax.get_xlim()[1]), base_offset=0,
+                                offset_step=0.02 if period == 1 else 0.01)
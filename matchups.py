@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from power_rankings import get_power_rankings, load_hca_data
+from team_registry import TeamRegistry, get_team_registry
+
+
+@dataclass
+class MatchupIndex:
+    """Team ratings and home-court advantages indexed by team for spread queries.
+
+    Spreads follow the rankings' convention: from the home team's side, with a
+    home favorite negative. A team's neutral-site spread is its rating minus
+    the opponent's; a true home game also takes off the home team's HCA.
+    """
+    teams: list
+    ratings: np.ndarray
+    hca: np.ndarray
+
+    def __post_init__(self):
+        self.teams = list(self.teams)
+        self.ratings = np.asarray(self.ratings, dtype=float)
+        self.hca = np.asarray(self.hca, dtype=float)
+        self.team_index = {team: idx for idx, team in enumerate(self.teams)}
+
+    @classmethod
+    def from_rankings(cls, rankings: pd.DataFrame, hca_data: pd.DataFrame) -> "MatchupIndex":
+        """Build from a ``get_power_rankings`` table and ``load_hca_data``; teams without an HCA get 0."""
+        teams = rankings["team"].tolist()
+        hca = (
+            hca_data.drop_duplicates("Team").set_index("Team")["HCA"]
+            .reindex(teams).fillna(0).to_numpy(dtype=float)
+        )
+        return cls(teams, rankings["power_rating"].to_numpy(dtype=float), hca)
+
+    def ids(self, names) -> np.ndarray:
+        """Integer ids for ``names``; raises KeyError listing any unknown teams."""
+        get = self.team_index.get
+        ids = np.fromiter((get(name, -1) for name in names), dtype=np.int64, count=len(names))
+        if (ids < 0).any():
+            unknown = sorted({name for name, idx in zip(names, ids) if idx < 0})
+            raise KeyError(f"Unknown teams: {', '.join(map(str, unknown))}")
+        return ids
+
+    def resolve_slate(self, games: pd.DataFrame, registry: TeamRegistry = None):
+        """``games`` with home and road names canonicalized (aliases, case, spacing), plus
+        ``TeamRegistry.unresolved`` for the names that still match no team here."""
+        registry = (registry or get_team_registry()).copy()
+        registry.canonicalize(pd.Series(self.teams, dtype=object), register=True)
+        games = games.assign(home=registry.canonicalize(games["home"]), road=registry.canonicalize(games["road"]))
+        return games, registry.unresolved(pd.concat([games["home"], games["road"]]), known=self.teams)
+
+    def spread(self, home: str, road: str, neutral: bool = False) -> float:
+        return float(self.spreads([home], [road], [neutral])[0])
+
+    def spreads(self, home, road, neutral=False) -> np.ndarray:
+        """Projected home spreads for aligned sequences of home and road teams.
+
+        ``neutral`` is one flag for every game or a sequence of per-game flags.
+        """
+        home_ids = self.ids(list(home))
+        road_ids = self.ids(list(road))
+        neutral = np.broadcast_to(np.asarray(neutral, dtype=bool), home_ids.shape)
+        return self.ratings[home_ids] - self.ratings[road_ids] - np.where(neutral, 0.0, self.hca[home_ids])
+
+    def slate(self, games: pd.DataFrame) -> pd.DataFrame:
+        """``games`` (home, road and optionally neutral columns) with a ``spread`` column added."""
+        neutral = games["neutral"].fillna(0).astype(bool) if "neutral" in games.columns else False
+        return games.assign(spread=self.spreads(games["home"], games["road"], neutral))
+
+    def all_pairs(self, neutral: bool = False) -> pd.DataFrame:
+        """teams x teams spreads with the row team at home (or everyone on a neutral floor)."""
+        spreads = self.ratings[:, None] - self.ratings[None, :]
+        if not neutral:
+            spreads = spreads - self.hca[:, None]
+        return pd.DataFrame(spreads, index=pd.Index(self.teams, name="home"),
+                            columns=pd.Index(self.teams, name="road"))
+
+
+def load_matchup_index(hca_csv_path: str = "data/ncaa_hca.csv") -> MatchupIndex:
+    return MatchupIndex.from_rankings(get_power_rankings(hca_csv_path), load_hca_data(hca_csv_path))
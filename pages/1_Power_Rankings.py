@@ -1,39 +1,83 @@
+import contextlib
+from datetime import datetime
+
 import streamlit as st
-from power_rankings import get_power_rankings
+from instrumentation import PROFILERS, ProfileCapture, configure_logging, show_profile, start_metrics_server
+from rankings_cache import (
+    current_rankings,
+    export_bytes,
+    load_rating_intervals,
+    rankings_status,
+    refresh_rankings,
+    search_index,
+)
+
+configure_logging()
+start_metrics_server()
 
 st.set_page_config(layout="wide", page_title="CBB Power Rankings")
 
 st.title("📊 CBB Power Rankings")
 st.markdown("Current revised power ratings based on market spreads and recency weighting.")
 
-@st.cache_data(ttl=1800)
-def load_rankings():
-    return get_power_rankings("ncaa_hca.csv")
+profiler = st.sidebar.selectbox("Profile this page", ["Off", *PROFILERS],
+                                help="Profile this run of the page and show where the time went.")
+recompute = st.sidebar.button("Recompute rankings now",
+                              help="Refresh in this request instead of the background thread, so it is profiled.")
+
+capture = ProfileCapture(profiler) if profiler != "Off" else None
+with capture or contextlib.nullcontext():
+    try:
+        if recompute:
+            refresh_rankings()
+
+        rankings_revised, version = current_rankings()
+
+        updated_at, refresh_error = rankings_status()
+        if updated_at is not None:
+            st.caption(f"Last updated {datetime.fromtimestamp(updated_at):%Y-%m-%d %H:%M}")
+        if refresh_error is not None:
+            st.warning(f"Showing the last good rankings; the latest refresh failed: {refresh_error}")
 
-try:
-    rankings_revised = load_rankings()
+        search = st.text_input("Search team")
+        show_intervals = st.checkbox("Show 90% bootstrap intervals (ratings and ranks re-fit on resampled games)")
+        display_df = rankings_revised
 
-    search = st.text_input("Search team")
-    display_df = rankings_revised.copy()
+        if show_intervals:
+            intervals = load_rating_intervals()
+            display_df = display_df.merge(
+                intervals[["team", "rating_low", "rating_high", "rank_low", "rank_high"]],
+                on="team", how="left"
+            )
 
-    if search:
-        display_df = display_df[
-            display_df["team"].str.contains(search, case=False, na=False)
-        ]
+        if search:
+            # Row positions from a prebuilt index (names and aliases) instead of str.contains on every rerun.
+            display_df = display_df.iloc[search_index(version, rankings_revised["team"]).search(search)]
 
-    st.dataframe(
-        display_df,
-        use_container_width=True,
-        hide_index=True
-    )
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True
+        )
 
-    st.download_button(
-        label="⬇️ Download rankings as CSV",
-        data=display_df.to_csv(index=False).encode("utf-8"),
-        file_name="cbb_power_rankings.csv",
-        mime="text/csv"
-    )
+        # Export bytes are only built when a button is clicked, once per table version and filter.
+        export_key = (version, search, show_intervals)
+        csv_col, parquet_col = st.columns(2)
+        csv_col.download_button(
+            label="⬇️ Download rankings as CSV",
+            data=lambda: export_bytes(*export_key, "csv", display_df),
+            file_name="cbb_power_rankings.csv",
+            mime="text/csv"
+        )
+        parquet_col.download_button(
+            label="⬇️ Download rankings as Parquet",
+            data=lambda: export_bytes(*export_key, "parquet", display_df),
+            file_name="cbb_power_rankings.parquet",
+            mime="application/vnd.apache.parquet"
+        )
 
-except Exception as e:
-    st.error(f"Failed to load power rankings: {e}")
+    except Exception as e:
+        st.error(f"Failed to load power rankings: {e}")
 
+if capture is not None:
+    show_profile(capture)
@@ -0,0 +1,68 @@
+import pandas as pd
+import streamlit as st
+from matchups import MatchupIndex
+from power_rankings import load_hca_data
+from rankings_cache import HCA_CSV_PATH, load_rankings
+
+st.set_page_config(layout="wide", page_title="CBB Matchups")
+
+st.title("🏀 CBB Matchup Projections")
+st.markdown("Projected spreads from the revised power ratings. Negative spreads favor the home team.")
+
+@st.cache_data(ttl=1800)
+def load_hca():
+    return load_hca_data(HCA_CSV_PATH)
+
+try:
+    matchups = MatchupIndex.from_rankings(load_rankings(), load_hca())
+    teams = sorted(matchups.teams)
+
+    single_tab, slate_tab, matrix_tab = st.tabs(["Single game", "Slate", "All pairs"])
+
+    with single_tab:
+        col_home, col_road = st.columns(2)
+        home = col_home.selectbox("Home team", teams)
+        road = col_road.selectbox("Road team", teams, index=min(1, len(teams) - 1))
+        neutral = st.checkbox("Neutral site")
+        if home == road:
+            st.warning("Pick two different teams.")
+        else:
+            spread = matchups.spread(home, road, neutral)
+            favorite = home if spread < 0 else road
+            st.metric(f"{home} spread", f"{spread:+.1f}")
+            st.caption(f"{favorite} by {abs(spread):.1f}")
+
+    with slate_tab:
+        st.markdown("Upload a CSV with `home`, `road` and optionally `neutral` (1 for neutral site) columns.")
+        upload = st.file_uploader("Slate CSV", type="csv")
+        if upload is not None:
+            slate, unresolved = matchups.resolve_slate(pd.read_csv(upload))
+            if not unresolved.empty:
+                st.warning(f"{len(unresolved)} team name(s) in the slate did not match a rated team; "
+                           "their games are left out.")
+                st.dataframe(unresolved, use_container_width=True, hide_index=True)
+                unknown = set(unresolved["name"])
+                slate = slate[~(slate["home"].isin(unknown) | slate["road"].isin(unknown))]
+            projected = matchups.slate(slate)
+            projected["spread"] = projected["spread"].round(1)
+            st.dataframe(projected, use_container_width=True, hide_index=True)
+            st.download_button(
+                label="⬇️ Download projected slate as CSV",
+                data=projected.to_csv(index=False).encode("utf-8"),
+                file_name="cbb_projected_slate.csv",
+                mime="text/csv"
+            )
+
+    with matrix_tab:
+        matrix_neutral = st.checkbox("Neutral site for every pair", key="matrix_neutral")
+        matrix = matchups.all_pairs(neutral=matrix_neutral).round(1)
+        st.dataframe(matrix, use_container_width=True)
+        st.download_button(
+            label="⬇️ Download all-pairs spreads as CSV",
+            data=matrix.to_csv().encode("utf-8"),
+            file_name="cbb_all_pairs_spreads.csv",
+            mime="text/csv"
+        )
+
+except Exception as e:
+    st.error(f"Failed to load matchup projections: {e}")
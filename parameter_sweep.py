@@ -0,0 +1,211 @@
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from power_rankings import (
+    CREDIBILITY_COEFFICIENT,
+    build_design_matrix,
+    build_game_table,
+    load_hca_data,
+    normal_equations,
+    recency_weight,
+    solve_ratings,
+    team_game_table,
+)
+from snapshot_store import SnapshotStore
+
+
+DEFAULT_COEFFICIENTS = (0.0, 0.05, 0.1, CREDIBILITY_COEFFICIENT, 0.2, 0.25, 0.3)
+
+
+# ---------- Recency decays ----------
+# Module-level functions (and partials of them) so they pickle into worker processes.
+
+def harmonic_decay(games_ago, offset=0.5):
+    return 1 / (games_ago + offset)
+
+
+def exponential_decay(games_ago, rate=0.9):
+    return rate ** games_ago
+
+
+def uniform_decay(games_ago):
+    return np.ones_like(games_ago, dtype=float)
+
+
+DEFAULT_DECAYS = {
+    "harmonic_0.5": recency_weight,
+    "harmonic_2": partial(harmonic_decay, offset=2.0),
+    "harmonic_5": partial(harmonic_decay, offset=5.0),
+    "exponential_0.9": partial(exponential_decay, rate=0.9),
+    "exponential_0.95": partial(exponential_decay, rate=0.95),
+    "uniform": uniform_decay,
+}
+
+
+@dataclass
+class SweepFold:
+    """Training design and held-out games for one cutoff date, shared by every config."""
+    cutoff: pd.Timestamp
+    X: object
+    games_ago: np.ndarray
+    neutral_spread: np.ndarray
+    cover_margin: np.ndarray
+    test_home: np.ndarray
+    test_road: np.ndarray
+    test_hca: np.ndarray
+    test_actual_diff: np.ndarray
+    test_spread: np.ndarray
+
+
+def build_fold(games: pd.DataFrame, cutoff, horizon_days: int = 7) -> SweepFold:
+    """Train on games before ``cutoff``, test on the ``horizon_days`` after it."""
+    cutoff = pd.Timestamp(cutoff)
+    train = team_game_table(games[games["date"] < cutoff].reset_index(drop=True))
+    teams = sorted(set(train["team"]).union(train["opponent"]))
+    team_index = {team: idx for idx, team in enumerate(teams)}
+
+    test = games[(games["date"] >= cutoff) & (games["date"] < cutoff + pd.Timedelta(days=horizon_days))]
+    test_home = test["home"].map(team_index)
+    test_road = test["road"].map(team_index)
+    test = test[test_home.notna() & test_road.notna()]
+
+    neutral_spread = train["neutral_spread"].to_numpy(dtype=float)
+    return SweepFold(
+        cutoff=cutoff,
+        X=build_design_matrix(train["team_idx"], train["opponent_idx"], len(teams)),
+        games_ago=train["games_ago"].to_numpy(dtype=float),
+        neutral_spread=neutral_spread,
+        cover_margin=train["actual_diff"].to_numpy(dtype=float) + neutral_spread,
+        test_home=test["home"].map(team_index).to_numpy(dtype=np.int64),
+        test_road=test["road"].map(team_index).to_numpy(dtype=np.int64),
+        test_hca=np.where(test["neutral"].to_numpy() == 1, 0.0, test["home_hca"].to_numpy(dtype=float)),
+        test_actual_diff=test["actual_diff_home"].to_numpy(dtype=float),
+        test_spread=test["spread_home"].to_numpy(dtype=float),
+    )
+
+
+def default_cutoffs(games: pd.DataFrame, start_fraction: float = 0.3, every_days: int = 7) -> list:
+    """Weekly cutoffs from ``start_fraction`` of the way into the games' date range."""
+    first, last = games["date"].min(), games["date"].max()
+    start = (first + (last - first) * start_fraction).normalize()
+    return list(pd.date_range(start, last, freq=f"{every_days}D"))
+
+
+def evaluate_fold(fold: SweepFold, decay, coefficients) -> pd.DataFrame:
+    """Held-out errors of every coefficient for one fold and decay.
+
+    The revised target is ``neutral_spread - c * cover_margin``, linear in c,
+    so one solve with the two right-hand sides gives the ratings for every
+    coefficient at once.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    weights = decay(fold.games_ago)
+    A, B = normal_equations(fold.X, weights, np.column_stack([fold.neutral_spread, fold.cover_margin]))
+    solution = solve_ratings(A, B)
+    ratings = solution[:, [0]] - solution[:, [1]] * coefficients
+
+    predicted_spread = ratings[fold.test_home] - ratings[fold.test_road] - fold.test_hca[:, None]
+    margin_error = fold.test_actual_diff[:, None] + predicted_spread
+    market_error = np.abs(fold.test_actual_diff + fold.test_spread).mean() if len(margin_error) else np.nan
+    return pd.DataFrame({
+        "coefficient": coefficients,
+        "cutoff": fold.cutoff,
+        "games": len(margin_error),
+        "mae": np.abs(margin_error).mean(axis=0) if len(margin_error) else np.nan,
+        "rmse": np.sqrt((margin_error ** 2).mean(axis=0)) if len(margin_error) else np.nan,
+        "market_mae": market_error,
+    })
+
+
+# ---------- Process pool ----------
+# Folds and decays are sent to each worker once; tasks only carry indices.
+
+_worker_folds = None
+_worker_decays = None
+
+
+def _init_sweep_worker(folds, decays):
+    global _worker_folds, _worker_decays
+    _worker_folds = folds
+    _worker_decays = decays
+
+
+def _evaluate_task(fold_idx: int, decay_name: str, coefficients) -> pd.DataFrame:
+    result = evaluate_fold(_worker_folds[fold_idx], _worker_decays[decay_name], coefficients)
+    result.insert(0, "decay", decay_name)
+    return result
+
+
+def run_sweep(data: pd.DataFrame, hca_data: pd.DataFrame, coefficients=DEFAULT_COEFFICIENTS,
+              decays=None, cutoffs=None, horizon_days: int = 7, workers: int = None) -> pd.DataFrame:
+    """Out-of-sample errors for every (decay, coefficient, cutoff).
+
+    ``data`` and ``hca_data`` are the inputs of ``build_cleaned_data``.
+    ``decays`` maps names to picklable ``weight(games_ago)`` functions. Each
+    cutoff's design is built once and shared by every config; the
+    (cutoff, decay) solves run on a process pool (``workers=1`` runs them here).
+    """
+    decays = dict(DEFAULT_DECAYS if decays is None else decays)
+    games = build_game_table(data, hca_data)
+    games["date"] = pd.to_datetime(games["date"])
+    if cutoffs is None:
+        cutoffs = default_cutoffs(games)
+    folds = [build_fold(games, cutoff, horizon_days) for cutoff in cutoffs]
+    tasks = list(itertools.product(range(len(folds)), decays))
+    if not tasks:
+        raise ValueError("A sweep needs at least one cutoff and one decay.")
+    fold_ids = [fold_idx for fold_idx, _ in tasks]
+    names = [name for _, name in tasks]
+
+    if workers == 1:
+        _init_sweep_worker(folds, decays)
+        results = [_evaluate_task(fold_idx, name, coefficients) for fold_idx, name in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                 initargs=(folds, decays)) as pool:
+            results = list(pool.map(_evaluate_task, fold_ids, names, itertools.repeat(coefficients)))
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize_sweep(results: pd.DataFrame) -> pd.DataFrame:
+    """Game-weighted errors per (decay, coefficient) across cutoffs, best first."""
+    results = results[results["games"] > 0].assign(
+        abs_error=lambda df: df["mae"] * df["games"],
+        sq_error=lambda df: df["rmse"] ** 2 * df["games"],
+    )
+    totals = results.groupby(["decay", "coefficient"], sort=False)[["games", "abs_error", "sq_error"]].sum()
+    summary = pd.DataFrame({
+        "games": totals["games"],
+        "mae": totals["abs_error"] / totals["games"],
+        "rmse": np.sqrt(totals["sq_error"] / totals["games"]),
+    })
+    return summary.sort_values("mae").reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the credibility coefficient and recency decay out of sample.")
+    parser.add_argument("seasons", nargs="+", type=int, help="Seasons by ending year, e.g. 2024 2025")
+    parser.add_argument("--hca", default="ncaa_hca.csv", help="Home-court advantage CSV")
+    parser.add_argument("--horizon", type=int, default=7, help="Days of games scored after each cutoff")
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes (default: CPU count)")
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    store.backfill(args.seasons)
+    hca_data = load_hca_data(args.hca)
+    results = pd.concat(
+        [run_sweep(store.load(seasons=[season]), hca_data, horizon_days=args.horizon, workers=args.workers)
+         for season in args.seasons],
+        ignore_index=True,
+    )
+    print(summarize_sweep(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,123 +1,98 @@
+import warnings
+
 import numpy as np
 import pandas as pd
-import requests
-from io import StringIO
-from sklearn.linear_model import LinearRegression
+from io import BytesIO
+
+from instrumentation import span, timed
+from team_registry import get_team_registry
 
 
-PREDICTION_TRACKER_URL = "https://www.thepredictiontracker.com/ncaabb25.csv"
+PREDICTION_TRACKER_SEASON = 2025
 CREDIBILITY_COEFFICIENT = 0.15
 
+# requests and scipy are imported where they are used: pages that only read
+# rankings (or the HCA table) should not pay for the download and solver stacks.
+
+LINE_COLUMNS = [
+    "line",
+    "lineavg", "linemoore", "lineopen", "linedok", "linepugh",
+    "linedonc", "linetalis", "lineespn", "linepi", "linedd",
+    "linemassey", "linedunk", "lineteamrnks"
+]
+
+
+def prediction_tracker_url(season: int) -> str:
+    """CSV of every game in the season ending in ``season`` (2025 is 2024-25)."""
+    return f"https://www.thepredictiontracker.com/ncaabb{season % 100:02d}.csv"
+
+
+PREDICTION_TRACKER_URL = prediction_tracker_url(PREDICTION_TRACKER_SEASON)
+
+
+def season_of(dates: pd.Series) -> pd.Series:
+    """Season a game belongs to, named for the year it ends in (November 2024 is 2025)."""
+    return (dates.dt.year + (dates.dt.month >= 7)).astype("int16")
+
+
+def load_prediction_tracker_data(url: str = PREDICTION_TRACKER_URL) -> pd.DataFrame:
+    import requests
 
-TEAM_RENAME_DICT = {
-    'A&M-Commerce': 'East Texas A&M',
-    'Albany-NY': 'Albany',
-    'Arkansas-Little Rock': 'Little Rock',
-    'Boston': 'Boston University',
-    'Cal Poly SLO': 'Cal Poly',
-    'Cal Riverside': 'UC Riverside',
-    'California Baptist': 'Cal Baptist',
-    'Central Conn. St.': 'Central Connecticut',
-    'Central Florida': 'UCF',
-    'Citadel': 'The Citadel',
-    'CS Bakersfield': 'Cal St. Bakersfield',
-    'CS Sacramento': 'Sacramento St.',
-    'CS Northridge': 'CSUN',
-    'Detroit': 'Detroit Mercy',
-    'Florida International': 'FIU',
-    'Illinois-Chicago': 'Illinois Chicago',
-    'IPFW': 'Purdue Fort Wayne',
-    'Iu Indianapolis': 'IU Indy',
-    'IU Indianapolis': 'IU Indy',
-    'LIU Brooklyn': 'LIU',
-    'Louisiana-Lafayette': 'Lafayette',
-    'Louisiana-Monroe': 'Louisiana Monroe',
-    'Loyola-Chicago': 'Loyola Chicago',
-    'Loyola-Maryland': 'Loyola MD',
-    'McNeese St.': 'McNeese',
-    'MD Baltimore Co': 'UMBC',
-    'Md. Eastern Shore': 'Maryland Eastern Shore',
-    'Miami-Florida': 'Miami FL',
-    'Miami-Ohio': 'Miami OH',
-    'Middle Tenn St.': 'Middle Tennessee',
-    'Miss Valley St.': 'Mississippi Valley St.',
-    'Mo Kansas City': 'Kansas City',
-    'Mount St. Marys': "Mount St. Mary's",
-    'NC Asheville': 'UNC Asheville',
-    'NC Central': 'North Carolina Central',
-    'NC Charlotte': 'Charlotte',
-    'NC Greensboro': 'UNC Greensboro',
-    'NC Wilmington': 'UNC Wilmington',
-    'Nicholls St.': 'Nicholls',
-    'North Carolina St.': 'N.C. State',
-    'Pennsylvania': 'Penn',
-    'Prairie View': 'Prairie View A&M',
-    'SE Louisiana': 'Southeastern Louisiana',
-    'SE Missouri St.': 'Southeast Missouri',
-    'SIU Edwardsville': 'SIUE',
-    'South Carolina Upstat': 'USC Upstate',
-    'St. Francis (PA)': 'Saint Francis',
-    "St. Joseph's PA": "Saint Joseph's",
-    "St. Mary's": "Saint Mary's",
-    "St. Peter's": "Saint Peter's",
-    'St. Thomas (Mn)': "St. Thomas",
-    'SW Missouri St.': 'Missouri St.',
-    'Tennessee-Martin': 'Tennessee Martin',
-    'Texas A&M Corpus': 'Texas A&M Corpus Chris',
-    'Texas Arlington': 'UT Arlington',
-    'Texas San Antonio': 'UTSA',
-    'Troy St.': 'Troy',
-    'Umass Lowell': 'UMass Lowell',
-    'VA Commonwealth': 'VCU',
-    'Wisconsin-Green Bay': 'Green Bay',
-    'Wisconsin-Milwaukee': 'Milwaukee',
-    'Nevada': 'Nevada Wolf',
-    'Texas A&M-Corpus Christi': 'Texas A&M Corpus Chris',
-}
-
-
-def load_prediction_tracker_data() -> pd.DataFrame:
-    response = requests.get(PREDICTION_TRACKER_URL, timeout=30)
-    response.raise_for_status()
-    data = pd.read_csv(StringIO(response.content.decode("utf-8")))
+    with span("rankings.fetch"):
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+    return read_prediction_tracker_csv(response.content)
+
+
+@timed("rankings.parse")
+def read_prediction_tracker_csv(content: bytes) -> pd.DataFrame:
+    data = pd.read_csv(BytesIO(content), encoding="utf-8")
     data.columns = data.columns.str.strip()
     data["date"] = pd.to_datetime(data["date"], errors="coerce")
 
+    registry = get_team_registry()
     for col in ["home", "road"]:
-        data[col] = (
-            data[col]
-            .astype(str)
-            .str.strip()
-            .replace(TEAM_RENAME_DICT)
-        )
+        data[col] = registry.canonicalize(data[col])
 
     return data
 
 
+@timed("rankings.hca")
 def load_hca_data(hca_csv_path: str) -> pd.DataFrame:
     hca_data = pd.read_csv(hca_csv_path)
     hca_data.columns = hca_data.columns.str.strip()
-    hca_data["Team"] = (
-        hca_data["Team"]
-        .astype(str)
-        .str.strip()
-        .replace(TEAM_RENAME_DICT)
-    )
+    # The shared registry is already seeded with the HCA teams; names from
+    # another file are registered on a copy so they can't change how later
+    # reads resolve.
+    hca_data["Team"] = get_team_registry().copy().canonicalize(hca_data["Team"], register=True)
     hca_data["HCA"] = pd.to_numeric(hca_data["HCA"], errors="coerce")
     return hca_data
 
 
-def build_cleaned_data(data: pd.DataFrame, hca_data: pd.DataFrame) -> pd.DataFrame:
-    data = data.copy()
+def recency_weight(games_ago):
+    return 1 / (games_ago + 0.5)
 
-    line_cols = [
-        "line",
-        "lineavg", "linemoore", "lineopen", "linedok", "linepugh",
-        "linedonc", "linetalis", "lineespn", "linepi", "linedd",
-        "linemassey", "linedunk", "lineteamrnks"
-    ]
 
-    for col in ["hscore", "rscore", "neutral"] + [c for c in line_cols if c in data.columns]:
+def warn_unmatched_hca_teams(teams, hca_teams, registry=None):
+    """Warn about teams with no HCA entry whose name is close to one that has one.
+
+    Those teams are given an HCA of 0, which is right for non-Division I
+    opponents but skews the ratings when an alias is missing.
+    """
+    unresolved = (registry or get_team_registry()).unresolved(teams, known=hca_teams)
+    likely_aliases = unresolved[unresolved["suggestion"].notna()]
+    if len(likely_aliases):
+        pairs = ", ".join(f"{row.name!r} (did you mean {row.suggestion!r}?)"
+                          for row in likely_aliases.itertuples(index=False))
+        warnings.warn(f"Teams without an HCA entry, treated as 0: {pairs}")
+
+
+@timed("rankings.games")
+def build_game_table(data: pd.DataFrame, hca_data: pd.DataFrame) -> pd.DataFrame:
+    """One row per completed game with a line, with home-perspective spreads and margins."""
+    data = data.copy()
+
+    for col in ["hscore", "rscore", "neutral"] + [c for c in LINE_COLUMNS if c in data.columns]:
         data[col] = pd.to_numeric(data[col], errors="coerce")
 
     data = data.dropna(subset=["date", "home", "road", "hscore", "rscore"]).copy()
@@ -135,17 +110,17 @@ def build_cleaned_data(data: pd.DataFrame, hca_data: pd.DataFrame) -> pd.DataFra
     data = data.dropna(subset=["spread_home"]).copy()
     data["neutral"] = data["neutral"].fillna(0)
 
-    hca_lookup = hca_data[["Team", "HCA"]].drop_duplicates().copy()
-    home_hca = hca_lookup.rename(columns={"Team": "home", "HCA": "home_hca"})
-    road_hca = hca_lookup.rename(columns={"Team": "road", "HCA": "road_hca"})
-
-    games = (
-        data.merge(home_hca, on="home", how="left")
-            .merge(road_hca, on="road", how="left")
+    # Look HCA up by registry id so spelling variants still find their team.
+    registry = get_team_registry().copy()
+    hca_by_id = pd.Series(
+        hca_data["HCA"].to_numpy(dtype=float), index=registry.ids(hca_data["Team"], register=True)
     )
+    hca_by_id = hca_by_id[~hca_by_id.index.duplicated()]
 
-    games["home_hca"] = games["home_hca"].fillna(0)
-    games["road_hca"] = games["road_hca"].fillna(0)
+    games = data.reset_index(drop=True)
+    games["home_hca"] = hca_by_id.reindex(registry.ids(games["home"])).fillna(0).to_numpy()
+    games["road_hca"] = hca_by_id.reindex(registry.ids(games["road"])).fillna(0).to_numpy()
+    warn_unmatched_hca_teams(pd.concat([games["home"], games["road"]]), hca_data["Team"], registry)
 
     games["actual_diff_home"] = games["hscore"] - games["rscore"]
     games["cover_margin_home"] = games["actual_diff_home"] + games["spread_home"]
@@ -160,84 +135,137 @@ def build_cleaned_data(data: pd.DataFrame, hca_data: pd.DataFrame) -> pd.DataFra
         games["neutral_spread_home"] - CREDIBILITY_COEFFICIENT * games["cover_margin_home"]
     )
 
-    home_side = games[["date", "home"]].rename(columns={"home": "team"}).copy()
-    home_side["side"] = "home"
+    return games
 
-    road_side = games[["date", "road"]].rename(columns={"road": "team"}).copy()
-    road_side["side"] = "road"
 
-    team_games = pd.concat([home_side, road_side], ignore_index=True)
-    team_games = team_games.sort_values(["team", "date"], ascending=[True, False]).reset_index(drop=True)
-    team_games["games_ago_team"] = team_games.groupby("team").cumcount()
+@timed("rankings.clean")
+def build_cleaned_data(data: pd.DataFrame, hca_data: pd.DataFrame) -> pd.DataFrame:
+    """Long table with one row per team per game, most recent game first within each team.
+
+    Every game is stacked as a home row and a mirrored road row keyed by its
+    position in the games table, so games_ago is a rank within the team's
+    rows and needs no join back on (team, date); a team playing twice on
+    the same date keeps two rows.
+    """
+    return team_game_table(build_game_table(data, hca_data))
+
+
+def team_game_table(games: pd.DataFrame) -> pd.DataFrame:
+    """The long table of :func:`build_cleaned_data` from an already built games table.
+
+    ``game_idx`` is the game's row in ``games``; it is shared by the home and road rows.
+    """
+    num_games = len(games)
+
+    teams = pd.Categorical(np.concatenate([games["home"].to_numpy(), games["road"].to_numpy()]))
+    team_idx = teams.codes.astype(np.int64)
+    opponent_idx = np.concatenate([team_idx[num_games:], team_idx[:num_games]])
+    side_sign = np.repeat([1, -1], num_games)
+
+    def both_sides(column, mirrored=False):
+        values = games[column].to_numpy()
+        return np.concatenate([values, -values if mirrored else values])
+
+    date = both_sides("date")
+
+    # Stable sort, so ties on (team, date) keep home-then-road game order.
+    order = np.lexsort((-date.astype("datetime64[us]").astype(np.int64), team_idx))
+    sorted_team = team_idx[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_team[1:] != sorted_team[:-1]])
+    group_size = np.diff(np.r_[group_start, len(order)])
+    games_ago = np.arange(len(order)) - np.repeat(group_start, group_size)
+
+    categories = np.asarray(teams.categories, dtype=object)
+    cleaned_data = pd.DataFrame({
+        "date": pd.to_datetime(date[order]),
+        "team": pd.array(categories[team_idx[order]], dtype="str"),
+        "opponent": pd.array(categories[opponent_idx[order]], dtype="str"),
+        "home_road": pd.array(np.where(side_sign[order] > 0, "home", "road"), dtype="str"),
+        "neutral": both_sides("neutral")[order],
+        "spread": both_sides("spread_home", mirrored=True)[order],
+        "neutral_spread": both_sides("neutral_spread_home", mirrored=True)[order],
+        "actual_diff": both_sides("actual_diff_home", mirrored=True)[order],
+        "cover_margin": both_sides("cover_margin_home", mirrored=True)[order],
+        "games_ago": games_ago,
+        "team_weight": recency_weight(games_ago),
+        "team_idx": team_idx[order],
+        "opponent_idx": opponent_idx[order],
+        "game_idx": np.tile(np.arange(num_games), 2)[order],
+    })
 
-    home_games_ago = (
-        team_games[team_games["side"] == "home"][["team", "date", "games_ago_team"]]
-        .rename(columns={"team": "home", "games_ago_team": "home_games_ago"})
-    )
+    return cleaned_data
 
-    road_games_ago = (
-        team_games[team_games["side"] == "road"][["team", "date", "games_ago_team"]]
-        .rename(columns={"team": "road", "games_ago_team": "road_games_ago"})
-    )
 
-    games = games.merge(home_games_ago, on=["home", "date"], how="left")
-    games = games.merge(road_games_ago, on=["road", "date"], how="left")
-
-    games["home_weight"] = 1 / (games["home_games_ago"] + 0.5)
-    games["road_weight"] = 1 / (games["road_games_ago"] + 0.5)
-
-    home_df = pd.DataFrame({
-        "date": games["date"],
-        "team": games["home"],
-        "opponent": games["road"],
-        "home_road": "home",
-        "neutral": games["neutral"],
-        "spread": games["spread_home"],
-        "neutral_spread": games["neutral_spread_home"],
-        "actual_diff": games["actual_diff_home"],
-        "cover_margin": games["cover_margin_home"],
-        "games_ago": games["home_games_ago"],
-        "team_weight": games["home_weight"],
-    })
+def build_design_matrix(team_idx, opponent_idx, num_teams: int) -> "sparse.csr_matrix":
+    """Sparse (rows x teams) design with +1 for the team and -1 for its opponent."""
+    from scipy import sparse
 
-    road_df = pd.DataFrame({
-        "date": games["date"],
-        "team": games["road"],
-        "opponent": games["home"],
-        "home_road": "road",
-        "neutral": games["neutral"],
-        "spread": -games["spread_home"],
-        "neutral_spread": -games["neutral_spread_home"],
-        "actual_diff": -games["actual_diff_home"],
-        "cover_margin": -games["cover_margin_home"],
-        "games_ago": games["road_games_ago"],
-        "team_weight": games["road_weight"],
-    })
+    team_idx = np.asarray(team_idx, dtype=np.int64)
+    opponent_idx = np.asarray(opponent_idx, dtype=np.int64)
+    num_rows = len(team_idx)
+    rows = np.repeat(np.arange(num_rows), 2)
+    cols = np.column_stack([team_idx, opponent_idx]).ravel()
+    values = np.tile([1.0, -1.0], num_rows)
+    return sparse.csr_matrix((values, (rows, cols)), shape=(num_rows, num_teams))
 
-    cleaned_data = pd.concat([home_df, road_df], ignore_index=True)
 
-    all_teams = sorted(set(cleaned_data["team"]).union(set(cleaned_data["opponent"])))
-    team_to_idx = {team: idx for idx, team in enumerate(all_teams)}
+def normal_equations(X: "sparse.csr_matrix", weights: np.ndarray, Y: np.ndarray):
+    """Return (XᵀWX as a dense teams x teams array, XᵀWY)."""
+    XtW = X.T.multiply(weights).tocsr()
+    return (XtW @ X).toarray(), XtW @ Y
 
-    cleaned_data["team_idx"] = cleaned_data["team"].map(team_to_idx)
-    cleaned_data["opponent_idx"] = cleaned_data["opponent"].map(team_to_idx)
 
-    cleaned_data = cleaned_data.dropna(
-        subset=["team", "opponent", "neutral_spread", "actual_diff", "games_ago", "team_idx", "opponent_idx"]
-    ).copy()
+def solve_ratings(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Minimum-norm solution of the normal equations A x = B for every column of B.
 
-    cleaned_data["team_weight"] = pd.to_numeric(cleaned_data["team_weight"], errors="coerce")
-    missing_weight_mask = cleaned_data["team_weight"].isna() | (cleaned_data["team_weight"] <= 0)
-    cleaned_data.loc[missing_weight_mask, "team_weight"] = 1 / (
-        cleaned_data.loc[missing_weight_mask, "games_ago"] + 0.5
-    )
+    Ratings are only identified up to a constant (every row sums to zero), so
+    the minimum-norm solution is the one with ratings centered on zero within
+    each connected group of teams, matching an intercept-free least-squares fit.
 
-    cleaned_data["date"] = pd.to_datetime(cleaned_data["date"], errors="coerce")
-    cleaned_data = cleaned_data.sort_values(["team", "date"], ascending=[True, False]).reset_index(drop=True)
+    Adding a block of ones over each group makes A positive definite without
+    moving that solution (B sums to zero within every group), so a single
+    Cholesky factorization solves all columns of B.
+    """
+    from scipy import linalg, sparse
+    from scipy.sparse import csgraph
+
+    _, labels = csgraph.connected_components(sparse.csr_matrix(A), directed=False)
+    same_group = labels[:, None] == labels[None, :]
+    return linalg.solve(A + same_group, B, assume_a="pos")
 
-    return cleaned_data
 
+def center_by_component(A: np.ndarray, ratings: np.ndarray) -> np.ndarray:
+    """Shift ratings to mean zero within each connected group of teams."""
+    from scipy import sparse
+    from scipy.sparse import csgraph
 
+    num_groups, labels = csgraph.connected_components(sparse.csr_matrix(A), directed=False)
+    sums = np.zeros((num_groups,) + ratings.shape[1:])
+    np.add.at(sums, labels, ratings)
+    counts = np.bincount(labels, minlength=num_groups).reshape((-1,) + (1,) * (ratings.ndim - 1))
+    return ratings - (sums / counts)[labels]
+
+
+def solve_ratings_cg(A: np.ndarray, B: np.ndarray, x0: np.ndarray = None, rtol: float = 1e-13) -> np.ndarray:
+    """Same solution as :func:`solve_ratings` by Jacobi-preconditioned conjugate gradients.
+
+    Starting from ``x0`` (e.g. the previous day's ratings) only a few
+    iterations are needed when A and B changed a little. Centering each
+    connected group afterwards removes whatever null-space part x0 carried.
+    """
+    from scipy import sparse
+    from scipy.sparse.linalg import cg
+
+    diagonal = np.diag(A).copy()
+    diagonal[diagonal <= 0] = 1.0
+    preconditioner = sparse.diags(1.0 / diagonal)
+    x = np.zeros_like(B) if x0 is None else np.array(x0, dtype=float)
+    for col in range(B.shape[1]):
+        x[:, col], _ = cg(A, B[:, col], x0=x[:, col], rtol=rtol, M=preconditioner)
+    return center_by_component(A, x)
+
+
+@timed("rankings.fit")
 def build_rankings_revised(cleaned_data: pd.DataFrame) -> pd.DataFrame:
     model_data = cleaned_data.copy()
 
@@ -248,11 +276,7 @@ def build_rankings_revised(cleaned_data: pd.DataFrame) -> pd.DataFrame:
     model_data["opponent_idx"] = model_data["opponent"].map(team_index)
 
     num_teams = len(teams)
-    X = np.zeros((len(model_data), num_teams), dtype=float)
-    rows = np.arange(len(model_data))
-
-    X[rows, model_data["team_idx"].to_numpy()] = 1.0
-    X[rows, model_data["opponent_idx"].to_numpy()] = -1.0
+    X = build_design_matrix(model_data["team_idx"], model_data["opponent_idx"], num_teams)
 
     y = model_data["neutral_spread"].to_numpy(dtype=float)
 
@@ -260,21 +284,26 @@ def build_rankings_revised(cleaned_data: pd.DataFrame) -> pd.DataFrame:
     weights = np.where(np.isfinite(weights) & (weights > 0), weights, 1e-8)
     weights = weights / weights.sum()
 
-    base_model = LinearRegression(fit_intercept=False)
-    base_model.fit(X, y, sample_weight=weights)
+    # Base and revised targets share the design, so both are solved from one
+    # teams x teams system.
+    Y = revised_targets(y, model_data["actual_diff"])
+    A, B = normal_equations(X, weights, Y)
+    base_coef, revised_coef = solve_ratings(A, B).T
 
-    model_data["cover_margin_model"] = model_data["actual_diff"] + model_data["neutral_spread"]
-    model_data["revised_spread"] = (
-        model_data["neutral_spread"]
-        - CREDIBILITY_COEFFICIENT * model_data["cover_margin_model"]
-    )
+    return ratings_table(teams, revised_coef)
+
+
+def revised_targets(neutral_spread, actual_diff) -> np.ndarray:
+    """(rows x 2) targets: the market's neutral spread and its credibility-revised version."""
+    neutral_spread = np.asarray(neutral_spread, dtype=float)
+    cover_margin = np.asarray(actual_diff, dtype=float) + neutral_spread
+    return np.column_stack([neutral_spread, neutral_spread - CREDIBILITY_COEFFICIENT * cover_margin])
 
-    revised_model = LinearRegression(fit_intercept=False)
-    revised_model.fit(X, model_data["revised_spread"].to_numpy(dtype=float), sample_weight=weights)
 
+def ratings_table(teams, ratings) -> pd.DataFrame:
     rankings_revised = pd.DataFrame({
         "team": teams,
-        "power_rating": revised_model.coef_
+        "power_rating": ratings
     }).sort_values("power_rating", ascending=True).reset_index(drop=True)
 
     rankings_revised.insert(0, "rank", np.arange(1, len(rankings_revised) + 1))
@@ -0,0 +1,77 @@
+from functools import partial
+
+import streamlit as st
+
+from incremental_ratings import IncrementalRatings, update_power_rankings
+from power_rankings import PREDICTION_TRACKER_SEASON, build_cleaned_data, load_hca_data
+from rankings_refresher import RankingsRefresher
+from rankings_search import TeamSearchIndex, table_bytes
+from snapshot_store import SnapshotStore
+
+
+HCA_CSV_PATH = "ncaa_hca.csv"
+
+
+@st.cache_resource
+def ratings_state():
+    # Shared across sessions and pages; each refresh only folds in the games added since the last one.
+    return IncrementalRatings()
+
+
+@st.cache_resource
+def snapshot_store():
+    return SnapshotStore()
+
+
+@st.cache_resource
+def rankings_refresher():
+    # One background thread per server process recomputes the rankings; pages only read the result.
+    compute = partial(update_power_rankings, ratings_state(), HCA_CSV_PATH, store=snapshot_store())
+    return RankingsRefresher(compute).start()
+
+
+def refresh_rankings() -> bool:
+    """Recompute in the calling thread rather than the background one, e.g. to profile it."""
+    return rankings_refresher().refresh()
+
+
+def load_rankings():
+    return rankings_refresher().latest()
+
+
+def current_rankings():
+    """(table, updated_at); updated_at identifies the table version in the caches below."""
+    return rankings_refresher().current()
+
+
+def rankings_status():
+    """(time of the table being served, error from the last refresh attempt or None)."""
+    refresher = rankings_refresher()
+    return refresher.updated_at, refresher.last_error
+
+
+@st.cache_data(max_entries=2)
+def _rating_intervals(updated_at, replicates, level):
+    from rating_bootstrap import bootstrap_intervals
+
+    data = snapshot_store().load(seasons=[PREDICTION_TRACKER_SEASON])
+    cleaned_data = build_cleaned_data(data, load_hca_data(HCA_CSV_PATH))
+    return bootstrap_intervals(cleaned_data, replicates=replicates, level=level)
+
+
+def load_rating_intervals(replicates: int = 300, level: float = 0.9):
+    # Keyed on the rankings' timestamp so intervals are recomputed after each refresh.
+    return _rating_intervals(rankings_refresher().updated_at, replicates, level)
+
+
+# Arguments starting with "_" are not hashed by Streamlit; the table version
+# (updated_at) and the filter are the cache keys.
+
+@st.cache_resource(max_entries=2)
+def search_index(updated_at, _teams):
+    return TeamSearchIndex(list(_teams))
+
+
+@st.cache_data(max_entries=64)
+def export_bytes(updated_at, search, show_intervals, file_format, _table):
+    return table_bytes(_table, file_format)
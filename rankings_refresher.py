@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+RANKINGS_SNAPSHOT_PATH = os.environ.get("CBB_RANKINGS_PATH", os.path.join(".cache", "power_rankings.parquet"))
+
+# Seconds between scheduled recomputes, and before retrying one that failed.
+REFRESH_INTERVAL = 1800
+RETRY_INTERVAL = 120
+
+
+class RankingsRefresher:
+    """Serve the last good rankings table while a daemon thread recomputes it on a schedule.
+
+    Each successful ``compute()`` replaces the table in one assignment and
+    writes it to ``path`` (temp file + rename), so readers never wait on a
+    download or a refit and a restart starts from the persisted copy. A
+    failed refresh keeps the previous table and is reported via ``last_error``.
+    """
+
+    def __init__(self, compute, path: str = RANKINGS_SNAPSHOT_PATH, interval: float = REFRESH_INTERVAL,
+                 retry_interval: float = RETRY_INTERVAL):
+        self.compute = compute
+        self.path = path
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.last_error = None
+        self._latest = None  # (table, updated_at)
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # compute() folds games into shared state and appends to the snapshot,
+        # so the background thread and on-demand refreshes take turns.
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._load_persisted()
+
+    @property
+    def updated_at(self):
+        latest = self._latest
+        return latest[1] if latest else None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rankings-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def refresh_now(self):
+        """Ask the thread to recompute without waiting for the schedule."""
+        self._wake.set()
+
+    def current(self, timeout: float = 120):
+        """(table, updated_at) being served. Only blocks before the first table exists,
+        then raises the refresh error if there still is none."""
+        if not self._ready.wait(timeout):
+            raise TimeoutError("Power rankings are still being computed.")
+        latest = self._latest
+        if latest is None:
+            raise self.last_error or RuntimeError("Power rankings are unavailable.")
+        return latest
+
+    def latest(self, timeout: float = 120) -> pd.DataFrame:
+        return self.current(timeout)[0]
+
+    def refresh(self) -> bool:
+        """Recompute once in the calling thread, after any refresh already running.
+        Returns False if it failed."""
+        with self._refresh_lock:
+            try:
+                table = self.compute()
+            except Exception as e:
+                self.last_error = e
+                if self._latest is None:
+                    # Let waiting readers see the error instead of timing out.
+                    self._ready.set()
+                return False
+            self._latest = (table, time.time())
+            self.last_error = None
+            self._ready.set()
+            self._persist(table)
+            return True
+
+    def _run(self):
+        updated_at = self.updated_at
+        delay = 0 if updated_at is None else max(0.0, updated_at + self.interval - time.time())
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            delay = self.interval if self.refresh() else self.retry_interval
+
+    def _load_persisted(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            table = pd.read_parquet(self.path)
+        except Exception:
+            return
+        self._latest = (table, os.path.getmtime(self.path))
+        self._ready.set()
+
+    def _persist(self, table: pd.DataFrame):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The in-memory table is still served; only restarts lose it.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
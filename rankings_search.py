@@ -0,0 +1,65 @@
+from bisect import bisect_left
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from team_registry import get_team_registry, team_key
+
+
+class TeamSearchIndex:
+    """Lowercased team names and their registry aliases, sorted for search-as-you-type.
+
+    ``search`` returns row positions into the table the index was built from,
+    so callers can ``iloc`` the matching rows without copying or scanning the
+    table. Results are memoized per query.
+    """
+
+    MAX_CACHED_QUERIES = 256
+
+    def __init__(self, teams, registry=None):
+        registry = registry or get_team_registry()
+        alias_keys = registry.alias_keys()
+        keys, rows = [], []
+        for row, team in enumerate(teams):
+            for key in {team_key(team), *alias_keys.get(registry.resolve(team), ())}:
+                keys.append(key)
+                rows.append(row)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.num_rows = len(teams)
+        self._keys = [keys[i] for i in order]
+        self._rows = np.array([rows[i] for i in order], dtype=np.int64)
+        self._cache = {}
+
+    def search(self, query: str, prefix: bool = False) -> np.ndarray:
+        """Sorted row positions whose name or an alias contains (or starts with) ``query``."""
+        query = team_key(query)
+        if not query:
+            return np.arange(self.num_rows)
+        cached = self._cache.get((query, prefix))
+        if cached is not None:
+            return cached
+
+        if prefix:
+            start = bisect_left(self._keys, query)
+            stop = bisect_left(self._keys, query + "\uffff", lo=start)
+            hits = self._rows[start:stop]
+        else:
+            hits = self._rows[np.fromiter((query in key for key in self._keys), dtype=bool, count=len(self._keys))]
+        rows = np.unique(hits)
+
+        if len(self._cache) >= self.MAX_CACHED_QUERIES:
+            self._cache.clear()
+        self._cache[(query, prefix)] = rows
+        return rows
+
+
+def table_bytes(table: pd.DataFrame, file_format: str = "csv") -> bytes:
+    """``table`` encoded for download as "csv" or "parquet"."""
+    if file_format == "csv":
+        return table.to_csv(index=False).encode("utf-8")
+    if file_format == "parquet":
+        buffer = BytesIO()
+        table.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported export format: {file_format}")
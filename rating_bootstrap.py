@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from power_rankings import (
+    build_design_matrix,
+    center_by_component,
+    normal_equations,
+    revised_targets,
+    solve_ratings,
+)
+
+
+DEFAULT_REPLICATES = 300
+
+
+def bootstrap_ratings(cleaned_data: pd.DataFrame, replicates: int = DEFAULT_REPLICATES, seed: int = 0,
+                      rtol: float = 1e-6, max_iter: int = 1000):
+    """Revised ratings re-fit on ``replicates`` resamples of the games in ``cleaned_data``.
+
+    Games are drawn with replacement, so both rows of a game (``game_idx``)
+    get the same count, which multiplies their recency weight. Every
+    replicate shares the sparse design; all of them are solved together by
+    matrix-free, Jacobi-preconditioned conjugate gradients started from the
+    full-sample ratings, one sparse product per iteration for the whole batch.
+
+    Returns (teams, point ratings, teams x replicates sample array).
+    """
+    teams = sorted(set(cleaned_data["team"]).union(cleaned_data["opponent"]))
+    team_index = {team: idx for idx, team in enumerate(teams)}
+    X = build_design_matrix(cleaned_data["team"].map(team_index), cleaned_data["opponent"].map(team_index), len(teams))
+    Xt = X.T.tocsr()
+    weights = cleaned_data["team_weight"].to_numpy(dtype=float)
+    target = revised_targets(cleaned_data["neutral_spread"], cleaned_data["actual_diff"])[:, 1]
+
+    A, B = normal_equations(X, weights, target[:, None])
+    point = solve_ratings(A, B)[:, 0]
+
+    game_codes, game_keys = pd.factorize(cleaned_data["game_idx"])
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(len(game_keys), np.full(len(game_keys), 1 / len(game_keys)), size=replicates).T
+    row_weights = weights[:, None] * counts[game_codes]
+
+    b = Xt @ (row_weights * target[:, None])
+    diagonal = abs(Xt) @ row_weights
+    # A team whose games were all left out keeps its full-sample rating.
+    diagonal[diagonal <= 0] = 1.0
+
+    x = np.repeat(point[:, None], replicates, axis=1)
+    residual = b - Xt @ (row_weights * (X @ x))
+    z = residual / diagonal
+    direction = z.copy()
+    rz = (residual * z).sum(axis=0)
+    threshold = rtol * np.maximum(np.linalg.norm(b, axis=0), 1e-12)
+    for _ in range(max_iter):
+        active = np.linalg.norm(residual, axis=0) > threshold
+        if not active.any():
+            break
+        product = Xt @ (row_weights * (X @ direction))
+        curvature = (direction * product).sum(axis=0)
+        step = np.where(active & (curvature > 0), rz / np.where(curvature > 0, curvature, 1.0), 0.0)
+        x += step * direction
+        residual -= step * product
+        z = residual / diagonal
+        rz_next = (residual * z).sum(axis=0)
+        direction = z + np.where(rz > 0, rz_next / np.where(rz > 0, rz, 1.0), 0.0) * direction
+        rz = rz_next
+
+    # Preconditioned steps can shift a whole group of teams; ratings are only
+    # defined up to that shift, so re-center as the full-sample solve does.
+    return teams, point, center_by_component(A, x)
+
+
+def bootstrap_intervals(cleaned_data: pd.DataFrame, replicates: int = DEFAULT_REPLICATES,
+                        level: float = 0.9, seed: int = 0) -> pd.DataFrame:
+    """Rankings table with percentile intervals for each team's rating and rank.
+
+    Ranks are recomputed within every replicate (1 is the lowest rating, as in
+    the rankings), so ``rank_low``/``rank_high`` show how far a team could move.
+    """
+    teams, point, samples = bootstrap_ratings(cleaned_data, replicates, seed)
+    tail = (1 - level) / 2
+    ranks = samples.argsort(axis=0).argsort(axis=0) + 1
+
+    intervals = pd.DataFrame({
+        "team": teams,
+        "power_rating": point,
+        "rating_low": np.quantile(samples, tail, axis=1).round(2),
+        "rating_high": np.quantile(samples, 1 - tail, axis=1).round(2),
+        "rank_low": np.quantile(ranks, tail, axis=1, method="lower").astype(int),
+        "rank_high": np.quantile(ranks, 1 - tail, axis=1, method="higher").astype(int),
+    }).sort_values("power_rating").reset_index(drop=True)
+    intervals.insert(0, "rank", np.arange(1, len(intervals) + 1))
+    intervals["power_rating"] = intervals["power_rating"].round(2)
+    return intervals
@@ -0,0 +1,143 @@
+import json
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from game_feed import GameFeed, load_game_feed
+from instrumentation import timed
+from rotation_chart import build_rotation_data, draw_rotation_chart, rotation_payload
+
+
+RENDER_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "json": "application/json"}
+
+# Total bytes of rendered charts kept before least-recently-used ones are dropped.
+RENDER_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+
+class RenderCache:
+    """In-memory LRU of rendered chart bytes keyed by (game_id, feed digest, style).
+
+    The feed digest changes whenever a live game's XML does, so in-progress
+    games re-render on new plays while final games are rendered once.
+    """
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value: bytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_render_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
+
+
+@timed("rotation.encode")
+def figure_bytes(fig, fmt: str = "png", dpi: int = 100) -> bytes:
+    """Encode ``fig`` and close it so long-running servers don't accumulate figures."""
+    import matplotlib.pyplot as plt
+
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_rotation_chart(game_id, fmt: str = "png", dpi: int = 100, feed: GameFeed = None,
+                          cache: RenderCache = None) -> bytes:
+    """Rotation chart as PNG or SVG bytes, rendered at most once per feed version and style."""
+    if fmt not in ("png", "svg"):
+        raise ValueError(f"Unsupported chart format: {fmt}")
+    cache = cache or get_render_cache()
+    if feed is None:
+        feed = load_game_feed(game_id)
+
+    key = (str(game_id), feed.digest, (fmt, dpi))
+    content = cache.get(key)
+    if content is None:
+        content = figure_bytes(draw_rotation_chart(build_rotation_data(game_id, feed)), fmt, dpi)
+        cache.put(key, content)
+    return content
+
+
+def rotation_chart_json(game_id, feed: GameFeed = None, cache: RenderCache = None) -> bytes:
+    """The JSON stint payload for ``game_id`` (see ``rotation_payload``), cached like the images."""
+    cache = cache or get_render_cache()
+    if feed is None:
+        feed = load_game_feed(game_id)
+
+    key = (str(game_id), feed.digest, ("json",))
+    content = cache.get(key)
+    if content is None:
+        content = json.dumps(rotation_payload(build_rotation_data(game_id, feed))).encode("utf-8")
+        cache.put(key, content)
+    return content
+
+
+def rotation_vega_lite(payload: dict) -> dict:
+    """Vega-Lite spec drawing ``rotation_chart_json``'s payload in the browser, one column per period."""
+    players = [player["checkname"] for player in payload["players"]]
+    colors = {player["team"]: player["color"] for player in payload["players"] if player["team"]}
+    values = (
+        [dict(stint, kind="stint") for stint in payload["stints"]]
+        + [dict(foul, kind="foul") for foul in payload["fouls"]]
+        + [dict(timeout, kind="timeout") for timeout in payload["media_timeouts"]]
+    )
+    x = {"type": "quantitative", "title": "Elapsed (s)"}
+    y = {"field": "checkname", "type": "nominal", "sort": players, "title": None}
+    return {
+        "data": {"values": values},
+        "facet": {"column": {"field": "period", "type": "ordinal", "title": "Period"}},
+        "resolve": {"scale": {"x": "independent"}},
+        "spec": {
+            "width": 260,
+            "layer": [
+                {
+                    "transform": [{"filter": "datum.kind === 'stint'"}],
+                    "mark": {"type": "bar", "height": 10},
+                    "encoding": {
+                        "x": dict(x, field="start_s"), "x2": {"field": "end_s"}, "y": y,
+                        "color": {"field": "team", "type": "nominal",
+                                  "scale": {"domain": list(colors), "range": list(colors.values())}},
+                        "tooltip": [{"field": "checkname"}, {"field": "start_s"}, {"field": "end_s"}],
+                    },
+                },
+                {
+                    "transform": [{"filter": "datum.kind === 'foul'"}],
+                    "mark": {"type": "point", "shape": "cross", "color": "black"},
+                    "encoding": {"x": dict(x, field="elapsed_s"), "y": y},
+                },
+                {
+                    "transform": [{"filter": "datum.kind === 'timeout'"}],
+                    "mark": {"type": "rule", "strokeDash": [2, 2], "color": "black"},
+                    "encoding": {"x": dict(x, field="elapsed_s"), "tooltip": [{"field": "clock"}]},
+                },
+            ],
+        },
+    }
@@ -1,314 +1,184 @@
-import requests
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.lines as mlines
-import matplotlib.patches as mpatches
-import re
 
+from game_feed import GameFeed, load_game_feed
+from instrumentation import timed
+from stints import build_stints, build_sub_data, period_seconds
+from team_registry import get_team_registry
 
-def generate_rotation_chart(game_id):
-    # -----------------------------------------------------------
-    # Build URL from game_id (your required format)
-    # -----------------------------------------------------------
-    url = f"http://archive.statbroadcast.com/{game_id}.xml"
 
-    # -----------------------------------------------------------
-    # Duplicate fetch/parse logic so your original ordering works
-    # (Option 1 — preserves exact execution order)
-    # -----------------------------------------------------------
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise Exception(f"Failed to fetch XML data. Status code: {response.status_code}")
+# Bar colors for the first and second team on the chart.
+TEAM_COLORS = ("yellow", "green")
 
-    root = ET.fromstring(response.content)
+# matplotlib is imported by the drawing functions themselves, so building
+# chart data (the JSON output, the rotation store) never pays for it.
 
-    # -----------------------------------------------------------
-    # Step 2: Extract and assign periods directly to plays
-    # -----------------------------------------------------------
-    data = []
-    current_period = None
-
-    for elem in root.iter():
-        if elem.tag == 'period':
-            current_period = elem.attrib.get('number')
-
-        elif elem.tag == 'play':
-            row = {
-                "time": elem.attrib.get("time"),
-                "period": current_period,
-                "team": elem.attrib.get("team"),
-                "vh": elem.attrib.get("vh"),
-                "uni": elem.attrib.get("uni"),
-                "checkname": elem.attrib.get("checkname"),
-                "action": elem.attrib.get("action"),
-                "type": elem.attrib.get("type"),
-                "hscore": elem.attrib.get("hscore"),
-                "vscore": elem.attrib.get("vscore"),
-            }
-            data.append(row)
-
-    allGameData = pd.DataFrame(data)
 
-    # -----------------------------------------------------------
-    # clean_name function (first version)
-    # -----------------------------------------------------------
-    def clean_name(name):
-        name = name.strip().upper()
-        name = name.replace('"', '')
-        name = re.sub(r'\s+', ' ', name)
-        name = re.sub(r',\s+', ',', name)
-        return name.strip()
+def time_to_seconds(time_str):
+    minutes, seconds = map(int, time_str.split(":"))
+    return minutes * 60 + seconds
 
-    # -----------------------------------------------------------
-    # Fetch AGAIN because your script does this twice (preserve logic)
-    # -----------------------------------------------------------
-    response = requests.get(url)
-    response.raise_for_status()
-    root = ET.fromstring(response.text)
 
-    # -----------------------------------------------------------
-    # Find starters
-    # -----------------------------------------------------------
-    starters = root.findall(".//player[@gs='1']")
-    starter_players = []
-    for player in starters:
-        player_name = player.get('name', 'Unknown')
-        cleaned_name = clean_name(player_name)
-        starter_players.append(cleaned_name)
-
-    # Apply your manual corrections exactly:
-    starter_players = [
-        "LINGUARD, JR.,CARLTON" if player == "LINGUARD,JR.,CARLTON" else
-        "FLOYD, JR.,COREY" if player == "FLOYD,JR.,COREY" else
-        "MCNEIL, JR.,PAUL" if player == "MCNEIL,JR.,PAUL" else player
-        for player in starter_players
-    ]
+def seconds_to_time(seconds):
+    minutes = seconds // 60
+    seconds = seconds % 60
+    return f"{minutes}:{seconds:02}"
 
-    print("Cleaned Starters:")
-    for player_name in starter_players:
-        print(player_name)
 
-    # -----------------------------------------------------------
-    # Sub data
-    # -----------------------------------------------------------
-    subData = allGameData[allGameData['action'] == 'SUB'].reset_index(drop=True)
+def create_period_axes(periods):
+    import matplotlib.pyplot as plt
+
+    num_periods = len(periods)
+    if num_periods == 2:
+        fig, axes = plt.subplots(1, num_periods, figsize=(12, 10), sharey=True)
+    else:
+        fig, axes = plt.subplots(1, num_periods, figsize=(20, 12), sharey=True)
 
-    # Redefine clean_name (your script does this, we keep it)
-    def clean_name(name):
-        return re.sub(r'\s+', ' ', name.strip().upper())
+    if num_periods == 1:
+        axes = [axes]
+    return fig, axes
 
-    subData["checkname"] = subData["checkname"].apply(clean_name)
 
-    # -----------------------------------------------------------
-    # Create SUB IN rows at 20:00 for starters
-    # -----------------------------------------------------------
-    new_rows = []
-    for starter in starter_players:
-        if starter not in subData["checkname"].unique():
-            continue
-
-        starter_data = subData[subData["checkname"] == starter].iloc[0]
-        new_rows.append({
-            "time": "20:00",
-            "period": "1",
-            "team": starter_data["team"],
-            "vh": starter_data["vh"],
-            "uni": starter_data["uni"],
-            "checkname": starter,
-            "action": "SUB",
-            "type": "IN",
-            "hscore": None,
-            "vscore": None,
-        })
-
-    if new_rows:
-        subData = pd.concat([subData, pd.DataFrame(new_rows)], ignore_index=True)
-        subData.drop_duplicates(inplace=True)
-
-    subData.sort_values(by=["period", "time"], inplace=True)
+def format_period_axis(ax, period):
+    # Overtime periods are 5 minutes, halves are 20
+    period_end_time = period_seconds(period)
+    ax.set_title(f"Period {period}")
+    ax.set_xlim(0, period_end_time)
+    # Set x-ticks dynamically based on period length
+    tick_interval = period_end_time // 4
+    ax.set_xticks(range(0, period_end_time + 1, tick_interval))
+    ax.set_xticklabels([seconds_to_time(t) for t in range(period_end_time, -1, -tick_interval)])
+    ax.set_xlabel("Game Time (MM:SS)")
+    ax.grid(axis="x", linestyle="--", alpha=0.7)
 
-    # -----------------------------------------------------------
-    # Compute time_in_seconds, last_event logic (your code preserved)
-    # -----------------------------------------------------------
-    subData['time_in_seconds'] = subData['time'].str.split(':').apply(lambda x: int(x[0]) * 60 + int(x[1]))
-    period_1_data = subData[subData['period'] == '1']
 
-    last_event = period_1_data.loc[
-        period_1_data.groupby('checkname')['time_in_seconds'].transform('min')
-        == period_1_data['time_in_seconds']
-    ]
+def clock_seconds(clocks) -> np.ndarray:
+    """Seconds remaining for a sequence of MM:SS game clocks."""
+    return np.array([time_to_seconds(clock) for clock in clocks], dtype=int)
 
-    simultaneous_events = period_1_data.groupby(['checkname', 'time_in_seconds']).filter(
-        lambda x: len(x) > 1 and {'IN', 'OUT'}.issubset(set(x['type']))
-    )
 
-    players_on_court_end_period_1 = pd.concat([
-        last_event[last_event['type'] == 'IN'],
-        simultaneous_events[simultaneous_events['type'] == 'IN']
-    ]).drop_duplicates(subset=['checkname'])
+def stint_bar_verts(starts, ends, player_ys, height=0.4) -> np.ndarray:
+    """(n, 4, 2) rectangle vertices for bars from ``starts`` to ``ends`` centered on ``player_ys``."""
+    starts, ends, player_ys = (np.asarray(v, dtype=float) for v in (starts, ends, player_ys))
+    low, high = player_ys - height / 2, player_ys + height / 2
+    return np.stack([
+        np.column_stack([starts, low]), np.column_stack([starts, high]),
+        np.column_stack([ends, high]), np.column_stack([ends, low]),
+    ], axis=1)
 
-    period_2_sub_out = subData[
-        (subData['period'] == '2') &
-        (subData['time'] == '20:00') &
-        (subData['action'] == 'SUB') &
-        (subData['type'] == 'OUT')
-    ]
 
-    players_to_add = players_on_court_end_period_1[
-        ~players_on_court_end_period_1['checkname'].isin(period_2_sub_out['checkname'])
-    ]
+def plot_stint_bars(ax, starts, ends, player_ys, color):
+    """All of one team's bars on ``ax`` as a single collection (what ``broken_barh`` draws per bar)."""
+    from matplotlib.collections import PolyCollection
 
-    new_rows = players_to_add.copy()
-    new_rows['time'] = '20:00'
-    new_rows['time_in_seconds'] = 1200
-    new_rows['period'] = '2'
-    new_rows['action'] = 'SUB'
-    new_rows['type'] = 'IN'
-    new_rows = new_rows[['time', 'period', 'team', 'vh', 'uni', 'checkname', 'action', 'type']]
+    bars = PolyCollection(stint_bar_verts(starts, ends, player_ys), facecolors=color)
+    ax.add_collection(bars)
+    return bars
 
-    subData = pd.concat([subData, new_rows], ignore_index=True)
-    subData = subData.sort_values(by=['period', 'time_in_seconds'], ascending=[True, False]).reset_index(drop=True)
 
-    # -----------------------------------------------------------
-    # Build mapping checkname -> team
-    # -----------------------------------------------------------
-    checkname_team_map = allGameData.dropna(subset=['checkname','team']).drop_duplicates(subset=['checkname'])[['checkname','team']]
-    name_to_team = dict(zip(checkname_team_map['checkname'], checkname_team_map['team']))
+def plot_fouls(ax, elapsed, player_ys):
+    if len(elapsed):
+        ax.scatter(elapsed, player_ys, color="black", label="Foul", s=30, marker="x", zorder=5)
+
+
+def plot_media_timeouts(ax, media_timeouts, period_end_time, base_offset=-25, offset_step=.1):
+    if media_timeouts.empty:
+        return
+    clocks = media_timeouts['time'].tolist()
+    timeout_times = period_end_time - clock_seconds(clocks)
+    ax.vlines(timeout_times, 0, 1, transform=ax.get_xaxis_transform(),
+              colors='black', linestyles=':', linewidth=2)
+    label_ys = base_offset + media_timeouts.index.to_numpy() * offset_step
+    for timeout_time, label_y, timeout_str in zip(timeout_times, label_ys, clocks):
+        ax.text(timeout_time, label_y, timeout_str,
+                color='black', fontsize=8,
+                verticalalignment='center', horizontalalignment='right')
+
+
+def finish_rotation_axes(fig, axes, periods, player_labels, player_positions):
+    """Player y-axis, legend and aspect ratios shared by every rotation chart."""
+    import matplotlib.lines as mlines
+    import matplotlib.pyplot as plt
+
+    player_y_positions = [player_positions[p] for p in player_labels]
+    N = len(player_labels)
+    top_bar_edge = (N-1)*0.5 + 0.2
+    for ax in axes:
+        ax.set_yticks(player_y_positions)
+        ax.set_yticklabels(player_labels, fontsize=10)
+        ax.set_ylabel("Players")
+        ax.set_ylim(-0.5, top_bar_edge)
+
+    # Create dummy handles for legend
+    media_timeout_handle = mlines.Line2D([], [], color='black', linestyle=':', label='Media Timeout')
+    foul_handle = mlines.Line2D([], [], color='black', marker='x', linestyle='None', label='Foul')
+
+    # Adjust legend positioning based on number of periods
+    num_periods = len(periods)
+    if num_periods == 2:
+        fig.legend(handles=[foul_handle, media_timeout_handle],
+                   loc='lower center', bbox_to_anchor=(0.58, 0.22), ncol=2)
+    elif num_periods == 3:
+        fig.legend(handles=[foul_handle, media_timeout_handle],
+                   loc='lower center', bbox_to_anchor=(0.55, 0.25), ncol=2)
+    else:
+        fig.legend(handles=[foul_handle, media_timeout_handle],
+                   loc='lower center', bbox_to_anchor=(0.55, 0.3), ncol=2)
+
+    for ax, period in zip(axes, periods):
+        if period > 2:
+            # Overtime period: different aspect ratio
+            ax.set_aspect('23')  # smaller ratio for OT
+        else:
+            # Regular period: original aspect ratio
+            ax.set_aspect('90')
+
+    plt.tight_layout()
+
+
+@dataclass
+class RotationData:
+    """Everything a rotation chart shows, independent of how it is drawn."""
+    game_id: str
+    periods: list
+    players: list  # bottom to top, as placed on the y-axis
+    player_positions: dict
+    team_colors: dict
+    stints: pd.DataFrame  # checkname, team, period, start_s, end_s
+    fouls: pd.DataFrame  # play rows with action FOUL
+    media_timeouts: pd.DataFrame  # play rows with a MEDIA timeout
 
-    # Fetch AGAIN (preserve your logic)
-    response = requests.get(url)
-    root = ET.fromstring(response.content)
 
+@timed("rotation.data")
+def build_rotation_data(game_id, feed: GameFeed = None) -> RotationData:
     # -----------------------------------------------------------
-    # OT SUB IN logic (preserved exactly)
+    # Fetch the game XML once and extract plays, starters and
+    # per-period minutes in a single streaming pass.
     # -----------------------------------------------------------
-    for player in root.findall('.//player'):
-        checkname = player.get('checkname')
-        vh = player.get('vh')
-        uni = player.get('uni')
-        player_team = name_to_team.get(checkname, None)
-
-        for stats in player.findall('statsbyprd'):
-            prd_str = stats.get('prd')
-            mins = stats.get('min')
-            if prd_str is None or mins is None:
-                continue
-
-            prd = int(prd_str)
-            has_sub_out_in_period = False
-
-            if prd > 2:
-                period_out = subData[
-                    (subData['period'] == str(prd)) &
-                    (subData['checkname'] == checkname) &
-                    (subData['action'] == 'SUB') &
-                    (subData['type'] == 'OUT')
-                ]
-                if not period_out.empty:
-                    has_sub_out_in_period = True
-
-            if prd > 2 and (mins == "5" or has_sub_out_in_period):
-                existing = subData[
-                    (subData['period'] == str(prd)) &
-                    (subData['checkname'] == checkname) &
-                    (subData['time'] == '5:00') &
-                    (subData['action'] == 'SUB') &
-                    (subData['type'] == 'IN')
-                ]
-                if existing.empty:
-                    new_row = {
-                        'time': '5:00',
-                        'period': str(prd),
-                        'team': player_team,
-                        'vh': vh,
-                        'uni': uni,
-                        'checkname': checkname,
-                        'action': 'SUB',
-                        'type': 'IN'
-                    }
-                    subData = pd.concat([subData, pd.DataFrame([new_row])], ignore_index=True)
-
-    subData = subData.sort_values(by=['period', 'time'], ascending=[True, False]).reset_index(drop=True)
+    if feed is None:
+        feed = load_game_feed(game_id)
+
+    game = feed.game
+    allGameData = pd.DataFrame(game.plays)
 
     # -----------------------------------------------------------
-    # Helper functions (your originals preserved)
+    # Reconstruct substitutions and pair them into stints
     # -----------------------------------------------------------
-    def time_to_seconds(time_str):
-        minutes, seconds = map(int, time_str.split(":"))
-        return minutes * 60 + seconds
-
-    def seconds_to_time(seconds):
-        minutes = seconds // 60
-        seconds = seconds % 60
-        return f"{minutes}:{seconds:02}"
-    
-    def plot_media_timeouts(ax, media_timeouts, period_end_time, base_offset=-25, offset_step=.1):
-        for i, timeout in media_timeouts.iterrows():
-            timeout_time = time_to_seconds(timeout['time'])
-            timeout_str = timeout['time']
-            timeout_time = period_end_time - timeout_time
-            ax.axvline(x=timeout_time, color='black', linestyle=':', linewidth=2)
-            label_y = base_offset + i * offset_step
-            ax.text(timeout_time, label_y, timeout_str,
-                    color='black', fontsize=8,
-                    verticalalignment='center', horizontalalignment='right')
-    
-    def plot_half(ax, period, period_end_time):
-        for player in ordered_players:
-            player_data = rotation_data[
-                (rotation_data["checkname"] == player) & (rotation_data["period"] == str(period))
-            ].sort_values(by="time", ascending=False)
-    
-            on_time = None
-            for _, row in player_data.iterrows():
-                if row["type"] == "IN":
-                    on_time = time_to_seconds(row["time"])
-                elif row["type"] == "OUT" and on_time is not None:
-                    off_time = time_to_seconds(row["time"])
-                    player_y = player_positions[player]
-                    ax.broken_barh(
-                        [(period_end_time - on_time, on_time - off_time)],
-                        (player_y - 0.2, 0.4),
-                        facecolors=team_colors[row["team"]]
-                    )
-                    on_time = None
-    
-            if on_time is not None:
-                player_y = player_positions[player]
-                ax.broken_barh(
-                    [(period_end_time - on_time, on_time)],
-                    (player_y - 0.2, 0.4),
-                    facecolors=team_colors[row["team"]]
-                )
-    
-            # Plot fouls
-            player_foul_data = allGameData[
-                (allGameData["checkname"] == player) &
-                (allGameData["action"] == "FOUL") &
-                (allGameData["period"] == str(period))
-            ]
-            for _, foul_row in player_foul_data.iterrows():
-                foul_time = time_to_seconds(foul_row["time"])
-                foul_y = player_positions[player]
-                foul_time = period_end_time - foul_time
-                ax.scatter(foul_time, foul_y, color="black", label="Foul", s=30, marker="x", zorder=5)
-    
-    def adjust_y_axis(ax, player_labels, player_y_positions):
-        ax.set_yticks(player_y_positions)
-        ax.set_yticklabels(player_labels, fontsize=10)
-        N = len(player_labels)
-        ax.set_ylim(-0.5, N - 0.5)
-        ax.set_ylabel("Players")
-    
-    # Assume subData and allGameData are available DataFrames
+    subData = build_sub_data(allGameData, game)
+    # Feed team strings go through the team registry so spelling variants of
+    # one team share a color and a player group.
+    subData["team"] = get_team_registry().copy().canonicalize(subData["team"], register=True)
+    stints = build_stints(subData)
+
     rotation_data = subData[
         (subData["action"] == "SUB") &
         (subData["type"].isin(["IN", "OUT"]))
     ].sort_values(by=["team", "checkname", "period", "time"])
-    
+
     teams = rotation_data["team"].unique()
-    
+
     # Identify starters
     team_players = {}
     for team in teams:
@@ -316,109 +186,113 @@ def generate_rotation_chart(game_id):
         starters = team_data_period1[
             (team_data_period1["time"] == "20:00") & (team_data_period1["type"] == "IN")
         ]["checkname"].unique().tolist()
-    
+
         all_team_players = rotation_data[rotation_data["team"] == team]["checkname"].unique().tolist()
         bench = [p for p in all_team_players if p not in starters]
         team_players[team] = starters + bench
-    
+
     ordered_players = (team_players[teams[0]] + team_players[teams[1]])[::-1]
-    
+
     player_positions = {player: idx * 0.5 for idx, player in enumerate(ordered_players)}
-    
-    team_colors = {
-        teams[0]: "yellow",
-        teams[1]: "green",
-    }
-    
+
+    fouls = allGameData[
+        (allGameData["action"] == "FOUL") &
+        allGameData["checkname"].isin(player_positions)
+    ]
+
     media_timeouts = allGameData[
         (allGameData["checkname"] == "TEAM") &
         (allGameData["action"] == "TIMEOUT") &
         (allGameData["type"] == "MEDIA")
     ]
-    
+
     # Determine the distinct periods in the game
     periods = sorted(rotation_data["period"].unique(), key=lambda x: int(x))
     periods = [int(p) for p in periods]
-    
-    num_periods = len(periods)
-    if num_periods == 2:
-        fig, axes = plt.subplots(1, num_periods, figsize=(12, 10), sharey=True)
-    else:
-        fig, axes = plt.subplots(1, num_periods, figsize=(20, 12), sharey=True)
-    
-    if num_periods == 1:
-        axes = [axes]
-    
-    for i, period in enumerate(periods):
-        # If period > 2, it's overtime (5 minutes = 300 seconds)
-        # Otherwise, standard period = 20 minutes = 1200 seconds
-        if period > 2:
-            current_period_end_time = 300
-        else:
-            current_period_end_time = 1200
-    
-        plot_half(axes[i], period, period_end_time=current_period_end_time)
-        axes[i].set_title(f"Period {period}")
-        axes[i].set_xlim(0, current_period_end_time)
-        # Set x-ticks dynamically based on period length
-        tick_interval = current_period_end_time // 4
-        axes[i].set_xticks(range(0, current_period_end_time + 1, tick_interval))
-        axes[i].set_xticklabels([seconds_to_time(t) for t in range(current_period_end_time, -1, -tick_interval)])
-        axes[i].set_xlabel("Game Time (MM:SS)")
-        axes[i].grid(axis="x", linestyle="--", alpha=0.7)
-    
-    player_labels = ordered_players
-    player_y_positions = [player_positions[p] for p in player_labels]
-    
-    for ax in axes:
-        adjust_y_axis(ax, player_labels, player_y_positions)
-    
-    # Plot media timeouts for each period
-    for i, period in enumerate(periods):
-        period_str = str(period)
-        period_media_timeouts = media_timeouts[media_timeouts['period'] == period_str]
-    
-        if period == 1:
-            plot_media_timeouts(axes[i], period_media_timeouts,
-                                1200 if period <= 2 else 300,
-                                base_offset=0, offset_step=0.02)
-        else:
-            # Use the same logic for period_end_time here as well
-            current_period_end_time = 300 if period > 2 else 1200
-            plot_media_timeouts(axes[i], period_media_timeouts,
-                                current_period_end_time,
-                                base_offset=0, offset_step=0.01)
-    
-    N = len(player_labels)
-    top_bar_edge = (N-1)*0.5 + 0.2
-    for ax in axes:
-        ax.set_ylim(-0.5, top_bar_edge)
-    
-    # Create dummy handles for legend
-    media_timeout_handle = mlines.Line2D([], [], color='black', linestyle=':', label='Media Timeout')
-    foul_handle = mlines.Line2D([], [], color='black', marker='x', linestyle='None', label='Foul')
-    
-    # Adjust legend positioning based on number of periods
-    if num_periods == 2:
-        fig.legend(handles=[foul_handle, media_timeout_handle],
-                   loc='lower center', bbox_to_anchor=(0.58, 0.22), ncol=2)
-    elif num_periods == 3:
-        fig.legend(handles=[foul_handle, media_timeout_handle],
-                   loc='lower center', bbox_to_anchor=(0.55, 0.25), ncol=2)
-    else:
-        fig.legend(handles=[foul_handle, media_timeout_handle],
-                   loc='lower center', bbox_to_anchor=(0.55, 0.3), ncol=2)
-    
-    for i, period in enumerate(periods):
-        if period > 2:
-            # Overtime period: different aspect ratio
-            axes[i].set_aspect('23')  # smaller ratio for OT
-        else:
-            # Regular period: original aspect ratio
-            axes[i].set_aspect('90')
-    
-    plt.tight_layout()
-    return fig
 
+    return RotationData(
+        game_id=str(game_id),
+        periods=periods,
+        players=ordered_players,
+        player_positions=player_positions,
+        team_colors=dict(zip(teams, TEAM_COLORS)),
+        stints=stints[stints["checkname"].isin(player_positions)],
+        fouls=fouls,
+        media_timeouts=media_timeouts,
+    )
+
+
+@timed("rotation.plot")
+def draw_rotation_chart(data: RotationData):
+    player_positions = data.player_positions
+    periods = data.periods
+
+    # Flatten stints and fouls into arrays once; each period then draws one
+    # bar collection per team and one foul scatter instead of an artist per row.
+    stints = data.stints
+    stint_period = stints["period"].to_numpy(dtype=int)
+    stint_team = stints["team"].to_numpy()
+    stint_start = stints["start_s"].to_numpy(dtype=float)
+    stint_end = stints["end_s"].to_numpy(dtype=float)
+    stint_y = np.array([player_positions[name] for name in stints["checkname"]], dtype=float)
 
+    fouls = data.fouls
+    foul_period = fouls["period"].to_numpy(dtype=int)
+    foul_elapsed = np.array([period_seconds(p) for p in foul_period], dtype=int) - clock_seconds(fouls["time"])
+    foul_y = np.array([player_positions[name] for name in fouls["checkname"]], dtype=float)
 
+    media_timeouts = data.media_timeouts
+    fig, axes = create_period_axes(periods)
+
+    for ax, period in zip(axes, periods):
+        in_period = stint_period == period
+        for team, color in data.team_colors.items():
+            team_stints = in_period & (stint_team == team)
+            if team_stints.any():
+                plot_stint_bars(ax, stint_start[team_stints], stint_end[team_stints], stint_y[team_stints], color)
+
+        period_fouls = foul_period == period
+        plot_fouls(ax, foul_elapsed[period_fouls], foul_y[period_fouls])
+        format_period_axis(ax, period)
+
+        plot_media_timeouts(ax, media_timeouts[media_timeouts['period'] == str(period)], period_seconds(period),
+                            base_offset=0, offset_step=0.02 if period == 1 else 0.01)
+
+    finish_rotation_axes(fig, axes, periods, data.players, player_positions)
+    return fig
+
+
+def generate_rotation_chart(game_id, feed: GameFeed = None):
+    return draw_rotation_chart(build_rotation_data(game_id, feed))
+
+
+def rotation_payload(data: RotationData) -> dict:
+    """JSON-serializable chart data for drawing the rotation chart client-side.
+
+    Times are elapsed seconds from the start of each period; players are
+    listed top to bottom with their team and color.
+    """
+    teams = data.stints.drop_duplicates("checkname").set_index("checkname")["team"]
+    return {
+        "game_id": data.game_id,
+        "periods": [{"period": period, "length_s": period_seconds(period)} for period in data.periods],
+        "players": [
+            {"checkname": player, "team": teams.get(player), "color": data.team_colors.get(teams.get(player))}
+            for player in reversed(data.players)
+        ],
+        "stints": [
+            {"checkname": stint.checkname, "team": stint.team, "period": int(stint.period),
+             "start_s": int(stint.start_s), "end_s": int(stint.end_s)}
+            for stint in data.stints.itertuples(index=False)
+        ],
+        "fouls": [
+            {"checkname": foul.checkname, "period": int(foul.period),
+             "elapsed_s": period_seconds(int(foul.period)) - time_to_seconds(foul.time)}
+            for foul in data.fouls.itertuples(index=False)
+        ],
+        "media_timeouts": [
+            {"period": int(timeout.period), "clock": timeout.time,
+             "elapsed_s": period_seconds(int(timeout.period)) - time_to_seconds(timeout.time)}
+            for timeout in data.media_timeouts.itertuples(index=False)
+        ],
+    }
@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from async_fetch import DEFAULT_CONCURRENCY, AsyncFeedFetcher
+from game_feed import GameFeed
+from lineups import LineupIndex, on_off_table, score_at
+from stints import build_sub_data
+from team_registry import get_team_registry
+
+
+ROTATION_DIR = os.environ.get("CBB_ROTATION_DIR", os.path.join(".cache", "rotations"))
+
+# Games processed per ingest batch; each batch is written as one file per table.
+INGEST_BATCH_SIZE = 500
+
+# Rows are sorted by team within a file, so team queries skip most row groups.
+ROW_GROUP_SIZE = 32768
+
+SCORE_FIELDS = [("hscore_in", pa.int16()), ("vscore_in", pa.int16()),
+                ("hscore_out", pa.int16()), ("vscore_out", pa.int16())]
+
+STINT_SCHEMA = pa.schema(
+    [("game_id", pa.string()), ("team", pa.string()), ("vh", pa.string()), ("checkname", pa.string()),
+     ("period", pa.int8()), ("start_s", pa.int16()), ("end_s", pa.int16())]
+    + SCORE_FIELDS
+)
+
+# One row per stretch in which a team's players on the floor did not change.
+# ``lineup`` is the sorted checknames joined with lineups.LINEUP_SEPARATOR.
+UNIT_SCHEMA = pa.schema(
+    [("game_id", pa.string()), ("team", pa.string()), ("vh", pa.string()), ("lineup", pa.string()),
+     ("size", pa.int8()), ("period", pa.int8()), ("start_s", pa.int16()), ("end_s", pa.int16())]
+    + SCORE_FIELDS
+)
+
+TABLES = {"stints": STINT_SCHEMA, "units": UNIT_SCHEMA}
+
+
+# ---------- Per-game tables ----------
+
+def compact_units(units: pd.DataFrame) -> pd.DataFrame:
+    """Drop stretches nobody played (between periods) and instant ones with no
+    points scored, then merge neighbours left with the same players."""
+    entry = units[["hscore_in", "vscore_in"]].to_numpy()
+    exit_ = units[["hscore_out", "vscore_out"]].to_numpy()
+    played = (units["size"] > 0) & ((units["end_s"] > units["start_s"]) | (entry != exit_).any(axis=1))
+    units = units[played]
+
+    new_unit = (
+        (units["team"] != units["team"].shift())
+        | (units["period"] != units["period"].shift())
+        | (units["lineup"] != units["lineup"].shift())
+    ).cumsum()
+    return units.groupby(new_unit, sort=False).agg(
+        team=("team", "first"), vh=("vh", "first"), lineup=("lineup", "first"), size=("size", "first"),
+        period=("period", "first"), start_s=("start_s", "first"), end_s=("end_s", "last"),
+        hscore_in=("hscore_in", "first"), vscore_in=("vscore_in", "first"),
+        hscore_out=("hscore_out", "last"), vscore_out=("vscore_out", "last"),
+    ).reset_index(drop=True)
+
+
+def game_rotation_tables(game_id, feed: GameFeed) -> dict:
+    """Stint and lineup-unit tables for one game, in the store's schemas."""
+    all_game_data = pd.DataFrame(feed.game.plays)
+    sub_data = build_sub_data(all_game_data, feed.game)
+    sub_data["team"] = get_team_registry().copy().canonicalize(sub_data["team"], register=True)
+    index = LineupIndex.from_game(all_game_data, sub_data)
+
+    stints = index.stints
+    stints[["hscore_in", "vscore_in"]] = score_at(index.score, index.start_pos)
+    stints[["hscore_out", "vscore_out"]] = score_at(index.score, index.end_pos)
+    units = compact_units(index.units())
+    return {
+        "stints": stints.assign(game_id=str(game_id))[STINT_SCHEMA.names],
+        "units": units.assign(game_id=str(game_id))[UNIT_SCHEMA.names],
+    }
+
+
+def _ingest_game(game_id: str, content: bytes) -> dict:
+    return game_rotation_tables(game_id, GameFeed(game_id, content))
+
+
+def _plus_minus(frame: pd.DataFrame) -> pd.Series:
+    home_margin = (frame["hscore_out"] - frame["hscore_in"]) - (frame["vscore_out"] - frame["vscore_in"])
+    return home_margin.where(frame["vh"] == "H", -home_margin)
+
+
+def _points(frame: pd.DataFrame):
+    home = frame["hscore_out"] - frame["hscore_in"]
+    visitor = frame["vscore_out"] - frame["vscore_in"]
+    is_home = frame["vh"] == "H"
+    return home.where(is_home, visitor), visitor.where(is_home, home)
+
+
+# ---------- Store ----------
+
+class RotationStore:
+    """Parquet stint and lineup-unit tables for many games, built by ``ingest``.
+
+    Each ingest batch is written as one file per table and games already
+    stored are skipped, so the archive can be ingested incrementally. Queries
+    read only the columns they aggregate.
+    """
+
+    def __init__(self, root: str = ROTATION_DIR):
+        self.root = root
+        for table in TABLES:
+            os.makedirs(os.path.join(root, table), exist_ok=True)
+
+    def _dataset(self, table: str):
+        return ds.dataset(os.path.join(self.root, table), format="parquet", schema=TABLES[table])
+
+    def load(self, table: str = "stints", columns=None, game_ids=None, teams=None) -> pd.DataFrame:
+        condition = None
+        if game_ids is not None:
+            condition = ds.field("game_id").isin([str(game_id) for game_id in game_ids])
+        if teams is not None:
+            team_filter = ds.field("team").isin(list(teams))
+            condition = team_filter if condition is None else condition & team_filter
+        return self._dataset(table).to_table(columns=columns, filter=condition).to_pandas()
+
+    def game_ids(self) -> set:
+        return set(self.load("stints", columns=["game_id"])["game_id"].unique())
+
+    def append(self, tables: list) -> int:
+        """Write per-game table dicts (``game_rotation_tables``) as one batch. Returns games written."""
+        if not tables:
+            return 0
+        basename = f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}-{{i}}.parquet"
+        for name, schema in TABLES.items():
+            frame = pd.concat([game[name] for game in tables], ignore_index=True)
+            frame = frame.sort_values(["team", "game_id"], kind="stable")
+            # One chunk per game would otherwise become one row group per game.
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False).combine_chunks()
+            ds.write_dataset(
+                table, os.path.join(self.root, name), format="parquet", basename_template=basename,
+                max_rows_per_group=ROW_GROUP_SIZE, min_rows_per_group=ROW_GROUP_SIZE,
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        return len(tables)
+
+    def ingest(self, game_ids, workers: int = None, batch_size: int = INGEST_BATCH_SIZE,
+               fetch_concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+        """Fetch and store games that are not stored yet.
+
+        Feeds come through :class:`async_fetch.AsyncFeedFetcher` (and the feed
+        cache); stint reconstruction runs on a process pool. Returns the
+        number stored and the error for each game that failed.
+        """
+        stored = self.game_ids()
+        pending = list(dict.fromkeys(str(game_id) for game_id in game_ids if str(game_id) not in stored))
+        result = {"stored": 0, "skipped": len(stored.intersection(map(str, game_ids))), "errors": {}}
+
+        fetcher = AsyncFeedFetcher(concurrency=fetch_concurrency)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for offset in range(0, len(pending), batch_size):
+                    batch = pending[offset:offset + batch_size]
+                    fetched = asyncio.run(fetcher.fetch_many(batch))
+                    futures = {}
+                    for game_id, feed in zip(batch, fetched):
+                        if isinstance(feed, Exception):
+                            result["errors"][game_id] = f"fetch: {feed}"
+                        else:
+                            futures[game_id] = pool.submit(_ingest_game, game_id, feed.content)
+                    tables = []
+                    for game_id, future in futures.items():
+                        try:
+                            tables.append(future.result())
+                        except Exception as e:
+                            result["errors"][game_id] = f"parse: {e}"
+                    result["stored"] += self.append(tables)
+        finally:
+            fetcher.close()
+        return result
+
+    # ---------- Queries ----------
+
+    def player_minutes(self, game_ids=None, teams=None) -> pd.DataFrame:
+        """Minutes and plus/minus per player per game."""
+        stints = self.load("stints", game_ids=game_ids, teams=teams)
+        stints["minutes"] = (stints["end_s"] - stints["start_s"]) / 60
+        stints["plus_minus"] = _plus_minus(stints)
+        return (
+            stints.groupby(["game_id", "team", "checkname"], as_index=False, observed=True)
+            [["minutes", "plus_minus"]].sum()
+        )
+
+    def lineups(self, teams=None, game_ids=None, size: int = 5, min_minutes: float = 0) -> pd.DataFrame:
+        """Minutes, points and plus/minus for every lineup of ``size`` players, most used first.
+
+        ``size=None`` keeps every unit, including stretches where the feed's
+        substitutions leave a team with more or fewer than five players.
+        """
+        units = self.load("units", game_ids=game_ids, teams=teams)
+        if size is not None:
+            units = units[units["size"] == size]
+        units = units.assign(minutes=(units["end_s"] - units["start_s"]) / 60, plus_minus=_plus_minus(units))
+        units["points_for"], units["points_against"] = _points(units)
+        summary = units.groupby(["team", "lineup"], as_index=False, observed=True).agg(
+            games=("game_id", "nunique"), minutes=("minutes", "sum"),
+            points_for=("points_for", "sum"), points_against=("points_against", "sum"),
+            plus_minus=("plus_minus", "sum"),
+        )
+        summary = summary[summary["minutes"] >= min_minutes]
+        return summary.sort_values(["team", "minutes"], ascending=[True, False]).reset_index(drop=True)
+
+    def on_off(self, teams=None, game_ids=None) -> pd.DataFrame:
+        """Each player's on/off splits over the stored games (see ``lineups.on_off_table``).
+
+        On-floor totals come from the player's stints and team totals from
+        the team's units over the same games.
+        """
+        totals = {}
+        for table in ("stints", "units"):
+            frame = self.load(table, columns=["team", "vh", "checkname" if table == "stints" else "size",
+                                              "start_s", "end_s", "hscore_in", "vscore_in",
+                                              "hscore_out", "vscore_out"],
+                              game_ids=game_ids, teams=teams)
+            frame["minutes"] = (frame["end_s"] - frame["start_s"]) / 60
+            frame["points_for"], frame["points_against"] = _points(frame)
+            keys = ["team", "checkname"] if table == "stints" else ["team"]
+            totals[table] = frame.groupby(keys, observed=True)[["minutes", "points_for", "points_against"]].sum()
+
+        on = totals["stints"]
+        team = totals["units"].reindex(on.index.get_level_values("team"))
+        return on_off_table(
+            on.index.get_level_values("team"), on.index.get_level_values("checkname"),
+            on["minutes"].to_numpy(), on["points_for"].to_numpy(), on["points_against"].to_numpy(),
+            team["minutes"].to_numpy(), team["points_for"].to_numpy(), team["points_against"].to_numpy(),
+        ).sort_values(["team", "on_minutes"], ascending=[True, False]).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest StatBroadcast games into the rotation store.")
+    parser.add_argument("game_ids", nargs="*", help="StatBroadcast game ids")
+    parser.add_argument("--ids-file", help="file with one game id per line")
+    parser.add_argument("--workers", type=int, default=None, help="parse processes (default: CPU count)")
+    args = parser.parse_args()
+
+    game_ids = list(args.game_ids)
+    if args.ids_file:
+        with open(args.ids_file) as f:
+            game_ids.extend(line.strip() for line in f if line.strip())
+    if not game_ids:
+        parser.error("no game ids given")
+
+    result = RotationStore().ingest(game_ids, workers=args.workers)
+    print(f"{result['stored']} stored, {result['skipped']} already stored, {len(result['errors'])} failed")
+    for game_id, error in result["errors"].items():
+        print(f"  {game_id}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from power_rankings import (
+    LINE_COLUMNS,
+    PREDICTION_TRACKER_SEASON,
+    load_prediction_tracker_data,
+    prediction_tracker_url,
+    season_of,
+)
+
+
+SNAPSHOT_DIR = os.environ.get("CBB_SNAPSHOT_DIR", os.path.join(".cache", "prediction_tracker"))
+
+# Seconds a stored season counts as current after it was last downloaded.
+# Scheduled rankings refreshes are further apart, so each of them downloads.
+SNAPSHOT_MAX_AGE = 600
+
+GAME_KEY = ["date", "home", "road"]
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [("date", pa.timestamp("us")), ("home", pa.string()), ("road", pa.string()),
+     ("hscore", pa.float64()), ("rscore", pa.float64()), ("neutral", pa.float64())]
+    + [(col, pa.float64()) for col in LINE_COLUMNS]
+)
+
+PARTITION_SCHEMA = pa.schema([("season", pa.int16()), ("day", pa.date32())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+DATASET_SCHEMA = pa.unify_schemas([SNAPSHOT_SCHEMA, PARTITION_SCHEMA])
+
+
+def normalize_games(data: pd.DataFrame) -> pd.DataFrame:
+    """Completed games from ``load_prediction_tracker_data`` in the snapshot schema.
+
+    Games without a final score are left out: PredictionTracker lists upcoming
+    games with zero scores, and only completed games are immutable enough to
+    append once and never rewrite.
+    """
+    games = data.reindex(columns=SNAPSHOT_SCHEMA.names)
+    for col in SNAPSHOT_SCHEMA.names[3:]:
+        games[col] = pd.to_numeric(games[col], errors="coerce")
+    games["date"] = pd.to_datetime(games["date"], errors="coerce")
+    completed = (
+        games[GAME_KEY + ["hscore", "rscore"]].notna().all(axis=1)
+        & (games["hscore"] != 0) & (games["rscore"] != 0)
+    )
+    return games[completed].drop_duplicates(GAME_KEY, keep="last").reset_index(drop=True)
+
+
+class SnapshotStore:
+    """Local Parquet copy of PredictionTracker games, partitioned by season and day.
+
+    Refreshes append only the games that are not stored yet, so cold starts and
+    backfills over past seasons read local columnar files instead of downloading
+    and re-cleaning CSVs. Loads only read the requested columns and partitions.
+    A season downloaded within ``max_age`` seconds is current (``is_stale``).
+    """
+
+    def __init__(self, root: str = SNAPSHOT_DIR, max_age: float = SNAPSHOT_MAX_AGE):
+        self.root = root
+        self.max_age = max_age
+        os.makedirs(root, exist_ok=True)
+
+    def _dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=DATASET_SCHEMA)
+
+    def _filter(self, seasons=None, start=None, end=None):
+        conditions = []
+        if seasons is not None:
+            conditions.append(ds.field("season").isin([int(season) for season in seasons]))
+        if start is not None:
+            conditions.append(ds.field("day") >= pd.Timestamp(start).date())
+        if end is not None:
+            conditions.append(ds.field("day") <= pd.Timestamp(end).date())
+        condition = None
+        for part in conditions:
+            condition = part if condition is None else condition & part
+        return condition
+
+    def seasons(self) -> list:
+        found = []
+        for name in os.listdir(self.root):
+            if name.startswith("season="):
+                found.append(int(name.split("=", 1)[1]))
+        return sorted(found)
+
+    def load(self, columns=None, seasons=None, start=None, end=None) -> pd.DataFrame:
+        """Stored games, reading only ``columns`` (default: all game columns) and the matching partitions."""
+        columns = list(columns) if columns is not None else SNAPSHOT_SCHEMA.names
+        table = self._dataset().to_table(columns=columns, filter=self._filter(seasons, start, end))
+        return table.to_pandas()
+
+    def append(self, data: pd.DataFrame) -> int:
+        """Store the completed games in ``data`` that are not already stored. Returns the count added."""
+        games = normalize_games(data)
+        if games.empty:
+            return 0
+        games["season"] = season_of(games["date"])
+
+        stored = self.load(columns=GAME_KEY, seasons=games["season"].unique())
+        if not stored.empty:
+            known = pd.MultiIndex.from_frame(stored[GAME_KEY])
+            games = games[~pd.MultiIndex.from_frame(games[GAME_KEY]).isin(known)]
+        if games.empty:
+            return 0
+
+        games["day"] = games["date"].dt.date
+        table = pa.Table.from_pandas(games, schema=DATASET_SCHEMA, preserve_index=False)
+        # A unique basename per append keeps earlier files in the same day partition.
+        ds.write_dataset(
+            table, self.root, format="parquet", partitioning=PARTITIONING,
+            basename_template=f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        return len(games)
+
+    def refresh(self, season: int = PREDICTION_TRACKER_SEASON) -> int:
+        """Download ``season`` from PredictionTracker and append its new games."""
+        added = self.append(load_prediction_tracker_data(prediction_tracker_url(season)))
+        # The marker's name starts with "_", so datasets skip it.
+        with open(self._refresh_marker(season), "w"):
+            pass
+        return added
+
+    def _refresh_marker(self, season) -> str:
+        return os.path.join(self.root, f"_refreshed-{int(season)}")
+
+    def refreshed_at(self, season):
+        """Time ``season`` was last downloaded, or None if it never was."""
+        marker = self._refresh_marker(season)
+        return os.path.getmtime(marker) if os.path.exists(marker) else None
+
+    def is_stale(self, season) -> bool:
+        """True if ``season`` was last downloaded more than ``max_age`` seconds ago, or never."""
+        refreshed_at = self.refreshed_at(season)
+        return refreshed_at is None or time.time() - refreshed_at > self.max_age
+
+    def backfill(self, seasons, force: bool = False) -> dict:
+        """Download past seasons that are not stored yet (all of them with ``force``)."""
+        stored = set(self.seasons())
+        return {season: self.refresh(season) for season in seasons if force or season not in stored}
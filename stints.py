@@ -0,0 +1,353 @@
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from game_parser import ParsedGame
+from instrumentation import timed
+
+
+logger = logging.getLogger("cbb.stints")
+
+REGULATION_PERIOD_SECONDS = 1200
+OVERTIME_PERIOD_SECONDS = 300
+
+STINT_COLUMNS = ["checkname", "team", "period", "start_s", "end_s"]
+# Feed positions of the SUB IN/OUT plays bounding a stint, NaN at period edges.
+STINT_SEQ_COLUMNS = ["start_seq", "end_seq"]
+
+# Starter names whose box-score spelling differs from the play-by-play checkname.
+STARTER_NAME_CORRECTIONS = {
+    "LINGUARD,JR.,CARLTON": "LINGUARD, JR.,CARLTON",
+    "FLOYD,JR.,COREY": "FLOYD, JR.,COREY",
+    "MCNEIL,JR.,PAUL": "MCNEIL, JR.,PAUL",
+}
+
+
+def period_seconds(period) -> int:
+    return OVERTIME_PERIOD_SECONDS if int(period) > 2 else REGULATION_PERIOD_SECONDS
+
+
+def clock_to_seconds(clock: pd.Series) -> np.ndarray:
+    """Vectorized ``"MM:SS"`` -> seconds remaining in the period."""
+    parts = clock.astype(str).str.split(":", n=1, expand=True)
+    return parts[0].astype(int).to_numpy() * 60 + parts[1].astype(int).to_numpy()
+
+
+def clean_starter_name(name: str) -> str:
+    name = name.strip().upper()
+    name = name.replace('"', '')
+    name = re.sub(r'\s+', ' ', name)
+    name = re.sub(r',\s+', ',', name)
+    name = name.strip()
+    return STARTER_NAME_CORRECTIONS.get(name, name)
+
+
+def clean_checkname(name: str) -> str:
+    return re.sub(r'\s+', ' ', name.strip().upper())
+
+
+@timed("rotation.subs")
+def build_sub_data(all_game_data: pd.DataFrame, game: ParsedGame) -> pd.DataFrame:
+    """Substitution events plus the implied SUB IN rows the feed leaves out.
+
+    The feed only records substitutions, so players on the floor at the start
+    of a period are added explicitly: starters at 20:00 of period 1, players
+    still on the floor at the end of period 1 at 20:00 of period 2, and
+    overtime participants at 5:00. ``seq`` is the play's position in the feed
+    and is missing for these synthesized rows.
+    """
+    starter_players = [clean_starter_name(name) for name in game.starter_names]
+
+    logger.debug("cleaned starters", extra={"fields": {"starters": starter_players}})
+
+    subData = (
+        all_game_data[all_game_data["action"] == "SUB"]
+        .rename_axis("seq")
+        .reset_index()
+    )
+    subData["checkname"] = subData["checkname"].apply(clean_checkname)
+
+    # -----------------------------------------------------------
+    # Create SUB IN rows at 20:00 for starters
+    # -----------------------------------------------------------
+    first_sub = subData.drop_duplicates(subset=["checkname"]).set_index("checkname")
+    starters_with_subs = [p for p in dict.fromkeys(starter_players) if p in first_sub.index]
+    if starters_with_subs:
+        new_rows = first_sub.loc[starters_with_subs, ["team", "vh", "uni"]].reset_index()
+        new_rows = new_rows.assign(time="20:00", period="1", action="SUB", type="IN", hscore=None, vscore=None)
+        subData = pd.concat([subData, new_rows], ignore_index=True)
+        subData = subData.drop_duplicates(subset=[c for c in subData.columns if c != "seq"])
+
+    subData = subData.sort_values(by=["period", "time"])
+
+    # -----------------------------------------------------------
+    # Carry players on the floor at the end of period 1 into period 2
+    # -----------------------------------------------------------
+    subData['time_in_seconds'] = clock_to_seconds(subData['time'])
+    period_1_data = subData[subData['period'] == '1']
+
+    last_event = period_1_data.loc[
+        period_1_data.groupby('checkname')['time_in_seconds'].transform('min')
+        == period_1_data['time_in_seconds']
+    ]
+
+    simultaneous_events = period_1_data.groupby(['checkname', 'time_in_seconds']).filter(
+        lambda x: len(x) > 1 and {'IN', 'OUT'}.issubset(set(x['type']))
+    )
+
+    players_on_court_end_period_1 = pd.concat([
+        last_event[last_event['type'] == 'IN'],
+        simultaneous_events[simultaneous_events['type'] == 'IN']
+    ]).drop_duplicates(subset=['checkname'])
+
+    period_2_sub_out = subData[
+        (subData['period'] == '2') &
+        (subData['time'] == '20:00') &
+        (subData['type'] == 'OUT')
+    ]
+
+    new_rows = players_on_court_end_period_1[
+        ~players_on_court_end_period_1['checkname'].isin(period_2_sub_out['checkname'])
+    ][['team', 'vh', 'uni', 'checkname']]
+    new_rows = new_rows.assign(time='20:00', time_in_seconds=1200, period='2', action='SUB', type='IN')
+
+    subData = pd.concat([subData, new_rows], ignore_index=True)
+
+    # -----------------------------------------------------------
+    # OT SUB IN rows: anyone who played the full 5 minutes of an
+    # overtime or was subbed out of it was on the floor at 5:00.
+    # -----------------------------------------------------------
+    checkname_team_map = all_game_data.dropna(subset=['checkname', 'team']).drop_duplicates(subset=['checkname'])
+    name_to_team = dict(zip(checkname_team_map['checkname'], checkname_team_map['team']))
+
+    player_periods = pd.DataFrame(game.player_periods)
+    ot_periods = player_periods[player_periods["prd"] > 2]
+    if not ot_periods.empty:
+        ot_periods = ot_periods.assign(period=ot_periods["prd"].astype(str))
+        keys = pd.MultiIndex.from_arrays([ot_periods["period"], ot_periods["checkname"]])
+
+        outs = subData[subData["type"] == "OUT"]
+        subbed_out = keys.isin(pd.MultiIndex.from_arrays([outs["period"], outs["checkname"]]))
+
+        existing_in = subData[(subData["type"] == "IN") & (subData["time"] == "5:00")]
+        already_in = keys.isin(pd.MultiIndex.from_arrays([existing_in["period"], existing_in["checkname"]]))
+
+        qualifies = ((ot_periods["min"] == "5").to_numpy() | subbed_out) & ~already_in
+        new_rows = ot_periods[qualifies].drop_duplicates(subset=["period", "checkname"])
+        new_rows = pd.DataFrame({
+            "time": "5:00",
+            "period": new_rows["period"],
+            "team": new_rows["checkname"].map(name_to_team),
+            "vh": new_rows["vh"],
+            "uni": new_rows["uni"],
+            "checkname": new_rows["checkname"],
+            "action": "SUB",
+            "type": "IN",
+        })
+        subData = pd.concat([subData, new_rows], ignore_index=True)
+
+    return subData.sort_values(by=['period', 'time'], ascending=[True, False]).reset_index(drop=True)
+
+
+@timed("rotation.stints")
+def build_stints(sub_data: pd.DataFrame) -> pd.DataFrame:
+    """Pair SUB IN/OUT events into one row per continuous stretch on the floor.
+
+    Events are sorted once by player, period and clock; a stint closes at every
+    OUT immediately preceded by an IN for the same player and period, and an IN
+    left open at the end of a period runs to the buzzer. Times are seconds
+    elapsed in the period, so ``end_s - start_s`` is the stint length.
+    ``start_seq``/``end_seq`` are the feed positions of the bounding plays
+    (NaN for synthesized period-start rows and for stints open at the buzzer).
+    """
+    events = sub_data[(sub_data["action"] == "SUB") & sub_data["type"].isin(["IN", "OUT"])]
+    if events.empty:
+        return pd.DataFrame(columns=STINT_COLUMNS + STINT_SEQ_COLUMNS)
+
+    period = events["period"].astype(int).to_numpy()
+    length = np.where(period > 2, OVERTIME_PERIOD_SECONDS, REGULATION_PERIOD_SECONDS)
+    seq = events["seq"].to_numpy(dtype=float) if "seq" in events else np.full(len(events), np.nan)
+
+    frame = pd.DataFrame({
+        "checkname": events["checkname"].to_numpy(),
+        "team": events["team"].to_numpy(),
+        "period": period,
+        "elapsed": length - clock_to_seconds(events["time"]),
+        "is_in": (events["type"] == "IN").to_numpy(),
+        # Synthesized period-start rows sort ahead of real events at the same clock.
+        "real": ~np.isnan(seq),
+        "seq": seq,
+    }).sort_values(["checkname", "period", "elapsed", "real", "seq"], kind="mergesort")
+
+    checkname = frame["checkname"].to_numpy()
+    period = frame["period"].to_numpy()
+    elapsed = frame["elapsed"].to_numpy()
+    is_in = frame["is_in"].to_numpy()
+    team = frame["team"].to_numpy()
+    seq = frame["seq"].to_numpy()
+
+    same_as_prev = np.zeros(len(frame), dtype=bool)
+    same_as_prev[1:] = (checkname[1:] == checkname[:-1]) & (period[1:] == period[:-1])
+    same_as_next = np.zeros(len(frame), dtype=bool)
+    same_as_next[:-1] = same_as_prev[1:]
+
+    prev_in = np.zeros(len(frame), dtype=bool)
+    prev_in[1:] = is_in[:-1]
+    closes = ~is_in & prev_in & same_as_prev
+    close_idx = np.flatnonzero(closes)
+    open_idx = np.flatnonzero(is_in & ~same_as_next)
+
+    start_idx = np.concatenate([close_idx - 1, open_idx])
+    open_length = np.where(period[open_idx] > 2, OVERTIME_PERIOD_SECONDS, REGULATION_PERIOD_SECONDS)
+    stint_team = team[start_idx]
+    stint_team = np.where(pd.isna(stint_team), np.concatenate([team[close_idx], team[open_idx]]), stint_team)
+
+    stints = pd.DataFrame({
+        "checkname": checkname[start_idx],
+        "team": stint_team,
+        "period": period[start_idx],
+        "start_s": elapsed[start_idx],
+        "end_s": np.concatenate([elapsed[close_idx], open_length]),
+        "start_seq": seq[start_idx],
+        "end_seq": np.concatenate([seq[close_idx], np.full(len(open_idx), np.nan)]),
+    })
+    return stints.sort_values(["checkname", "period", "start_s"], kind="mergesort").reset_index(drop=True)
+
+
+def game_stints(all_game_data: pd.DataFrame, game: ParsedGame) -> pd.DataFrame:
+    return build_stints(build_sub_data(all_game_data, game))
+
+
+def player_minutes(stints: pd.DataFrame) -> pd.DataFrame:
+    """Minutes on the floor per player and period, from a stint table."""
+    seconds = stints["end_s"] - stints["start_s"]
+    return (
+        stints.assign(minutes=seconds / 60)
+        .groupby(["team", "checkname", "period"], as_index=False)["minutes"].sum()
+    )
+
+
+class StintTracker:
+    """Incremental stint state for a game in progress.
+
+    Feed plays are consumed in order, each exactly once; the tracker remembers
+    who is on the floor so a poll only has to process plays newer than
+    ``next_seq``. Players on the floor at the end of a period are carried into
+    the next one. Teams are keyed by ``vh`` ("V"/"H") because early in a game
+    starters have no plays that would name their team.
+    """
+
+    def __init__(self):
+        self.next_seq = 0
+        self.period = None
+        self.elapsed = 0
+        self.on_floor = {}
+        self.stints = []
+        self.fouls = []
+        self.media_timeouts = []
+        self.players = {"V": [], "H": []}
+        self._starters = {}
+
+    def start(self, roster: dict):
+        """Seed period 1 with the starters and list every rostered player, starters first.
+
+        Listing the whole roster up front keeps a chart's player axis stable
+        as bench players check in.
+        """
+        entries = [
+            (clean_checkname(checkname), vh, starter)
+            for checkname, vh, starter in zip(roster["checkname"], roster["vh"], roster["gs"])
+            if checkname
+        ]
+        for name, vh, starter in entries:
+            if starter:
+                self._starters[name] = vh
+                self._add_player(name, vh)
+        for name, vh, starter in entries:
+            self._add_player(name, vh)
+
+    def _add_player(self, checkname, vh):
+        team_players = self.players.setdefault(vh, [])
+        if checkname not in team_players:
+            team_players.append(checkname)
+
+    def _close(self, checkname, end_s, new_stints):
+        vh, period, start_s = self.on_floor.pop(checkname)
+        if end_s > start_s:
+            stint = (checkname, vh, period, start_s, end_s)
+            self.stints.append(stint)
+            new_stints.append(stint)
+
+    def _start_period(self, period, new_stints):
+        carried = list(self.on_floor.items())
+        if self.period is None:
+            carried = [(name, (vh, None, 0)) for name, vh in self._starters.items()]
+        for checkname, _ in carried:
+            if checkname in self.on_floor:
+                self._close(checkname, period_seconds(self.period), new_stints)
+        self.period = period
+        self.elapsed = 0
+        for checkname, (vh, _, _) in carried:
+            self.on_floor[checkname] = (vh, period, 0)
+
+    def update(self, plays: dict, first_seq: int) -> dict:
+        """Apply feed plays starting at ``first_seq``; returns what changed.
+
+        Plays already processed (``seq < next_seq``) are ignored, so callers may
+        pass overlapping windows.
+        """
+        new_stints, new_fouls, new_timeouts, new_players = [], [], [], []
+        skip = max(0, self.next_seq - first_seq)
+        rows = zip(plays["time"], plays["period"], plays["vh"], plays["checkname"],
+                   plays["action"], plays["type"])
+
+        for offset, (clock, period, vh, checkname, action, kind) in enumerate(rows):
+            if offset < skip or period is None or not clock:
+                continue
+            period = int(period)
+            if period != self.period:
+                self._start_period(period, new_stints)
+            minutes, seconds = clock.split(":")
+            self.elapsed = period_seconds(period) - (int(minutes) * 60 + int(seconds))
+
+            if action == "SUB" and checkname:
+                name = clean_checkname(checkname)
+                if kind == "IN":
+                    if name not in self.players.get(vh, []):
+                        self._add_player(name, vh)
+                        new_players.append(name)
+                    # A repeated IN restarts the stint: build_stints pairs each
+                    # OUT with the last IN before it.
+                    self.on_floor[name] = (vh, period, self.elapsed)
+                elif kind == "OUT" and name in self.on_floor:
+                    self._close(name, self.elapsed, new_stints)
+            elif action == "FOUL" and checkname and checkname != "TEAM":
+                foul = (clean_checkname(checkname), period, self.elapsed)
+                self.fouls.append(foul)
+                new_fouls.append(foul)
+            elif action == "TIMEOUT" and kind == "MEDIA" and checkname == "TEAM":
+                timeout = (first_seq + offset, period, clock)
+                self.media_timeouts.append(timeout)
+                new_timeouts.append(timeout)
+
+        self.next_seq = max(self.next_seq, first_seq + len(plays["time"]))
+        return {
+            "stints": new_stints,
+            "fouls": new_fouls,
+            "media_timeouts": new_timeouts,
+            "players": new_players,
+        }
+
+    def open_stints(self, final: bool = False):
+        """Stints still running, cut off at the latest clock seen (or the buzzer once final)."""
+        return [
+            (checkname, vh, period, start_s,
+             self.elapsed if period == self.period and not final else period_seconds(period))
+            for checkname, (vh, period, start_s) in self.on_floor.items()
+        ]
+
+    def stint_table(self, include_open: bool = True, final: bool = False) -> pd.DataFrame:
+        rows = self.stints + (self.open_stints(final) if include_open else [])
+        return pd.DataFrame(rows, columns=STINT_COLUMNS)
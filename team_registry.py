@@ -0,0 +1,205 @@
+import difflib
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# Division I teams with their home-court advantage; its names seed the shared registry.
+HCA_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ncaa_hca.csv")
+
+# PredictionTracker / HCA spellings that differ from the canonical team name.
+TEAM_RENAME_DICT = {
+    'A&M-Commerce': 'East Texas A&M',
+    'Albany-NY': 'Albany',
+    'Arkansas-Little Rock': 'Little Rock',
+    'Boston': 'Boston University',
+    'Cal Poly SLO': 'Cal Poly',
+    'Cal Riverside': 'UC Riverside',
+    'California Baptist': 'Cal Baptist',
+    'Central Conn. St.': 'Central Connecticut',
+    'Central Florida': 'UCF',
+    'Citadel': 'The Citadel',
+    'CS Bakersfield': 'Cal St. Bakersfield',
+    'CS Sacramento': 'Sacramento St.',
+    'CS Northridge': 'CSUN',
+    'Detroit': 'Detroit Mercy',
+    'Florida International': 'FIU',
+    'Illinois-Chicago': 'Illinois Chicago',
+    'IPFW': 'Purdue Fort Wayne',
+    'Iu Indianapolis': 'IU Indy',
+    'IU Indianapolis': 'IU Indy',
+    'LIU Brooklyn': 'LIU',
+    'Louisiana-Lafayette': 'Lafayette',
+    'Louisiana-Monroe': 'Louisiana Monroe',
+    'Loyola-Chicago': 'Loyola Chicago',
+    'Loyola-Maryland': 'Loyola MD',
+    'McNeese St.': 'McNeese',
+    'MD Baltimore Co': 'UMBC',
+    'Md. Eastern Shore': 'Maryland Eastern Shore',
+    'Miami-Florida': 'Miami FL',
+    'Miami-Ohio': 'Miami OH',
+    'Middle Tenn St.': 'Middle Tennessee',
+    'Miss Valley St.': 'Mississippi Valley St.',
+    'Mo Kansas City': 'Kansas City',
+    'Mount St. Marys': "Mount St. Mary's",
+    'NC Asheville': 'UNC Asheville',
+    'NC Central': 'North Carolina Central',
+    'NC Charlotte': 'Charlotte',
+    'NC Greensboro': 'UNC Greensboro',
+    'NC Wilmington': 'UNC Wilmington',
+    'Nicholls St.': 'Nicholls',
+    'North Carolina St.': 'N.C. State',
+    'Pennsylvania': 'Penn',
+    'Prairie View': 'Prairie View A&M',
+    'SE Louisiana': 'Southeastern Louisiana',
+    'SE Missouri St.': 'Southeast Missouri',
+    'SIU Edwardsville': 'SIUE',
+    'South Carolina Upstat': 'USC Upstate',
+    'St. Francis (PA)': 'Saint Francis',
+    "St. Joseph's PA": "Saint Joseph's",
+    "St. Mary's": "Saint Mary's",
+    "St. Peter's": "Saint Peter's",
+    'St. Thomas (Mn)': "St. Thomas",
+    'SW Missouri St.': 'Missouri St.',
+    'Tennessee-Martin': 'Tennessee Martin',
+    'Texas A&M Corpus': 'Texas A&M Corpus Chris',
+    'Texas Arlington': 'UT Arlington',
+    'Texas San Antonio': 'UTSA',
+    'Troy St.': 'Troy',
+    'Umass Lowell': 'UMass Lowell',
+    'VA Commonwealth': 'VCU',
+    'Wisconsin-Green Bay': 'Green Bay',
+    'Wisconsin-Milwaukee': 'Milwaukee',
+    'Nevada': 'Nevada Wolf',
+    'Texas A&M-Corpus Christi': 'Texas A&M Corpus Chris',
+}
+
+
+def team_key(name) -> str:
+    """Lookup key for a team name: case, surrounding and repeated whitespace are ignored."""
+    return re.sub(r"\s+", " ", str(name)).strip().casefold()
+
+
+class TeamRegistry:
+    """Canonical team names with an alias index from normalized name to team id.
+
+    Series are resolved through their unique values (``pd.factorize``), so a
+    season of games costs one lookup per team rather than per row. Names that
+    do not resolve can be checked against the known teams with a fuzzy
+    matcher instead of silently joining to nothing.
+    """
+
+    def __init__(self, names=(), aliases=TEAM_RENAME_DICT):
+        self.names = []
+        self._ids = {}
+        self._lock = threading.Lock()
+        for alias, canonical in aliases.items():
+            self._ids[team_key(alias)] = self.add(canonical)
+        for name in names:
+            self.add(name)
+
+    def copy(self) -> "TeamRegistry":
+        """Independent copy, for registering names (e.g. one game's feed) without touching this one."""
+        clone = TeamRegistry(aliases={})
+        with self._lock:
+            clone.names = list(self.names)
+            clone._ids = dict(self._ids)
+        return clone
+
+    def add(self, name) -> int:
+        """Register ``name`` as a canonical team (a no-op for known names) and return its id."""
+        key = team_key(name)
+        with self._lock:
+            team_id = self._ids.get(key)
+            if team_id is None:
+                team_id = self._ids[key] = len(self.names)
+                self.names.append(re.sub(r"\s+", " ", str(name)).strip())
+            return team_id
+
+    def resolve(self, name) -> int:
+        """Team id for ``name``, or -1 if it is not a known name or alias."""
+        return self._ids.get(team_key(name), -1)
+
+    def alias_keys(self) -> dict:
+        """Team id -> every normalized key (canonical name and aliases) that resolves to it."""
+        keys = {}
+        with self._lock:
+            for key, team_id in self._ids.items():
+                keys.setdefault(team_id, []).append(key)
+        return keys
+
+    def canonical(self, name) -> str:
+        team_id = self.resolve(name)
+        return self.names[team_id] if team_id >= 0 else str(name).strip()
+
+    def ids(self, values, register: bool = False) -> np.ndarray:
+        """Team ids for a sequence of names, -1 where unknown (unless ``register`` adds them)."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str), use_na_sentinel=False)
+        lookup = self.add if register else self.resolve
+        unique_ids = np.fromiter((lookup(name) for name in uniques), dtype=np.int64, count=len(uniques))
+        return unique_ids[codes]
+
+    def canonicalize(self, values: pd.Series, register: bool = False) -> pd.Series:
+        """``values`` with every known name or alias replaced by its canonical name.
+
+        Unknown names are only stripped, or registered as new teams with
+        ``register`` so later spellings that differ in case or spacing fold
+        into the first one seen.
+        """
+        codes, uniques = pd.factorize(values.astype(str), use_na_sentinel=False)
+        if register:
+            for name in uniques:
+                self.add(name)
+        canonical = np.array([self.canonical(name) for name in uniques], dtype=object)
+        return pd.Series(canonical[codes], index=values.index, name=values.name, dtype="str")
+
+    def suggest(self, name, candidates=None, cutoff: float = 0.7):
+        """Closest known team to ``name`` as (team name, similarity), or (None, 0.0)."""
+        pool = self.names if candidates is None else list(candidates)
+        keys = {team_key(candidate): candidate for candidate in pool}
+        key = team_key(name)
+        match = difflib.get_close_matches(key, keys, n=1, cutoff=cutoff)
+        if not match:
+            return None, 0.0
+        return keys[match[0]], round(difflib.SequenceMatcher(None, key, match[0]).ratio(), 3)
+
+    def unresolved(self, values, known=None, cutoff: float = 0.7) -> pd.DataFrame:
+        """Distinct names in ``values`` that are not among ``known`` teams (default: all registered).
+
+        Each comes with its closest known team, if any is within ``cutoff``.
+        """
+        known_names = self.names if known is None else [self.canonical(name) for name in known]
+        known_ids = {self.resolve(name) for name in known_names}
+        rows = []
+        for name in pd.unique(pd.Series(values, dtype=object).astype(str)):
+            if self.resolve(name) in known_ids and self.resolve(name) >= 0:
+                continue
+            suggestion, score = self.suggest(name, known_names, cutoff)
+            rows.append({"name": name, "suggestion": suggestion, "score": score})
+        return pd.DataFrame(rows, columns=["name", "suggestion", "score"])
+
+
+_registry = None
+
+
+def hca_team_names(hca_csv_path: str = HCA_CSV_PATH) -> list:
+    if not os.path.exists(hca_csv_path):
+        return []
+    hca_data = pd.read_csv(hca_csv_path)
+    hca_data.columns = hca_data.columns.str.strip()
+    return hca_data["Team"].astype(str).tolist()
+
+
+def get_team_registry() -> TeamRegistry:
+    """The process-wide registry, seeded with the aliases and the HCA teams.
+
+    Seeding up front means a name resolves the same way whichever source is
+    read first; callers that need to register extra names do so on a ``copy``.
+    """
+    global _registry
+    if _registry is None:
+        _registry = TeamRegistry(names=hca_team_names())
+    return _registry
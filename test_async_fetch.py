@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from async_fetch import AsyncFeedFetcher, fetch_games
+from benchmarks.fixtures import ensure_fixtures, game_path
+from feed_cache import FeedCache
+
+
+class FeedServer:
+    """Serves ``/<game_id>.xml`` from ``feeds`` on localhost, failing with
+    ``failures[game_id]`` queued statuses first and answering ETag revalidation."""
+
+    def __init__(self):
+        self.feeds = {}
+        self.failures = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                game_id = self.path.strip("/").removesuffix(".xml")
+                server.requests.append((time.monotonic(), game_id, self.headers.get("If-None-Match")))
+                queued = server.failures.get(game_id)
+                if queued:
+                    self.send_error(queued.pop(0))
+                    return
+                content = server.feeds.get(game_id)
+                if content is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hash(content) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(content)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url_template = f"http://127.0.0.1:{self.httpd.server_port}/{{game_id}}.xml"
+
+    def count(self, game_id) -> int:
+        return sum(requested == game_id for _, requested, _ in self.requests)
+
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+@pytest.fixture(scope="module")
+def final_xml() -> bytes:
+    ensure_fixtures()
+    with open(game_path("regulation"), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def live_xml(final_xml) -> bytes:
+    return final_xml.replace(b'complete="Y"', b'complete="N"', 1)
+
+
+def make_fetcher(feed_server, tmp_path, **options):
+    options.setdefault("cache", FeedCache(str(tmp_path / "feeds.sqlite3"), live_ttl=0))
+    return AsyncFeedFetcher(url_template=feed_server.url_template, backoff=0.01, **options)
+
+
+def test_retries_then_serves_final_games_from_cache(feed_server, tmp_path, final_xml):
+    feed_server.feeds["1"] = final_xml
+    feed_server.failures["1"] = [503, 503]
+    fetcher = make_fetcher(feed_server, tmp_path)
+
+    first = asyncio.run(fetcher.fetch(1))
+    second = asyncio.run(fetcher.fetch(1))
+    fetcher.close()
+
+    assert (first.status, first.from_cache, first.content) == (200, False, final_xml)
+    assert feed_server.count("1") == 3
+    assert second.from_cache and second.content == final_xml
+    assert feed_server.count("1") == 3
+
+
+def test_gives_up_after_the_last_retry(feed_server, tmp_path, final_xml):
+    feed_server.feeds["1"] = final_xml
+    feed_server.failures["1"] = [503] * 3
+    fetcher = make_fetcher(feed_server, tmp_path, retries=2)
+
+    with pytest.raises(Exception, match="Status code: 503"):
+        asyncio.run(fetcher.fetch(1))
+    fetcher.close()
+    assert feed_server.count("1") == 3
+
+
+def test_requests_to_one_host_are_rate_limited(feed_server, final_xml):
+    game_ids = [str(game_id) for game_id in range(6)]
+    for game_id in game_ids:
+        feed_server.feeds[game_id] = final_xml
+
+    results = fetch_games(game_ids, host_rate=20.0, use_cache=False, url_template=feed_server.url_template)
+
+    assert [result.content for result in results] == [final_xml] * len(game_ids)
+    arrivals = sorted(arrived for arrived, _, _ in feed_server.requests)
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    assert min(gaps) >= 0.04
+
+
+def test_live_games_are_revalidated(feed_server, tmp_path, live_xml):
+    feed_server.feeds["2"] = live_xml
+    fetcher = make_fetcher(feed_server, tmp_path)
+
+    first = asyncio.run(fetcher.fetch(2))
+    second = asyncio.run(fetcher.fetch(2))
+    fetcher.close()
+
+    assert not first.from_cache
+    assert second.not_modified and second.status == 304 and second.content == live_xml
+    assert feed_server.requests[-1][2] is not None
+
+
+def test_expired_live_game_is_served_when_the_archive_fails(feed_server, tmp_path, live_xml):
+    feed_server.feeds["2"] = live_xml
+    fetcher = make_fetcher(feed_server, tmp_path, retries=1)
+    asyncio.run(fetcher.fetch(2))
+
+    feed_server.failures["2"] = [503] * 2
+    stale = asyncio.run(fetcher.fetch(2))
+    feed_server.httpd.shutdown()
+    feed_server.httpd.server_close()
+    unreachable = asyncio.run(fetcher.fetch(2))
+    with pytest.raises(Exception):
+        asyncio.run(fetcher.fetch(3))
+    fetcher.close()
+
+    assert stale.stale and stale.content == live_xml
+    assert unreachable.stale and unreachable.content == live_xml
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from backtest import backtest_season, predict_games
+from incremental_ratings import IncrementalRatings
+
+
+def test_warm_started_replay_matches_cold_solves(season_games):
+    games = season_games[season_games["date"] < season_games["date"].min() + pd.Timedelta(days=30)]
+
+    warm = backtest_season(games, warm_start=True)
+    cold = backtest_season(games, warm_start=False)
+
+    assert len(warm) == len(cold) > 0
+    np.testing.assert_allclose(warm["predicted_spread"], cold["predicted_spread"], atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(warm["predicted_spread_base"], cold["predicted_spread_base"], atol=1e-9,
+                               equal_nan=True)
+
+
+def test_warm_started_ratings_match_a_cold_refit(season_games):
+    warm = IncrementalRatings(warm_start=True)
+    for _, day_games in season_games.groupby("date", sort=True):
+        warm.add_games(day_games)
+    cold = IncrementalRatings()
+    cold.add_games(season_games)
+
+    np.testing.assert_allclose(warm.ratings, cold.ratings[cold.lookup(warm.teams)], rtol=0, atol=1e-10)
+
+
+def test_predictions_only_use_earlier_days(season_games):
+    games = season_games[season_games["date"] < season_games["date"].min() + pd.Timedelta(days=20)]
+    predictions = backtest_season(games)
+
+    first_day = games["date"].min()
+    assert (predictions["date"] > first_day).all()
+
+    day = games["date"].drop_duplicates().sort_values().iloc[10]
+    state = IncrementalRatings()
+    state.add_games(games[games["date"] < day])
+    expected = predict_games(state, games[games["date"] == day])
+    got = predictions[predictions["date"] == day]
+    np.testing.assert_allclose(got["predicted_spread"], expected["predicted_spread"], atol=1e-8, equal_nan=True)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from incremental_ratings import IncrementalRatings
+from power_rankings import build_rankings_revised, team_game_table
+
+
+def test_day_by_day_updates_match_a_cold_refit(season_games):
+    games = season_games[season_games["date"] < season_games["date"].min() + pd.Timedelta(days=40)]
+
+    incremental = IncrementalRatings()
+    for _, day in games.groupby("date"):
+        incremental.add_games(day)
+    cold = IncrementalRatings()
+    cold.add_games(games)
+
+    assert sorted(incremental.teams) == sorted(cold.teams)
+    order = [incremental.team_index[team] for team in cold.teams]
+    np.testing.assert_allclose(incremental.ratings[order], cold.ratings, atol=1e-10)
+
+    incremental.rebuild()
+    np.testing.assert_allclose(incremental.ratings[order], cold.ratings, atol=1e-12)
+    pd.testing.assert_frame_equal(incremental.rankings(), build_rankings_revised(team_game_table(games)))
+
+
+def test_games_already_seen_are_ignored(season_games):
+    games = season_games.iloc[:500]
+    state = IncrementalRatings()
+    assert state.add_games(games) == len(games)
+    before = state.ratings.copy()
+    assert state.add_games(games.iloc[::2]) == 0
+    assert state.num_games == len(games)
+    np.testing.assert_array_equal(state.ratings, before)
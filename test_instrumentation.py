@@ -0,0 +1,31 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import instrumentation
+from instrumentation import JsonFormatter, collect_spans, span
+
+
+def test_spans_are_logged_at_the_default_level(caplog):
+    caplog.set_level(instrumentation.LOG_LEVEL, logger="cbb.timing")
+
+    with collect_spans() as spans, span("outer", game_id="1"):
+        with span("inner"):
+            pass
+
+    records = [record for record in caplog.records if record.name == "cbb.timing"]
+    assert [record.levelno for record in records] == [logging.INFO, logging.INFO]
+    logged = [json.loads(JsonFormatter().format(record)) for record in records]
+    assert [(entry["stage"], entry["parent"]) for entry in logged] == [("inner", "outer"), ("outer", None)]
+    assert logged[1]["game_id"] == "1"
+    assert [entry["stage"] for entry in spans] == ["inner", "outer"]
+
+
+def test_metrics_server_binds_to_loopback_by_default():
+    env = {key: value for key, value in os.environ.items() if key != "CBB_METRICS_HOST"}
+    result = subprocess.run([sys.executable, "-c", "import instrumentation; print(instrumentation.METRICS_HOST)"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "127.0.0.1"
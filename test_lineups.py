@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from lineups import LineupIndex, running_score
+from stints import build_sub_data, period_seconds
+
+
+def lineup_index(feed) -> LineupIndex:
+    all_game_data = pd.DataFrame(feed.game.plays)
+    return LineupIndex.from_game(all_game_data, build_sub_data(all_game_data, feed.game))
+
+
+def test_plus_minus_matches_a_play_by_play_replay(fixture_feed):
+    index = lineup_index(fixture_feed)
+    score = running_score(pd.DataFrame(fixture_feed.game.plays))
+
+    replayed = {}
+    previous = np.zeros(2, dtype=np.int64)
+    for position, current in enumerate(score):
+        home, visitor = current - previous
+        previous = current
+        if not home and not visitor:
+            continue
+        for team, segments in index.teams.items():
+            net = home - visitor if segments.vh == "H" else visitor - home
+            for player in index.on_floor(team, position):
+                replayed[team, player] = replayed.get((team, player), 0) + net
+
+    on_off = index.on_off()
+    totals = dict(zip(zip(on_off["team"], on_off["checkname"]), on_off["on_plus_minus"]))
+    assert replayed
+    assert {key: totals[key] for key in replayed} == replayed
+    assert all(value == 0 for key, value in totals.items() if key not in replayed)
+
+
+def test_each_team_plays_five_at_a_time(fixture_feed):
+    index = lineup_index(fixture_feed)
+    periods = sorted(set(int(period) for period in fixture_feed.game.plays["period"]))
+    game_minutes = sum(period_seconds(period) for period in periods) / 60
+
+    on_minutes = index.on_off().groupby("team")["on_minutes"].sum()
+
+    assert len(on_minutes) == 2
+    np.testing.assert_allclose(on_minutes, 5 * game_minutes)
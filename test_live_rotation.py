@@ -0,0 +1,44 @@
+import xml.etree.ElementTree as ET
+
+import matplotlib.pyplot as plt
+
+from async_fetch import FetchResult
+from live_rotation import LiveRotation
+
+
+class FeedSequence:
+    """Stands in for AsyncFeedFetcher, returning the given feeds one poll at a time."""
+
+    def __init__(self, *feeds):
+        self.feeds = list(feeds)
+
+    async def fetch(self, game_id) -> FetchResult:
+        return FetchResult(str(game_id), self.feeds.pop(0), 200)
+
+
+def truncated(content: bytes, drop: int) -> bytes:
+    """The feed without its last ``drop`` plays, as when a game's feed is re-issued."""
+    root = ET.fromstring(content)
+    plays = [(period, play) for period in root.iter("period") for play in period]
+    for period, play in plays[-drop:]:
+        period.remove(play)
+    return ET.tostring(root)
+
+
+def polled_stints(*feeds):
+    live = LiveRotation("1", fetcher=FeedSequence(*feeds))
+    for _ in feeds:
+        live.poll()
+    plt.close(live.figure)
+    return live
+
+
+def test_a_feed_reissued_with_fewer_plays_restarts_the_tracker(fixture_feed):
+    shorter = truncated(fixture_feed.content, drop=30)
+
+    live = polled_stints(fixture_feed.content, shorter)
+    fresh = polled_stints(shorter)
+
+    assert live.tracker.next_seq == fixture_feed.game.num_plays - 30
+    assert live.stints().equals(fresh.stints())
+    assert live._layout == fresh._layout
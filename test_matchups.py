@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from matchups import MatchupIndex
+
+
+def test_slate_names_resolve_through_aliases(fresh_team_registry):
+    matchups = MatchupIndex(["Duke", "UCF", "North Carolina"], [-10.0, 2.0, -5.0], [3.0, 2.5, 3.5])
+    slate = pd.DataFrame({"home": ["  duke", "Central Florida", "Duke"],
+                          "road": ["UCF", "NORTH   CAROLINA", "Zzz College"]})
+
+    resolved, unresolved = matchups.resolve_slate(slate)
+
+    assert resolved["home"].tolist() == ["Duke", "UCF", "Duke"]
+    assert resolved["road"].tolist() == ["UCF", "North Carolina", "Zzz College"]
+    assert unresolved["name"].tolist() == ["Zzz College"]
+    np.testing.assert_allclose(matchups.slate(resolved.iloc[:2])["spread"], [-15.0, 4.5])
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import HCA_CSV_PATH, ensure_fixtures, prediction_tracker_path
+from parameter_sweep import DEFAULT_COEFFICIENTS, DEFAULT_DECAYS, run_sweep
+from power_rankings import load_hca_data, read_prediction_tracker_csv
+
+
+@pytest.fixture(scope="module")
+def season():
+    ensure_fixtures()
+    with open(prediction_tracker_path(), "rb") as f:
+        return read_prediction_tracker_csv(f.read()), load_hca_data(HCA_CSV_PATH)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("grid", [{"cutoffs": []}, {"decays": {}}])
+def test_an_empty_grid_is_rejected(season, workers, grid):
+    data, hca_data = season
+    with pytest.raises(ValueError):
+        run_sweep(data, hca_data, workers=workers, **grid)
+
+
+def test_process_pool_matches_in_process_sweep(season):
+    data, hca_data = season
+    cutoffs = [pd.Timestamp(data["date"].min()) + pd.Timedelta(days=60)]
+    decays = {name: DEFAULT_DECAYS[name] for name in ("harmonic_0.5", "uniform")}
+
+    local = run_sweep(data, hca_data, decays=decays, cutoffs=cutoffs, workers=1)
+    pooled = run_sweep(data, hca_data, decays=decays, cutoffs=cutoffs, workers=2)
+
+    assert len(local) == len(decays) * len(DEFAULT_COEFFICIENTS)
+    pd.testing.assert_frame_equal(local, pooled)
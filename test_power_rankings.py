@@ -0,0 +1,49 @@
+import numpy as np
+
+from power_rankings import (
+    build_design_matrix,
+    build_rankings_revised,
+    normal_equations,
+    revised_targets,
+    solve_ratings,
+    team_game_table,
+)
+
+
+def dense_min_norm(team_idx, opponent_idx, num_teams, weights, targets):
+    """Reference fit: weighted least squares on the dense design, minimum-norm solution."""
+    X = np.zeros((len(team_idx), num_teams))
+    X[np.arange(len(team_idx)), team_idx] = 1.0
+    X[np.arange(len(team_idx)), opponent_idx] = -1.0
+    root_w = np.sqrt(weights)[:, None]
+    return np.linalg.lstsq(X * root_w, targets * root_w, rcond=None)[0]
+
+
+def test_solve_ratings_is_the_min_norm_solution_per_component():
+    # Two groups of teams that never play each other.
+    team_idx = np.array([0, 1, 0, 2, 3, 4])
+    opponent_idx = np.array([1, 2, 2, 0, 4, 3])
+    weights = np.array([1.0, 0.5, 2.0, 1.0, 1.0, 0.25])
+    targets = np.column_stack([[3.0, -1.0, 4.0, 2.0, 7.0, -5.0], [1.0, 2.0, -2.0, 0.5, 3.0, 1.0]])
+
+    A, B = normal_equations(build_design_matrix(team_idx, opponent_idx, 5), weights, targets)
+    expected = dense_min_norm(team_idx, opponent_idx, 5, weights, targets)
+    np.testing.assert_allclose(solve_ratings(A, B), expected, atol=1e-10)
+
+
+def test_sparse_fit_matches_dense_least_squares(season_games):
+    cleaned = team_game_table(season_games.iloc[:1500])
+    rankings = build_rankings_revised(cleaned)
+
+    teams = sorted(set(cleaned["team"]) | set(cleaned["opponent"]))
+    index = {team: idx for idx, team in enumerate(teams)}
+    weights = cleaned["team_weight"].to_numpy(dtype=float)
+    weights = weights / weights.sum()
+    targets = revised_targets(cleaned["neutral_spread"], cleaned["actual_diff"])
+    expected = dense_min_norm(cleaned["team"].map(index).to_numpy(), cleaned["opponent"].map(index).to_numpy(),
+                              len(teams), weights, targets)[:, 1]
+
+    got = rankings.set_index("team")["power_rating"].reindex(teams).to_numpy()
+    # The published table is rounded to two decimals.
+    np.testing.assert_allclose(got, expected, atol=0.005 + 1e-9)
+    assert rankings["power_rating"].is_monotonic_increasing
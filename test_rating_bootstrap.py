@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from power_rankings import build_design_matrix, normal_equations, revised_targets, solve_ratings, team_game_table
+from rating_bootstrap import bootstrap_intervals, bootstrap_ratings
+
+
+def direct_replicates(cleaned_data, replicates, seed):
+    """Each replicate's ratings from its own normal equations and a direct solve,
+    with the resample drawn the way ``bootstrap_ratings`` draws it."""
+    teams = sorted(set(cleaned_data["team"]).union(cleaned_data["opponent"]))
+    team_index = {team: idx for idx, team in enumerate(teams)}
+    X = build_design_matrix(cleaned_data["team"].map(team_index), cleaned_data["opponent"].map(team_index), len(teams))
+    weights = cleaned_data["team_weight"].to_numpy(dtype=float)
+    target = revised_targets(cleaned_data["neutral_spread"], cleaned_data["actual_diff"])[:, 1]
+
+    game_codes, game_keys = pd.factorize(cleaned_data["game_idx"])
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(len(game_keys), np.full(len(game_keys), 1 / len(game_keys)), size=replicates).T
+    columns = []
+    for k in range(replicates):
+        A, B = normal_equations(X, weights * counts[game_codes, k], target[:, None])
+        columns.append(solve_ratings(A, B)[:, 0])
+    return X, counts[game_codes] > 0, np.column_stack(columns)
+
+
+def test_replicates_match_direct_solves(season_games):
+    cleaned = team_game_table(season_games.iloc[:2000])
+    X, drawn, expected = direct_replicates(cleaned, replicates=5, seed=3)
+
+    _, point, samples = bootstrap_ratings(cleaned, replicates=5, seed=3, rtol=1e-12)
+
+    assert samples.shape == expected.shape
+    # Ratings are defined up to a shift of each connected group (and a team
+    # left out of a resample keeps its full-sample rating), so compare the
+    # spreads they predict for the games each replicate drew.
+    np.testing.assert_allclose((X @ samples)[drawn], (X @ expected)[drawn], atol=1e-8)
+    # The default tolerance is well inside the two decimals the intervals show.
+    _, _, loose = bootstrap_ratings(cleaned, replicates=5, seed=3)
+    np.testing.assert_allclose((X @ loose)[drawn], (X @ expected)[drawn], atol=1e-3)
+
+
+def test_intervals_contain_the_point_rating(season_games):
+    intervals = bootstrap_intervals(team_game_table(season_games.iloc[:2000]), replicates=50)
+
+    assert intervals["rank"].tolist() == list(range(1, len(intervals) + 1))
+    assert (intervals["rank_low"] <= intervals["rank_high"]).all()
+    assert (intervals["rating_low"] <= intervals["rating_high"]).all()
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+import feed_cache
+from benchmarks.fixtures import GAME_FIXTURES, ensure_fixtures, game_path
+from feed_cache import FeedCache
+from game_feed import GameFeed
+from lineups import LineupIndex
+from rotation_store import RotationStore, game_rotation_tables
+from stints import build_sub_data
+from team_registry import get_team_registry
+
+
+@pytest.fixture(scope="module")
+def feeds() -> dict:
+    ensure_fixtures()
+    feeds = {}
+    for name in GAME_FIXTURES:
+        with open(game_path(name), "rb") as f:
+            feeds[name] = GameFeed(name, f.read())
+    return feeds
+
+
+@pytest.fixture
+def store(tmp_path, feeds) -> RotationStore:
+    store = RotationStore(str(tmp_path / "rotations"))
+    assert store.append([game_rotation_tables(game_id, feed) for game_id, feed in feeds.items()]) == len(feeds)
+    return store
+
+
+def lineup_index(feed) -> LineupIndex:
+    """The per-game index, with teams named as game_rotation_tables names them."""
+    all_game_data = pd.DataFrame(feed.game.plays)
+    sub_data = build_sub_data(all_game_data, feed.game)
+    sub_data["team"] = get_team_registry().copy().canonicalize(sub_data["team"], register=True)
+    return LineupIndex.from_game(all_game_data, sub_data)
+
+
+def sorted_rows(frame: pd.DataFrame, keys) -> pd.DataFrame:
+    return frame.sort_values(keys).reset_index(drop=True)
+
+
+def test_stored_stints_round_trip(store, feeds):
+    assert store.game_ids() == set(feeds)
+    for game_id, feed in feeds.items():
+        expected = game_rotation_tables(game_id, feed)["stints"]
+        stored = store.load("stints", game_ids=[game_id])
+        keys = ["checkname", "period", "start_s"]
+        assert len(stored) == len(expected)
+        for column in ["team", "checkname", "start_s", "end_s", "hscore_in", "vscore_out"]:
+            assert sorted_rows(stored, keys)[column].tolist() == sorted_rows(expected, keys)[column].tolist()
+
+
+def test_player_minutes_match_the_lineup_index(store, feeds):
+    minutes = store.player_minutes()
+    for game_id, feed in feeds.items():
+        expected = lineup_index(feed).on_off()
+        stored = minutes[minutes["game_id"] == game_id].merge(expected, on=["team", "checkname"], how="outer")
+        assert stored["minutes"].round(9).tolist() == stored["on_minutes"].round(9).tolist()
+        assert stored["plus_minus"].tolist() == stored["on_plus_minus"].tolist()
+
+
+def test_lineups_match_the_lineup_index(store, feeds):
+    expected = pd.concat([lineup_index(feed).lineup_stats() for feed in feeds.values()])
+    expected = expected.groupby(["team", "lineup"], as_index=False)[
+        ["minutes", "points_for", "points_against", "plus_minus"]].sum()
+
+    stored = store.lineups(size=None)
+
+    keys = ["team", "lineup"]
+    pd.testing.assert_frame_equal(sorted_rows(stored[expected.columns], keys), sorted_rows(expected, keys),
+                                  check_dtype=False)
+    five = store.lineups()
+    assert (five["lineup"].str.count(r"\|") == 4).all()
+    assert len(store.lineups(min_minutes=1000)) == 0
+
+
+def test_on_off_matches_the_lineup_index(store, feeds):
+    columns = ["on_minutes", "on_plus_minus", "off_minutes", "off_plus_minus", "on_off"]
+    for game_id, feed in feeds.items():
+        expected = lineup_index(feed).on_off()
+        stored = store.on_off(game_ids=[game_id])
+        keys = ["team", "checkname"]
+        pd.testing.assert_frame_equal(sorted_rows(stored, keys)[keys + columns],
+                                      sorted_rows(expected, keys)[keys + columns], check_dtype=False)
+
+
+def test_stored_games_are_skipped_on_ingest(store, monkeypatch, tmp_path):
+    monkeypatch.setattr(feed_cache, "_FEED_CACHE", FeedCache(str(tmp_path / "feeds.sqlite3")))
+
+    result = store.ingest(["regulation", "overtime"], workers=1)
+
+    assert result == {"stored": 0, "skipped": 2, "errors": {}}
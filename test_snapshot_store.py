@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+import requests
+
+import snapshot_store
+from benchmarks.fixtures import HCA_CSV_PATH, ensure_fixtures, prediction_tracker_path
+from incremental_ratings import IncrementalRatings, update_power_rankings
+from power_rankings import PREDICTION_TRACKER_SEASON, read_prediction_tracker_csv
+from snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Serve the fixture season in place of PredictionTracker; records each download,
+    and fails it while ``downloads.offline`` is set."""
+    ensure_fixtures()
+    with open(prediction_tracker_path(), "rb") as f:
+        season = read_prediction_tracker_csv(f.read())
+
+    class Downloads(list):
+        offline = False
+
+    calls = Downloads()
+
+    def download(url):
+        calls.append(url)
+        if calls.offline:
+            raise requests.ConnectionError("offline")
+        return season.copy()
+
+    monkeypatch.setattr(snapshot_store, "load_prediction_tracker_data", download)
+    return calls
+
+
+def test_refresh_appends_only_new_games(tmp_path, downloads):
+    store = SnapshotStore(str(tmp_path))
+
+    added = store.refresh(PREDICTION_TRACKER_SEASON)
+
+    assert added > 0
+    assert store.refresh(PREDICTION_TRACKER_SEASON) == 0
+    assert len(store.load(seasons=[PREDICTION_TRACKER_SEASON])) == added
+    assert store.seasons() == [PREDICTION_TRACKER_SEASON]
+
+
+def test_cold_start_reads_a_current_season_without_downloading(tmp_path, downloads):
+    SnapshotStore(str(tmp_path)).refresh(PREDICTION_TRACKER_SEASON)
+    downloads.clear()
+
+    # A new process: fresh ratings state and store over the same files.
+    store = SnapshotStore(str(tmp_path))
+    rankings = update_power_rankings(IncrementalRatings(), HCA_CSV_PATH, store=store)
+
+    assert downloads == []
+    assert not store.is_stale(PREDICTION_TRACKER_SEASON)
+    assert len(rankings) > 0
+
+
+def test_stale_season_is_refreshed_or_served_as_stored(tmp_path, downloads):
+    store = SnapshotStore(str(tmp_path), max_age=0)
+    first = update_power_rankings(IncrementalRatings(), HCA_CSV_PATH, store=store)
+    assert len(downloads) == 1
+
+    downloads.offline = True
+    second = update_power_rankings(IncrementalRatings(), HCA_CSV_PATH, store=store)
+
+    assert len(downloads) == 2
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_first_load_fails_without_a_stored_season(tmp_path, downloads):
+    downloads.offline = True
+    with pytest.raises(requests.ConnectionError):
+        update_power_rankings(IncrementalRatings(), HCA_CSV_PATH, store=SnapshotStore(str(tmp_path)))
@@ -0,0 +1,80 @@
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+
+from game_feed import GameFeed
+from stints import StintTracker, build_stints, build_sub_data, player_minutes
+
+
+def stint_set(stints: pd.DataFrame) -> set:
+    stints = stints[stints["end_s"] > stints["start_s"]]
+    return set(zip(stints["checkname"], stints["period"].astype(int), stints["start_s"].astype(int),
+                   stints["end_s"].astype(int)))
+
+
+def with_duplicate_ins(content: bytes) -> bytes:
+    """The feed with a second SUB IN, mid-stint, for the player of each period's last SUB OUT.
+
+    The player either checked in earlier in the period or was on the floor
+    from its start, so both a real and a synthesized first IN get repeated.
+    """
+    root = ET.fromstring(content)
+    for period in root.iter("period"):
+        plays = list(period)
+        outs = [idx for idx, play in enumerate(plays) if play.get("action") == "SUB" and play.get("type") == "OUT"]
+        if not outs:
+            continue
+        out = plays[outs[-1]]
+        ins = [idx for idx, play in enumerate(plays[:outs[-1]])
+               if play.get("action") == "SUB" and play.get("type") == "IN"
+               and play.get("checkname") == out.get("checkname")]
+        first = ins[-1] + 1 if ins else 0
+        skip_clocks = {out.get("time"), period.get("time")} | {plays[idx].get("time") for idx in ins[-1:]}
+        candidates = [idx for idx in range(first, outs[-1]) if plays[idx].get("time") not in skip_clocks]
+        if not candidates:
+            continue
+        duplicate = ET.Element("play", dict(out.attrib, type="IN", time=plays[candidates[0]].get("time")))
+        period.insert(candidates[0] + 1, duplicate)
+    return ET.tostring(root)
+
+
+@pytest.fixture(params=["as recorded", "duplicate INs"])
+def stint_feed(request, fixture_feed) -> GameFeed:
+    if request.param == "as recorded":
+        return fixture_feed
+    return GameFeed(fixture_feed.game_id, with_duplicate_ins(fixture_feed.content))
+
+
+def test_duplicate_ins_restart_the_stint(fixture_feed):
+    game = GameFeed(fixture_feed.game_id, with_duplicate_ins(fixture_feed.content)).game
+    stints = build_stints(build_sub_data(pd.DataFrame(game.plays), game))
+    original = fixture_feed.game
+    original_stints = build_stints(build_sub_data(pd.DataFrame(original.plays), original))
+
+    assert len(stint_set(stints) - stint_set(original_stints)) >= 2
+
+
+def test_live_tracker_matches_batch_stints(stint_feed):
+    game = stint_feed.game
+    batch = build_stints(build_sub_data(pd.DataFrame(game.plays), game))
+
+    tracker = StintTracker()
+    tracker.start(game.roster)
+    # Replay in poll-sized, overlapping windows, as a live feed would arrive.
+    num_plays = game.num_plays
+    for start in range(0, num_plays, 40):
+        window = {key: values[start:start + 60] for key, values in game.plays.items()}
+        tracker.update(window, start)
+    live = tracker.stint_table(final=True)
+
+    assert stint_set(live) == stint_set(batch)
+
+
+def test_every_team_fills_the_floor(fixture_feed):
+    game = fixture_feed.game
+    stints = build_stints(build_sub_data(pd.DataFrame(game.plays), game))
+    periods = sorted(stints["period"].astype(int).unique())
+    game_minutes = 40 + 5 * (len(periods) - 2)
+    team_minutes = player_minutes(stints).groupby("team")["minutes"].sum()
+    assert (team_minutes == 5 * game_minutes).all()
@@ -0,0 +1,26 @@
+from power_rankings import load_hca_data, read_prediction_tracker_csv
+from team_registry import HCA_CSV_PATH
+
+PREDICTION_TRACKER_CSV = (
+    b"date,home,hscore,road,rscore,neutral,line\n"
+    b"01/04/2025,DUKE,80,north carolina,70,0,-5\n"
+    b"01/05/2025,Central Florida,71,ZZZ COLLEGE,60,0,-9\n"
+)
+
+
+def test_names_resolve_the_same_in_either_load_order(fresh_team_registry, tmp_path):
+    before = read_prediction_tracker_csv(PREDICTION_TRACKER_CSV)
+    load_hca_data(HCA_CSV_PATH)
+    # Teams only in another HCA file must not leak into the shared registry either.
+    other_hca = tmp_path / "hca.csv"
+    other_hca.write_text("Team,Conf,HCA\nZzz College,IND,1.0\n")
+    load_hca_data(str(other_hca))
+    after = read_prediction_tracker_csv(PREDICTION_TRACKER_CSV)
+
+    assert before["home"].tolist() == after["home"].tolist() == ["Duke", "UCF"]
+    assert before["road"].tolist() == after["road"].tolist() == ["North Carolina", "ZZZ COLLEGE"]
+
+
+def test_hca_file_names_resolve_through_aliases(fresh_team_registry):
+    hca = load_hca_data(HCA_CSV_PATH)
+    assert fresh_team_registry.canonical("duke") in set(hca["Team"])